@@ -5,244 +5,426 @@
 # Authors: Michael Buckendahl, C. Cooper, Blake J
 # Creation Date: 08/25/2025
 
+# Times the imports and set-up below for --profile-startup, so it is created before anything else is imported
+from minesweeper.ui.startup import StartupTimer
+startup = StartupTimer()
+
+import argparse
+import os
+import time
 import pygame
+startup.mark('import pygame')
 import pygame_gui
+startup.mark('import pygame_gui')
 import config
 import sys
-from minesweeper.ui.view import draw_welcome, draw_board, draw_ai_selection
+from minesweeper.ui.view import WelcomeUI, draw_welcome, BoardRenderer
+from minesweeper.ui.camera import ZOOM_CELL_SIZES
+from minesweeper.ui.profiler import FrameProfiler, draw_overlay
 from minesweeper.board import BoardGame
+from minesweeper.chunked import ChunkedBoardGame
 from minesweeper.ai_solver import AISolver
-
-
-pygame.init()
+from minesweeper.ai_worker import AIWorker
+from minesweeper.replay import ReplayRecorder, ReplayPlayer, load_replay, apply_replay_move
+from minesweeper.generator import BoardPool
+startup.mark('import game modules')
+
+# Command line options for recording games and playing recordings back
+parser = argparse.ArgumentParser(description="Play Minesweeper.")
+parser.add_argument('--record', default=None, help="write a replay of every game to this directory")
+parser.add_argument('--replay', default=None, help="play back a replay file instead of starting at the welcome screen")
+parser.add_argument('--replay-speed', type=float, default=1.0, help="playback speed multiplier for --replay")
+parser.add_argument('--endless', action='store_true', help="play games without an AI on a huge board generated as it is explored")
+parser.add_argument('--no-guess', action='store_true', default=config.NO_GUESS_BOARDS, help="only deal boards that can be solved without guessing")
+parser.add_argument('--profile-startup', action='store_true', help="print how long each import and set-up step took once the first frame is shown")
+args = parser.parse_args()
+
+# Only start the subsystems the game uses: pygame.init() would also start audio, joysticks and the like
+pygame.display.init()
+pygame.font.init()
+startup.mark('pygame init')
 
 # Creates the window in which the game will run
 screen=pygame.display.set_mode((config.WINDOW_WIDTH ,config.WINDOW_HEIGHT))
 pygame.display.set_caption("Minesweeper") # simple window title
 clock=pygame.time.Clock() # sets up a clock to manage how fast the screen updates
+startup.mark('create window')
 
 # Sets up the pygame_gui UIManager which will handle UI elements that we use to get
 # the mine count and create a button to start the game
 manager = pygame_gui.UIManager((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
+startup.mark('create UI manager')
 
 board: BoardGame = BoardGame()
 
-# The draw_welcome function has two modes, one to draw the screen and one to create the UI
-# elements. Here we call it to create the UI elements and get references to them. We do this outside
-# the main loop so that we only create them once.
-text_box, _ = draw_welcome(manager, screen, False, False)
-ai_text, start_button, easy_button, medium_button, hard_button = draw_ai_selection(manager)
-
-# --- Game Difficulty (board size/mines) ---
-# Create clearly-labeled Game Difficulty (separate from AI Difficulty)
-# Position the game difficulty controls below the AI buttons to avoid overlap
-label_y = config.AI_BUTTON_Y + 40
-game_diff_label = pygame_gui.elements.UITextBox(
-    html_text="<b>Game Difficulty</b> (board size & mines)",
-    relative_rect=pygame.Rect((0, label_y), (config.WINDOW_WIDTH, 30)),
-    manager=manager,
-    object_id='#game_diff_text'
-)
-button_width = 100
-button_spacing = 20
-total_width = button_width * 3 + button_spacing * 2
-start_x = config.WINDOW_WIDTH // 2 - total_width // 2
-# place the difficulty buttons beneath the label
-game_diff_y = label_y + 40
-
-gd_easy_button = pygame_gui.elements.UIButton(
-    relative_rect=pygame.Rect((start_x, game_diff_y), (button_width, 30)),
-    text='Easy',
-    manager=manager
-)
-gd_normal_button = pygame_gui.elements.UIButton(
-    relative_rect=pygame.Rect((start_x + (button_width + button_spacing), game_diff_y), (button_width, 30)),
-    text='Normal',
-    manager=manager
-)
-gd_hard_button = pygame_gui.elements.UIButton(
-    relative_rect=pygame.Rect((start_x + 2 * (button_width + button_spacing), game_diff_y), (button_width, 30)),
-    text='Hard',
-    manager=manager
-)
-
 current_difficulty = 'normal'
 config.set_difficulty(current_difficulty)
-gd_normal_button.disable()
 
-ai_buttons = {easy_button: 'easy', medium_button: 'medium', hard_button: 'hard', start_button: None}
-all_welcome_elements = [text_box, ai_text, start_button, easy_button, medium_button, hard_button]
+# The welcome screen's widgets, which are only built the first time the welcome screen is shown
+# (a replay started from the command line never shows it)
+welcome_ui: WelcomeUI = None
+
+def show_welcome_ui():
+    """Shows the welcome screen's widgets, building them if this is the first time"""
+    global welcome_ui
+    if welcome_ui is None:
+        welcome_ui = WelcomeUI(manager)
+    else:
+        welcome_ui.show()
+
 ai_solver: AISolver = None
 selected_button = None
 player_turn = True
-ai_move_timer = 0
+
+# Posted by a one-shot pygame timer when the AI should take its turn. Event ids come from
+# custom_type so they can't clash with the ones pygame_gui registered when it was imported
+AI_MOVE_EVENT = pygame.event.custom_type()
+# Posted by the AI worker thread when it has chosen a move
+AI_RESULT_EVENT = pygame.event.custom_type()
+# Posted by a one-shot pygame timer when the next move of a replay being played back is due
+REPLAY_EVENT = pygame.event.custom_type()
+
+# Searches for AI moves off the main thread; pygame.event.post is safe to call from other threads
+ai_worker = AIWorker(notify=lambda: pygame.event.post(pygame.event.Event(AI_RESULT_EVENT)))
+
+# Draws the game board, redrawing only what changed between frames; its camera scrolls and zooms
+# boards too big for the window
+renderer = BoardRenderer()
+camera = renderer.camera
+
+# Opt-in per-phase frame timings and their on-screen overlay
+profiler = FrameProfiler(config.PROFILE_AT_STARTUP, config.PROFILE_HISTORY_FRAMES)
+
+# Writes the current game to a replay file when --record is given
+recorder: ReplayRecorder = None
+
+def start_recording(board: BoardGame, difficulty: str | None) -> ReplayRecorder | None:
+    """Starts recording a new game to a timestamped file in the --record directory, if recording is on.
+       Endless games aren't recorded, since replays are played back on a full-size board."""
+    if not args.record or isinstance(board, ChunkedBoardGame):
+        return None
+    os.makedirs(args.record, exist_ok=True)
+    path = os.path.join(args.record, time.strftime('%Y%m%d-%H%M%S') + f"-{board.seed:x}.msr")
+    return ReplayRecorder(board, path, difficulty)
+
+# Generates no-guess layouts in the background when --no-guess is given, so the first click never waits
+board_pool: BoardPool = BoardPool() if args.no_guess else None
+
+def use_board_pool(board: BoardGame):
+    """Deals the board's layout from the no-guess pool, and starts filling the pool for its geometry"""
+    if board_pool is None or isinstance(board, ChunkedBoardGame):
+        return
+    board_pool.prefetch(board.rows, board.cols, board.total_mines)
+    board.layout_provider = board_pool.take
+
+# Plays a recording back in real time when --replay is given
+replay_player: ReplayPlayer = None
+if args.replay:
+    replay = load_replay(args.replay)
+    board = replay.new_board()
+    # The recording may be from a bigger board than the current preset, so shrink the cells to fit the
+    # window, down to the smallest zoom level; anything bigger than that can be scrolled
+    board.cell_size = max(ZOOM_CELL_SIZES[0], min(config.CELL_SIZE, camera.viewport.width // board.cols,
+                                                  camera.viewport.height // board.rows))
+    replay_player = ReplayPlayer(replay, args.replay_speed)
+    pygame.time.set_timer(REPLAY_EVENT, max(1, replay_player.ms_until_next() or 0), 1)
+    startup.mark('load replay')
+else:
+    show_welcome_ui()
+    startup.mark('build welcome screen')
 
 # Whether the last text the player entered in the bomb number box was invalid
 wasBadInput: bool = False
 
 running = True
 
-while running:
-    dt = clock.tick(config.FPS) / 1000.0
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-            break
-
-        # Let the UI manager process events for its widgets
-        manager.process_events(event)
-
-        # Handle UI button events
-        if event.type == pygame_gui.UI_BUTTON_PRESSED:
-            # Game difficulty buttons
-            if event.ui_element == gd_easy_button:
-                config.set_difficulty('easy')
-                gd_easy_button.disable(); gd_normal_button.enable(); gd_hard_button.enable()
-                continue
-            if event.ui_element == gd_normal_button:
-                config.set_difficulty('normal')
-                gd_normal_button.disable(); gd_easy_button.enable(); gd_hard_button.enable()
-                continue
-            if event.ui_element == gd_hard_button:
-                config.set_difficulty('hard')
-                gd_hard_button.disable(); gd_easy_button.enable(); gd_normal_button.enable()
-                continue
-
-            # AI / Start buttons
-            if event.ui_element in ai_buttons:
-                # Attempt to parse mine count from textbox
-                try:
-                    mineCount = int(text_box.get_text())
-                except Exception:
-                    wasBadInput = True
-                    continue
+# The loop only ticks at config.FPS until this time (in ms) after the last input, so UI animations
+# can finish; after that it sleeps in pygame.event.wait until something happens. It starts awake so
+# the first frame is drawn straight away instead of after waiting for an event.
+last_ticks = pygame.time.get_ticks()
+awake_until = last_ticks + config.UI_SETTLE_MS
 
-                if not (config.MIN_MINES <= mineCount <= config.MAX_MINES):
-                    wasBadInput = True
+while running:
+    if pygame.time.get_ticks() < awake_until:
+        clock.tick(config.FPS)
+        events = pygame.event.get()
+    else:
+        # The welcome screen's text box has a blinking cursor, so wake up now and then for it;
+        # the game board has nothing to animate, so block until there is an event
+        if board.phase == 'ready':
+            first_event = pygame.event.wait(config.WELCOME_IDLE_TIMEOUT_MS)
+        else:
+            first_event = pygame.event.wait()
+        events = [first_event] if first_event.type != pygame.NOEVENT else []
+        events += pygame.event.get()
+
+    frame_ticks = pygame.time.get_ticks()
+    dt = (frame_ticks - last_ticks) / 1000.0
+    last_ticks = frame_ticks
+    if events:
+        awake_until = frame_ticks + config.UI_SETTLE_MS
+
+    # Everything from here to the display update is this frame's work
+    profiler.begin_frame()
+
+    with profiler.phase('events'):
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+                break
+
+            # Let the UI manager process events for its widgets
+            manager.process_events(event)
+
+            # Handle UI button events
+            if event.type == pygame_gui.UI_BUTTON_PRESSED:
+                # Game difficulty buttons
+                if welcome_ui and event.ui_element in welcome_ui.difficulty_buttons:
+                    difficulty = welcome_ui.difficulty_buttons[event.ui_element]
+                    config.set_difficulty(difficulty)
+                    welcome_ui.select_difficulty(difficulty)
                     continue
 
-                wasBadInput = False
-                # selected button visuals
-                if selected_button:
+                # AI / Start buttons
+                if welcome_ui and event.ui_element in welcome_ui.ai_buttons:
+                    # Attempt to parse mine count from textbox
                     try:
-                        selected_button.unselect()
+                        mineCount = int(welcome_ui.text_box.get_text())
                     except Exception:
-                        pass
-                selected_button = event.ui_element
-                try:
-                    selected_button.select()
-                except Exception:
-                    pass
-
-                difficulty = ai_buttons[event.ui_element]
-                board = BoardGame()
-                board.total_mines = mineCount
-                player_turn = True
-
-                if difficulty:
-                    board.phase = 'ai'
-                    ai_solver = AISolver(board, difficulty)
-                else:
-                    board.phase = 'playing'
-                    ai_solver = None
+                        wasBadInput = True
+                        continue
+
+                    if not (config.MIN_MINES <= mineCount <= config.MAX_MINES):
+                        wasBadInput = True
+                        continue
 
-                # hide welcome UI
-                game_diff_label.hide(); gd_easy_button.hide(); gd_normal_button.hide(); gd_hard_button.hide()
-                for element in all_welcome_elements:
+                    difficulty = welcome_ui.ai_buttons[event.ui_element]
+                    try:
+                        if args.endless and not difficulty:
+                            # Keep the chosen preset's mine density on an endless board
+                            size = config.ENDLESS_BOARD_SIZE
+                            new_board = ChunkedBoardGame(size, size, round(mineCount / (config.GRID_ROWS * config.GRID_COLS) * size * size))
+                        else:
+                            new_board = BoardGame(mines=mineCount)
+                    except ValueError: # too many mines to keep the first click clear on this board
+                        wasBadInput = True
+                        continue
+
+                    wasBadInput = False
+                    # selected button visuals
+                    if selected_button:
+                        try:
+                            selected_button.unselect()
+                        except Exception:
+                            pass
+                    selected_button = event.ui_element
                     try:
-                        element.hide()
+                        selected_button.select()
                     except Exception:
                         pass
 
-        # Mouse clicks
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            # If we aren't in a player-controlled phase, ignore the click
-            if board.phase not in ["playing", "ai"] or (board.phase == 'ai' and not player_turn):
-                continue
-
-            # Convert pixel to cell coordinates
-            grid_x = event.pos[0] - config.GRID_POS_X
-            grid_y = event.pos[1] - config.GRID_POS_Y
-            cell_col = grid_x // config.CELL_SIZE
-            cell_row = grid_y // config.CELL_SIZE
-
-            # If the click was outside the cell grid, ignore it
-            if cell_col < 0 or cell_col >= config.GRID_COLS or cell_row < 0 or cell_row >= config.GRID_ROWS:
-                continue
-
-            # Left click -> reveal
-            if event.button == 1:
-                board.reveal(cell_row, cell_col)
-                if board.phase == 'ai':
-                    player_turn = False
-
-            # Right click -> toggle flag
-            if event.button == 3:
-                board.toggle_flag(cell_row, cell_col)
-
-        # Keyboard events
-        if event.type == pygame.KEYDOWN:
-            # Restart (R)
-            if event.key == pygame.K_r and (board.phase in ["playing", "won", "lost", "ai"]):
-                mineCount = board.total_mines
-                is_ai_game = ai_solver is not None
-                difficulty = ai_solver.difficulty if is_ai_game else None
-
-                board = BoardGame()
-                board.total_mines = mineCount
-                player_turn = True
-
-                if is_ai_game:
-                    board.phase = 'ai'
-                    ai_solver = AISolver(board, difficulty)
-                else:
-                    board.phase = 'playing'
-                    ai_solver = None
+                    board = new_board
+                    use_board_pool(board)
+                    player_turn = True
+                    pygame.time.set_timer(AI_MOVE_EVENT, 0)
+                    ai_worker.cancel()
+
+                    if difficulty:
+                        board.phase = 'ai'
+                        ai_solver = AISolver(board, difficulty)
+                    else:
+                        board.phase = 'playing'
+                        ai_solver = None
+                    if recorder:
+                        recorder.close()
+                    recorder = start_recording(board, difficulty)
+
+                    # hide welcome UI
+                    welcome_ui.hide()
+
+            # AI turn: the timer scheduled after the player's move has gone off, so start searching
+            if event.type == AI_MOVE_EVENT:
+                if board.phase == 'ai' and ai_solver and not player_turn:
+                    with profiler.phase('ai'):
+                        ai_worker.request_move(ai_solver)
+
+            # Replay playback: play every recorded move whose time has come, then wait for the next one
+            if event.type == REPLAY_EVENT and replay_player:
+                for move in replay_player.due_moves():
+                    apply_replay_move(board, move)
+                if not replay_player.finished:
+                    pygame.time.set_timer(REPLAY_EVENT, max(1, replay_player.ms_until_next()), 1)
+
+            # The worker has chosen the AI's move, so play it and hand the turn back
+            if event.type == AI_RESULT_EVENT:
+                finished, move = ai_worker.poll()
+                if finished and board.phase == 'ai' and ai_solver and not player_turn:
+                    with profiler.phase('ai'):
+                        ai_solver.apply_move(move)
+                    player_turn = True
+
+            # Camera: the mouse wheel zooms around the pointer and dragging with the middle button scrolls,
+            # whenever a board is on screen (the renderer redraws when the view moves)
+            if board.phase != 'ready':
+                if event.type == pygame.MOUSEWHEEL:
+                    camera.zoom(event.y, pygame.mouse.get_pos())
+                    continue
+                if event.type == pygame.MOUSEMOTION and event.buttons[1]:
+                    camera.pan(-event.rel[0], -event.rel[1])
+                    continue
 
-            # Escape -> go back to welcome
-            if event.key == pygame.K_ESCAPE:
-                board = BoardGame()
-                # show welcome UI again
-                try:
-                    game_diff_label.show(); gd_easy_button.show(); gd_normal_button.show(); gd_hard_button.show()
-                except Exception:
-                    pass
-                for element in all_welcome_elements:
-                    try:
-                        element.show()
-                    except Exception:
-                        pass
-                ai_solver = None
+            # Mouse clicks
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                # If we aren't in a player-controlled phase, or a replay is playing, ignore the click
+                if board.phase not in ["playing", "ai"] or (board.phase == 'ai' and not player_turn) or replay_player:
+                    continue
+
+                # Convert pixel to cell coordinates through the camera, ignoring clicks outside the visible board
+                cell = camera.cell_at(event.pos)
+                if cell is None:
+                    continue
+                cell_row, cell_col = cell
+
+                # Left click -> reveal (the renderer and AI pick the change up from the board's journal)
+                if event.button == 1:
+                    board.reveal(cell_row, cell_col)
+                    if board.phase == 'ai':
+                        # Give the AI its turn after a short pause so the player can see their move
+                        player_turn = False
+                        pygame.time.set_timer(AI_MOVE_EVENT, config.AI_MOVE_DELAY_MS, 1)
+
+                # Right click -> toggle flag
+                if event.button == 3:
+                    board.toggle_flag(cell_row, cell_col)
+
+            # Keyboard events
+            if event.type == pygame.KEYDOWN:
+                # Restart (R)
+                if event.key == pygame.K_r and (board.phase in ["playing", "won", "lost", "ai"]):
+                    mineCount = board.total_mines
+                    is_ai_game = ai_solver is not None
+                    difficulty = ai_solver.difficulty if is_ai_game else None
+
+                    # Restart on a board of the same kind and size as the one being replaced
+                    board = type(board)(board.rows, board.cols, mineCount)
+                    use_board_pool(board)
+                    player_turn = True
+                    # Drop any AI turn scheduled or being searched for the old board, and stop any replay
+                    pygame.time.set_timer(AI_MOVE_EVENT, 0)
+                    ai_worker.cancel()
+                    pygame.time.set_timer(REPLAY_EVENT, 0)
+                    replay_player = None
+
+                    if is_ai_game:
+                        board.phase = 'ai'
+                        ai_solver = AISolver(board, difficulty)
+                    else:
+                        board.phase = 'playing'
+                        ai_solver = None
+                    if recorder:
+                        recorder.close()
+                    recorder = start_recording(board, difficulty)
+
+                # Auto-complete (A) -> play every move the numbers on screen make certain, in a game without an AI opponent
+                # (not on endless boards, where the solver would have to scan every cell)
+                if event.key == pygame.K_a and board.phase == 'playing' and not replay_player and not isinstance(board, ChunkedBoardGame):
+                    with profiler.phase('ai'):
+                        helper = AISolver(board, 'expert')
+                        helper.play_moves(helper.find_moves())
+
+                # Arrow keys -> scroll the board, Home -> back to the top left corner at the board's cell size
+                if board.phase != 'ready':
+                    if event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+                        camera.pan(config.PAN_STEP * ((event.key == pygame.K_RIGHT) - (event.key == pygame.K_LEFT)),
+                                   config.PAN_STEP * ((event.key == pygame.K_DOWN) - (event.key == pygame.K_UP)))
+                    if event.key == pygame.K_HOME:
+                        camera.attach(board)
+
+                # Frame profiler (F3) -> toggle recording and the overlay
+                if event.key == pygame.K_F3:
+                    profiler.toggle()
+                    # Clear the overlay off the screen when it is turned off
+                    renderer.invalidate()
+
+                # Frame profiler trace (F4) -> write the recorded frames to a file
+                if event.key == pygame.K_F4 and profiler.enabled:
+                    profiler.dump_trace(config.PROFILE_TRACE_FILE)
+                    print(f"Wrote {len(profiler.frames)} frames to {config.PROFILE_TRACE_FILE}")
+
+                # Escape -> go back to welcome
+                if event.key == pygame.K_ESCAPE:
+                    board = BoardGame()
+                    # show welcome UI again (building it if the game started straight into a replay)
+                    show_welcome_ui()
+                    ai_solver = None
+                    pygame.time.set_timer(AI_MOVE_EVENT, 0)
+                    ai_worker.cancel()
+                    pygame.time.set_timer(REPLAY_EVENT, 0)
+                    replay_player = None
+                    if recorder:
+                        recorder.close()
+                        recorder = None
+
+    # Hand this frame's moves to the replay writer thread
+    if recorder:
+        recorder.poll()
 
     # Update the UI manager so widgets have a chance to animate / process internal state
-    try:
-        manager.update(dt)
-    except Exception:
-        pass
-
-    # AI turn handling: if it's an AI game and it's AI's turn, allow a small timer then make a move
-    if board.phase == 'ai' and ai_solver and not player_turn:
-        ai_move_timer += dt
-        if ai_move_timer > 0.3:
-            ai_solver.make_move()
-            player_turn = True
-            ai_move_timer = 0
-
-    if board.phase == 'ready':
-        # Redraw welcome screen but don't create new elements
-        draw_welcome(manager, screen, wasBadInput, True)
-
-    if board.phase in ['playing', 'won', 'lost', 'ai']:
-        screen.fill((0, 0, 0))
-        draw_board(manager, screen, board)
+    with profiler.phase('ui_update'):
+        try:
+            manager.update(dt)
+        except Exception:
+            pass
 
-    # Draw UI elements so buttons/textboxes are visible
-    try:
-        manager.draw_ui(screen)
-    except Exception:
-        pass
 
-    pygame.display.flip()
+    # The areas of the screen that changed this frame, or None if the whole screen did
+    dirty_rects = None
 
+    with profiler.phase('draw_board'):
+        if board.phase == 'ready':
+            # Redraw welcome screen but don't create new elements
+            draw_welcome(manager, screen, wasBadInput, True)
+            # The welcome screen covers the board, so it has to be drawn in full next time
+            renderer.invalidate()
+
+        if board.phase in ['playing', 'won', 'lost', 'ai']:
+            if isinstance(board, ChunkedBoardGame):
+                # Endless boards only flood open the cells on screen, so carry floods on as the view moves
+                board.set_flood_area(camera.visible_cells())
+            dirty_rects = renderer.draw(screen, board)
+
+    # Draw UI elements so buttons/textboxes are visible
+    with profiler.phase('draw_ui'):
+        try:
+            manager.draw_ui(screen)
+        except Exception:
+            pass
+
+    # The overlay goes on top of everything and shows the timings of the frames before this one
+    if profiler.enabled:
+        overlay_rect = draw_overlay(screen, profiler)
+        if dirty_rects is not None:
+            dirty_rects.append(overlay_rect)
+
+    # Only push the changed areas to the display; an idle board pushes nothing
+    with profiler.phase('display'):
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+
+    profiler.end_frame()
+
+    # The first frame is on screen, so startup is over
+    if startup is not None:
+        startup.mark('first frame')
+        if args.profile_startup:
+            print(startup.report())
+        startup = None
+
+if recorder:
+    recorder.close()
+if board_pool:
+    board_pool.close()
 pygame.quit()
 sys.exit()
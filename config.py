@@ -5,9 +5,30 @@
 # Author(s): Michael Buckendahl
 # Creation Date: 9/2/2025
 
+import os
+
 # Define the frames per second to limit cpu usage
 FPS = 60
 
+# The main loop runs at FPS only for this long after the last input (so UI animations can finish),
+# then sleeps until the next event. The welcome screen still wakes every WELCOME_IDLE_TIMEOUT_MS
+# so the text box cursor keeps blinking.
+UI_SETTLE_MS = 500
+WELCOME_IDLE_TIMEOUT_MS = 250
+
+# Only deal boards that can be solved from the first click without guessing (also the --no-guess flag).
+# Layouts are generated ahead of time on a background thread.
+NO_GUESS_BOARDS = False
+
+# Delay between the player's move and the AI's move in AI games
+AI_MOVE_DELAY_MS = 300
+
+# Frame profiler: F3 toggles recording and the on-screen overlay, F4 writes the recorded frames to
+# PROFILE_TRACE_FILE. Set the MINESWEEPER_PROFILE environment variable to 1 to start with it on.
+PROFILE_AT_STARTUP = os.environ.get('MINESWEEPER_PROFILE') == '1'
+PROFILE_HISTORY_FRAMES = 600
+PROFILE_TRACE_FILE = "frame_trace.json"
+
 # Define the window dimensions
 WINDOW_WIDTH = 1000
 WINDOW_HEIGHT = 800
@@ -15,6 +36,10 @@ WINDOW_HEIGHT = 800
 # Define what font and size we will use across the application
 FONT_NAME = "Arial"
 FONT_SIZE = 12
+# Where the font's file path is remembered between launches, so the system's fonts are only listed
+# the first time the game runs. Delete the file to look the font up again.
+FONT_CACHE_FILE = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                               'minesweeper', 'fonts.json')
 OUTCOME_FONT_SIZE = 24
 TITLE_FONT_SIZE = 36
 DESC_FONT_SIZE = 18
@@ -43,9 +68,10 @@ MAX_MINES = 20
 GRID_ROWS = 10
 GRID_COLS = 10
 CELL_SIZE = 40  # Size of each cell in pixels
-HELP_TEXT = "To select a cell, hover over it and left-click. If you want to place a flag hover over a cell and right-click. If you want to restart the game press R."
+HELP_TEXT = "To select a cell, hover over it and left-click. If you want to place a flag hover over a cell and right-click. If you want to restart the game press R. Press A to auto-complete the moves the numbers make certain."
 WON_TEXT = "You won! Press 'R' to restart."
 LOST_TEXT = "You lost! Press 'R' to restart."
+NO_GUESS_FALLBACK_TEXT = "No no-guess board was ready in time, so this one may need a guess."
 TITLE = "Minesweeper"
 DESC_TEXT = "Clear the board without detonating any mines."
 NUM_MINES_TEXT = f"Number of Mines({MIN_MINES}-{MAX_MINES}):"
@@ -57,11 +83,21 @@ AI_TEXT = "Select AI Difficulty:"
 AI_BUTTON_EASY = "Easy"
 AI_BUTTON_MEDIUM = "Medium"
 AI_BUTTON_HARD = "Hard"
+AI_BUTTON_EXPERT = "Expert"
 AI_BUTTON_NONE = "No AI"
 
 # Define the positioning of elements in the window in there x and y
 GRID_POS_X = 200
 GRID_POS_Y = 100
+# Boards bigger than the window scroll inside the area from the grid position to VIEWPORT_MARGIN
+# from the right edge of the window, leaving STATUS_AREA_HEIGHT at the bottom for the status message
+VIEWPORT_MARGIN = 20
+STATUS_AREA_HEIGHT = 120
+# Pixels the arrow keys scroll the board by
+PAN_STEP = 120
+
+# Rows and columns of the board in --endless games. Cells are only created as they are explored.
+ENDLESS_BOARD_SIZE = 100_000
 CONTROLS_TEXT_X = 100
 CONTROLS_TEXT_Y = 525
 FLAGS_REMAINING_X = 650
@@ -82,6 +118,7 @@ AI_BUTTON_Y = 400
 AI_EASY_X = WINDOW_WIDTH // 2 - 110
 AI_MEDIUM_X = WINDOW_WIDTH // 2
 AI_HARD_X = WINDOW_WIDTH // 2 + 110
+AI_EXPERT_X = WINDOW_WIDTH // 2 + 220
 AI_NONE_X = WINDOW_WIDTH // 2 - 220
 
 
@@ -5,158 +5,449 @@
 # Author: Jakob Huffman
 # Creation Date: 10/27/2023
 
+import copy
 import random
+from collections import deque
 from minesweeper.board import BoardGame
-import config
+from minesweeper.journal import CellRevealed, FlagPlaced, FlagRemoved
+from minesweeper.deduction import find_forced
+from minesweeper.probability import ProbabilityEngine
 
 # Class that contains the logic for the AI solver
 class AISolver:
-    def __init__(self, board: BoardGame, difficulty: str):
+    def __init__(self, board: BoardGame, difficulty: str, seed: int | None = None):
         self.board = board
         self.difficulty = difficulty
+        # Random guesses come from the solver's own RNG so seeded games can be replayed exactly
+        self.rng = random.Random(seed)
+
+        # Frontier index: the revealed numbered cells that still have hidden, unflagged neighbors,
+        # plus the number, hidden and flagged neighbor counts of every revealed numbered cell. It is built
+        # on first use and then kept up to date from the reveals and flags in the board's journal,
+        # whoever made them.
+        self._indexed = False
+        self._frontier = set()
+        self._numbers = {}
+        self._hidden_counts = {}
+        self._flag_counts = {}
+        self._changes = board.journal.subscribe()
+
+        # Expert state: mines the deduction engine has proven (even if they couldn't be flagged),
+        # and forced moves from the last deduction that haven't been played yet
+        self._known_mines = set()
+        self._pending = deque()
+        self._probabilities = ProbabilityEngine()
+
+        # Set from another thread to abandon a search running in choose_move
+        self.cancel_event = None
+
+        # How many of the chosen moves were guesses rather than logically certain (the opening included)
+        self.guesses = 0
 
     # Makes a move based on the difficulty
     def make_move(self):
+        return self.apply_move(self.choose_move())
+
+    def choose_move(self):
+        """Picks the next move for the difficulty without changing the board, so the search can run
+           against a snapshot of the board on another thread
+
+        Raises:
+            SearchCancelled: If cancel_event was set while searching
+
+        Returns:
+            tuple[str, tuple[int, int]] | None: ('reveal' or 'flag', (row, col)), or None if there is no move left
+        """
     # If the difficulty is easy, make an easy move
         if self.difficulty == 'easy':
-            return self.easy_move()
+            return self._choose_easy()
         # If the difficulty is medium, make a medium move
         elif self.difficulty == 'medium':
-            return self.medium_move()
+            return self._choose_medium()
         # If the difficulty is hard, make a hard move
         elif self.difficulty == 'hard':
-            return self.hard_move()
+            return self._choose_hard()
+        # If the difficulty is expert, make an expert move
+        elif self.difficulty == 'expert':
+            return self._choose_expert()
         return None
 
+    def apply_move(self, move):
+        """Plays a move on the board. The frontier index catches up from the board's journal on the next search.
+
+        Args:
+            move (tuple[str, tuple[int, int]] | None): The move from choose_move
+
+        Returns:
+            tuple[str, tuple[int, int]] | None: The move that was played
+        """
+        if move is None:
+            return None
+        action, (row, col) = move
+        if action == 'flag':
+            self.board.toggle_flag(row, col)
+        else:
+            self.board.reveal(row, col)
+        return move
+
+    def find_moves(self):
+        """Finds every move the difficulty's logic considers certain, in one analysis of the board.
+           Easy has no logic and finds nothing; medium and hard use the basic flag/reveal rules on every
+           frontier cell; expert uses the full constraint deduction.
+
+        Returns:
+            list[tuple[str, tuple[int, int]]]: The certain ('reveal', (row, col)) and ('flag', (row, col)) moves
+        """
+        if self.difficulty == 'expert':
+            return self.find_forced_moves()
+        if self.difficulty in ('medium', 'hard'):
+            return self._find_basic_moves()
+        return []
+
+    def play_moves(self, moves):
+        """Plays a batch of moves on the board
+
+        Args:
+            moves (Iterable[tuple[str, tuple[int, int]]]): The moves to play, e.g. from find_moves
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every cell that was revealed or had its flag changed
+        """
+        return self.board.apply_moves(moves)
+
+    def easy_move(self):
+        return self.apply_move(self._choose_easy())
+
+    def medium_move(self):
+        return self.apply_move(self._choose_medium())
+
+    def hard_move(self):
+        return self.apply_move(self._choose_hard())
+
+    def expert_move(self):
+        return self.apply_move(self._choose_expert())
+
     # Gets the neighbors of a cell
     def get_neighbors(self, row, col):
-    # List of neighbors
-        neighbors = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                r, c = row + dr, col + dc
-        # Check if the neighbor is in the grid
-                if 0 <= r < config.GRID_ROWS and 0 <= c < config.GRID_COLS:
-                    neighbors.append((r, c))
-        return neighbors
+    # List of neighbors, from the board's precomputed topology
+        return self.board.topology.neighbor_cells(row, col)
 
-    # Makes a random move on a hidden, un-flagged cell
-    def easy_move(self):
-        hidden_cells = []
-        for r in range(config.GRID_ROWS):
-            for c in range(config.GRID_COLS):
-                cell = self.board.board[r][c]
-                if not cell.is_revealed and not cell.is_flag:
-                    hidden_cells.append((r, c))
+    def sync(self):
+        """Brings the frontier index up to date with the reveals and flags recorded in the board's
+           journal since the last sync, whether the solver or anyone else made them
+        """
+        events = self._changes.drain()
+        if not self._indexed:
+            return # resync will read the board as it is when the index is first needed
+        # Flags first: they only touch cells indexed before these events, while the newly revealed
+        # cells are indexed from the board as it is now, flags included
+        revealed = []
+        for event in events:
+            if type(event) is CellRevealed:
+                revealed.append((event.row, event.col))
+            elif type(event) is FlagPlaced:
+                self._flag_changed(event.row, event.col, 1)
+            elif type(event) is FlagRemoved:
+                self._flag_changed(event.row, event.col, -1)
+        if revealed:
+            self._cells_revealed(revealed)
+
+    def fork(self) -> 'AISolver':
+        """Copies the solver for a search on another thread. The frontier index is brought up to date
+           first, and the copy gets its own copies of the index and the expert state, so nothing the
+           search does touches this solver or the board's journal.
+           The copy still reads the live board until detach_board is called on it.
+
+        Returns:
+            AISolver: The copy
+        """
+        self._refresh_index()
+        search = copy.copy(self)
+        search._frontier = set(self._frontier)
+        search._numbers = dict(self._numbers)
+        search._hidden_counts = dict(self._hidden_counts)
+        search._flag_counts = dict(self._flag_counts)
+        search._changes = None
+        search._known_mines = set(self._known_mines)
+        search._pending = deque(self._pending)
+        search._probabilities = self._probabilities.copy()
+        search.rng = random.Random()
+        search.rng.setstate(self.rng.getstate())
+        return search
+
+    def detach_board(self):
+        """Points a forked solver at a snapshot of its board taken now, and follows the snapshot's
+           journal from then on. The board must not change while the snapshot is taken.
+        """
+        self.board = self.board.snapshot()
+        self._changes = self.board.journal.subscribe()
+
+    def adopt(self, search: 'AISolver'):
+        """Takes over the expert state, RNG and guess count a finished search left behind, so the
+           forced moves it found and the random numbers it used aren't found or drawn again
+
+        Args:
+            search (AISolver): The solver from fork that chose the move about to be played
+        """
+        self._known_mines = search._known_mines
+        self._pending = search._pending
+        self._probabilities = search._probabilities
+        self.rng = search.rng
+        self.guesses = search.guesses
+
+    def _refresh_index(self):
+        # Builds the frontier index on first use, and after that catches it up from the journal
+        if self._indexed:
+            self.sync()
+        else:
+            self.resync()
+
+    def _cells_revealed(self, cells):
+        # Updates the frontier index after the given (row, col) cells were revealed
+        touched = set()
+        # Each cell is no longer hidden to the revealed neighbors that were already being tracked
+        for row, col in cells:
+            flagged = None # only looked up if a tracked neighbor needs it
+            for n in self.get_neighbors(row, col):
+                if n in self._hidden_counts:
+                    self._hidden_counts[n] -= 1
+                    if flagged is None:
+                        flagged = self.board.board[row][col].is_flag
+                    if flagged:
+                        self._flag_counts[n] -= 1
+                    touched.add(n)
+        # Then start tracking the new cells, which count their neighbors from the current board
+        for row, col in cells:
+            self._index_cell(row, col)
+            touched.add((row, col))
+        self._update_frontier(touched)
+
+    def _flag_changed(self, row, col, delta):
+        # Updates the frontier index after a flag was placed on (delta 1) or removed from (delta -1) (row, col)
+        touched = set()
+        for n in self.get_neighbors(row, col):
+            if n in self._flag_counts:
+                self._flag_counts[n] += delta
+                touched.add(n)
+        self._update_frontier(touched)
+
+    def resync(self):
+        """Rebuild the frontier index from scratch from the board as it is now"""
+        self._changes.drain() # everything recorded so far is already on the board
+        self._frontier.clear()
+        self._numbers.clear()
+        self._hidden_counts.clear()
+        self._flag_counts.clear()
+        # Only numbered cells are tracked, and the board can find those faster than visiting every cell
+        for r, c in self.board.numbered_cells():
+            self._index_cell(r, c)
+        self._update_frontier(self._hidden_counts.keys())
+        self._indexed = True
+
+    def _index_cell(self, row, col):
+        # Start tracking the neighbor counts of a revealed numbered cell
+        cell = self.board.board[row][col]
+        if not cell.is_revealed or cell.is_mine or cell.adjacent_mines == 0 or (row, col) in self._hidden_counts:
+            return
+        hidden, flagged = self.board.neighbor_counts(row, col)
+        self._numbers[(row, col)] = cell.adjacent_mines # a revealed number never changes, so it is read once
+        self._hidden_counts[(row, col)] = hidden
+        self._flag_counts[(row, col)] = flagged
+
+    def _update_frontier(self, cells):
+        # A tracked cell is on the frontier while it has hidden neighbors that aren't flagged
+        for cell in cells:
+            if cell in self._hidden_counts and self._hidden_counts[cell] > self._flag_counts[cell]:
+                self._frontier.add(cell)
+            else:
+                self._frontier.discard(cell)
+
+    # Picks a random move on a hidden, un-flagged cell
+    def _choose_easy(self):
+        hidden_cells = self.board.covered_cells()
         if hidden_cells:
-            row, col = random.choice(hidden_cells)
-            self.board.reveal(row, col)
-            return ('reveal', (row, col))
+            self.guesses += 1
+            return ('reveal', self.rng.choice(hidden_cells))
         return None
 
     def _find_basic_move(self):
-    # Looks for basic logical moves (flagging or revealing based on adjacent mine counts)
-        for r in range(config.GRID_ROWS):
-            for c in range(config.GRID_COLS):
-                cell = self.board.board[r][c]
-                if cell.is_revealed and cell.adjacent_mines > 0:
-                    neighbors = self.get_neighbors(r, c)
-                    hidden_neighbors = [n for n in neighbors if not self.board.board[n[0]][n[1]].is_revealed]
-                    flagged_neighbors = [n for n in neighbors if self.board.board[n[0]][n[1]].is_flag]
-
-                    # Rule 1: If hidden neighbors == cell's number, flag them all.
-                    if len(hidden_neighbors) - len(flagged_neighbors) == cell.adjacent_mines - len(flagged_neighbors) and len(hidden_neighbors) > len(flagged_neighbors):
-                        for row, col in hidden_neighbors:
-                            if not self.board.board[row][col].is_flag:
-                                return ('flag', (row, col))
-
-                    # Rule 2: If flagged neighbors == cell's number, reveal other hidden neighbors.
-                    if len(flagged_neighbors) == cell.adjacent_mines:
-                        for row, col in hidden_neighbors:
-                            if not self.board.board[row][col].is_flag:
-                                return ('reveal', (row, col))
+    # Looks for basic logical moves (flagging or revealing based on adjacent mine counts).
+    # Only frontier cells can produce one, so the rest of the board is never looked at.
+        self._refresh_index()
+        for r, c in self._frontier:
+            number = self._numbers[(r, c)]
+            hidden = self._hidden_counts[(r, c)]
+            flagged = self._flag_counts[(r, c)]
+
+            # Rule 1: If hidden neighbors == cell's number, flag them all.
+            # Rule 2: If flagged neighbors == cell's number, reveal other hidden neighbors.
+            if hidden == number:
+                action = 'flag'
+            elif flagged == number:
+                action = 'reveal'
+            else:
+                continue
+
+            # A frontier cell always has a covered neighbor, and the first one is the move
+            covered = self.board.covered_neighbors(r, c)
+            if covered:
+                return (action, covered[0])
         return None
 
-    def medium_move(self):
+    def _find_basic_moves(self):
+    # Collects every move the basic rules allow across the whole frontier, instead of stopping at the first
+        self._refresh_index()
+        reveals = set()
+        flags = set()
+        for r, c in self._frontier:
+            number = self._numbers[(r, c)]
+            if self._hidden_counts[(r, c)] == number:
+                targets = flags
+            elif self._flag_counts[(r, c)] == number:
+                targets = reveals
+            else:
+                continue
+            targets.update(self.board.covered_neighbors(r, c))
+        return [('reveal', cell) for cell in sorted(reveals)] + [('flag', cell) for cell in sorted(flags - reveals)]
+
+    def _choose_medium(self):
     # Applies basic logic, otherwise makes a random move.
         move = self._find_basic_move()
         if move:
-            action, (row, col) = move
-            if action == 'flag':
-                self.board.toggle_flag(row, col)
-                return ('flag', (row, col))
-            elif action == 'reveal':
-                self.board.reveal(row, col)
-                return ('reveal', (row, col))
+            return move
         # If no logical move, make a random one
-        return self.easy_move()
+        return self._choose_easy()
 
-    def hard_move(self):
+    def _choose_hard(self):
     # Applies medium logic + 1-2-1 pattern, otherwise random.
         # Try basic logic first
         move = self._find_basic_move()
         if move:
-            action, (row, col) = move
-            if action == 'flag':
-                self.board.toggle_flag(row, col)
-                return ('flag', (row, col))
-            elif action == 'reveal':
-                self.board.reveal(row, col)
-                return ('reveal', (row, col))
-
-        # 1-2-1 Pattern (Horizontal)
-        for r in range(config.GRID_ROWS):
-            for c in range(config.GRID_COLS - 2):
-                c1, c2, c3 = self.board.board[r][c], self.board.board[r][c+1], self.board.board[r][c+2]
-                if c1.is_revealed and c2.is_revealed and c3.is_revealed and \
-                   c1.adjacent_mines == 1 and c2.adjacent_mines == 2 and c3.adjacent_mines == 1:
-                    # Check for hidden neighbors above or below
-                    for offset in (-1, 1):
-                        nr = r + offset
-                        if 0 <= nr < config.GRID_ROWS:
-                            nc1 = self.board.board[nr][c]
-                            nc2 = self.board.board[nr][c+1]
-                            nc3 = self.board.board[nr][c+2]
-                            if not nc1.is_revealed and not nc2.is_revealed and not nc3.is_revealed:
-                                # Flag outer
-                                if not nc1.is_flag:
-                                    self.board.toggle_flag(nr, c)
-                                    return ('flag', (nr, c))
-                                if not nc3.is_flag:
-                                    self.board.toggle_flag(nr, c + 2)
-                                    return ('flag', (nr, c + 2))
-                                # Reveal inner
-                                if not nc2.is_flag:
-                                    self.board.reveal(nr, c + 1)
-                                    return ('reveal', (nr, c + 1))
-
-        # 1-2-1 Pattern (Vertical)
-        for c in range(config.GRID_COLS):
-            for r in range(config.GRID_ROWS - 2):
-                c1, c2, c3 = self.board.board[r][c], self.board.board[r+1][c], self.board.board[r+2][c]
-                if c1.is_revealed and c2.is_revealed and c3.is_revealed and \
-                   c1.adjacent_mines == 1 and c2.adjacent_mines == 2 and c3.adjacent_mines == 1:
-                    # Check for hidden neighbors left or right
-                    for offset in (-1, 1):
-                        nc = c + offset
-                        if 0 <= nc < config.GRID_COLS:
-                            nc1 = self.board.board[r][nc]
-                            nc2 = self.board.board[r+1][nc]
-                            nc3 = self.board.board[r+2][nc]
-                            if not nc1.is_revealed and not nc2.is_revealed and not nc3.is_revealed:
-                                # Flag outer
-                                if not nc1.is_flag:
-                                    self.board.toggle_flag(r, nc)
-                                    return ('flag', (r, nc))
-                                if not nc3.is_flag:
-                                    self.board.toggle_flag(r + 2, nc)
-                                    return ('flag', (r + 2, nc))
-                                # Reveal inner
-                                if not nc2.is_flag:
-                                    self.board.reveal(r + 1, nc)
-                                    return ('reveal', (r + 1, nc))
+            return move
+
+        # The 1-2-1 pattern reads rows and columns of a square board that doesn't wrap, so on any
+        # other topology it would flag and reveal cells the pattern doesn't imply
+        if self.board.topology.kind != 'square':
+            return self._choose_easy()
+
+        # The middle 2 of a 1-2-1 still has hidden neighbors, so it is on the frontier
+        for r, c in list(self._frontier):
+            if self._numbers[(r, c)] != 2:
+                continue
+
+            # 1-2-1 Pattern (Horizontal): check for hidden neighbors above or below
+            if 0 < c < self.board.cols - 1:
+                move = self._find_121_move([(r, c - 1), (r, c), (r, c + 1)], (1, 0))
+                if move:
+                    return move
+
+            # 1-2-1 Pattern (Vertical): check for hidden neighbors left or right
+            if 0 < r < self.board.rows - 1:
+                move = self._find_121_move([(r - 1, c), (r, c), (r + 1, c)], (0, 1))
+                if move:
+                    return move
 
         # Fallback to random move
-        return self.easy_move()
+        return self._choose_easy()
+
+    def _find_121_move(self, line, step):
+    # Plays the 1-2-1 pattern along three cells in a line, looking at the cells either side of it
+        c1, c2, c3 = (self.board.board[r][c] for r, c in line)
+        if not (c1.is_revealed and c2.is_revealed and c3.is_revealed and
+                c1.adjacent_mines == 1 and c2.adjacent_mines == 2 and c3.adjacent_mines == 1):
+            return None
+
+        for offset in (-1, 1):
+            side = [(r + offset * step[0], c + offset * step[1]) for r, c in line]
+            if not all(0 <= r < self.board.rows and 0 <= c < self.board.cols for r, c in side):
+                continue
+            nc1, nc2, nc3 = (self.board.board[r][c] for r, c in side)
+            if not nc1.is_revealed and not nc2.is_revealed and not nc3.is_revealed:
+                # Flag outer
+                if not nc1.is_flag:
+                    return ('flag', side[0])
+                if not nc3.is_flag:
+                    return ('flag', side[2])
+                # Reveal inner
+                if not nc2.is_flag:
+                    return ('reveal', side[1])
+        return None
+
+    def find_forced_moves(self):
+        """Finds every move that is logically forced by the revealed numbers, using constraint propagation
+
+        Returns:
+            list[tuple[str, tuple[int, int]]]: The forced ('reveal', (row, col)) moves followed by the forced ('flag', (row, col)) moves
+        """
+        self._refresh_index()
+        safe, mines = find_forced(self._build_constraints())
+        self._known_mines |= mines
+        return [('reveal', cell) for cell in sorted(safe)] + [('flag', cell) for cell in sorted(mines)]
+
+    def _build_constraints(self):
+    # Turns every frontier cell into "exactly N of these hidden cells are mines"
+        constraints = []
+        for r, c in self._frontier:
+            # Flagged neighbors come from the index; proven mines among the covered ones count too
+            unknown = []
+            mines = self._flag_counts[(r, c)]
+            for n in self.board.covered_neighbors(r, c):
+                if n in self._known_mines:
+                    mines += 1
+                else:
+                    unknown.append(n)
+            value = self._numbers[(r, c)] - mines
+            # Skip constraints that a wrongly placed flag has made impossible
+            if unknown and 0 <= value <= len(unknown):
+                constraints.append((frozenset(unknown), value))
+        return constraints
+
+    def _choose_expert(self):
+    # Plays the forced moves from the deduction engine one per turn, deducing a new batch when they
+    # run out, and only guesses when nothing is forced.
+        for attempt in range(2):
+            while self._pending:
+                action, (row, col) = self._pending.popleft()
+                cell = self.board.board[row][col]
+                # The player may have played this cell since the batch was deduced
+                if cell.is_revealed or cell.is_flag:
+                    continue
+                # Out of flags: the mine stays known to the solver without being flagged
+                if action == 'reveal' or self.board.used_flags < self.board.total_mines:
+                    return (action, (row, col))
+            if attempt == 0:
+                self._pending.extend(self.find_forced_moves())
+
+        return self._guess()
+
+    def _guess(self):
+    # Reveals the hidden cell least likely to be a mine, using the exact probabilities of the
+    # frontier cells and the cells off the frontier given how many mines are left
+        constraints = self._build_constraints()
+        constrained = set()
+        for cells, _ in constraints:
+            constrained |= cells
+
+        outside = [cell for cell in self.board.covered_cells() if cell not in self._known_mines and cell not in constrained]
+        if not outside and not constrained:
+            return None
+        self.guesses += 1
+
+        unflagged_known = sum(1 for r, c in self._known_mines if not self.board.board[r][c].is_flag)
+        mines_left = self.board.total_mines - self.board.used_flags - unflagged_known
+        result = self._probabilities.probabilities(constraints, len(outside), mines_left, self.cancel_event)
+        if result is None:
+            # A wrongly placed flag can make the numbers contradict each other, so just pick at random
+            return ('reveal', self.rng.choice(outside + sorted(constrained)))
+
+        probabilities, outside_probability = result
+        # The cells of components too big to enumerate get no probability of their own; the engine
+        # counts them as outside cells, so they are guessed from at the outside probability too
+        outside += sorted(constrained - probabilities.keys())
+        candidates = sorted(probabilities.items())
+        if outside:
+            candidates.append((None, outside_probability))
+        lowest = min(probability for _, probability in candidates)
+        best = [cell for cell, probability in candidates if probability <= lowest + 1e-9]
+        choice = self.rng.choice(best)
+        return ('reveal', choice if choice is not None else self.rng.choice(outside))
@@ -0,0 +1,107 @@
+# minesweeper/ai_worker.py
+# Runs AISolver searches on a background thread so a slow search never blocks the game loop
+# Inputs: The AISolver whose turn it is
+# Outputs: The chosen move, posted back through a queue for the main loop to apply
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import logging
+import queue
+import threading
+
+from minesweeper.ai_solver import AISolver
+from minesweeper.probability import SearchCancelled
+
+logger = logging.getLogger(__name__)
+
+
+class AIWorker:
+    """Searches for AI moves on a background thread against a snapshot of the board.
+
+       Only one search is live at a time: requesting a new move or calling cancel() abandons the
+       current one, and any result it still produces is thrown away.
+    """
+
+    def __init__(self, notify=None):
+        """
+        Args:
+            notify (Callable[[], None] | None, optional): Called from the worker thread when a result is
+                ready, e.g. to wake up a main loop sleeping in pygame.event.wait. Defaults to None.
+        """
+        self.results = queue.Queue()
+        self._notify = notify
+        self._lock = threading.Lock()
+        self._generation = 0 # bumped on every request and cancel, so stale results can be recognised
+        self._cancel_event = threading.Event()
+        self._solver = None # the solver whose move is being searched for
+
+    def request_move(self, solver: AISolver):
+        """Starts searching for the solver's next move, cancelling any search already running
+
+        The solver's index is brought up to date here, and the search runs on a fork of the solver
+        with its own copy of the index, pointed at a snapshot of the board that the worker thread
+        takes, so the search never touches the live solver, board or journal. The caller must not
+        change the solver or board until the result arrives or the search is cancelled.
+
+        Args:
+            solver (AISolver): The solver whose move it is
+        """
+        with self._lock:
+            self._cancel_event.set()
+            self._generation += 1
+            generation = self._generation
+            cancel_event = threading.Event()
+            self._cancel_event = cancel_event
+            self._solver = solver
+
+        # Only the index is copied here on the main thread; snapshotting the board takes time in
+        # proportion to its size, so the worker thread does that
+        search_solver = solver.fork()
+        search_solver.cancel_event = cancel_event
+
+        thread = threading.Thread(target=self._search, args=(search_solver, generation, cancel_event), daemon=True)
+        thread.start()
+
+    def cancel(self):
+        """Abandons the running search, if any, e.g. when the player restarts or leaves the game"""
+        with self._lock:
+            self._cancel_event.set()
+            self._generation += 1
+            self._solver = None
+
+    def poll(self) -> tuple[bool, tuple | None]:
+        """Collects the result of the current search without blocking
+
+        The requesting solver takes over the state the search left behind (see AISolver.adopt), so
+        call this on the thread that owns the solver.
+
+        Returns:
+            tuple[bool, tuple | None]: Whether the current search has finished, and if so the move it chose
+            (which is None when there were no moves left, or the search failed)
+        """
+        while True:
+            try:
+                generation, move, search_solver = self.results.get_nowait()
+            except queue.Empty:
+                return False, None
+            if generation == self._generation:
+                if search_solver is not None: # None when the search failed, leaving nothing to adopt
+                    self._solver.adopt(search_solver)
+                return True, move
+
+    def _search(self, solver: AISolver, generation: int, cancel_event: threading.Event):
+        # Runs on the worker thread
+        try:
+            solver.detach_board()
+            move = solver.choose_move()
+        except SearchCancelled:
+            return
+        except Exception:
+            # Still report back, with no move, so the main loop ends the AI's turn instead of waiting forever
+            logger.exception("AI search failed")
+            move, solver = None, None
+        if cancel_event.is_set():
+            return
+        self.results.put((generation, move, solver))
+        if self._notify is not None:
+            self._notify()
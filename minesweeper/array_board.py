@@ -0,0 +1,271 @@
+# minesweeper/array_board.py
+# Contains an array-backed version of BoardGame:
+# 1. ArrayBoardGame: Stores the mine, revealed, flag, can-be-mine and adjacency state of every cell in NumPy arrays instead of a grid of Cell objects.
+# 2. CellView: A thin view of one cell of an ArrayBoardGame, so code written against board.board[row][col] keeps working.
+# Inputs: None
+# Outputs: None
+# Author: Cole Charpentier
+# Creation Date: 10/14/2025
+
+from collections import deque
+
+from minesweeper.board import BoardGame
+from minesweeper.journal import MinesLaid
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional, only ArrayBoardGame needs it
+    np = None
+
+
+class CellView:
+    """A view of a single cell of an ArrayBoardGame with the same attributes as Cell
+    """
+
+    __slots__ = ('_game', '_index')
+
+    def __init__(self, game: 'ArrayBoardGame', index: int):
+        self._game = game
+        self._index = index # row * cols + col; item() reads a flat index straight into a Python scalar
+
+    @property
+    def is_revealed(self) -> bool:
+        return self._game.revealed.item(self._index)
+
+    @is_revealed.setter
+    def is_revealed(self, value: bool):
+        self._game.revealed.flat[self._index] = value
+
+    @property
+    def is_flag(self) -> bool:
+        return self._game.flags.item(self._index)
+
+    @is_flag.setter
+    def is_flag(self, value: bool):
+        self._game.flags.flat[self._index] = value
+
+    @property
+    def is_mine(self) -> bool:
+        return self._game.mines.item(self._index)
+
+    @is_mine.setter
+    def is_mine(self, value: bool):
+        self._game.mines.flat[self._index] = value
+
+    @property
+    def can_be_mine(self) -> bool:
+        return self._game.can_be_mine.item(self._index)
+
+    @can_be_mine.setter
+    def can_be_mine(self, value: bool):
+        self._game.can_be_mine.flat[self._index] = value
+
+    @property
+    def adjacent_mines(self) -> int:
+        return self._game.adjacent.item(self._index)
+
+    @adjacent_mines.setter
+    def adjacent_mines(self, value: int):
+        self._game.adjacent.flat[self._index] = value
+
+
+class _RowView:
+    """One row of an ArrayBoardGame, indexed by column
+    """
+
+    __slots__ = ('_game', '_start', '_cols')
+
+    def __init__(self, game: 'ArrayBoardGame', row: int):
+        self._game = game
+        self._cols = game.cols
+        self._start = row * self._cols # flat index of the row's first cell
+
+    def __getitem__(self, col: int) -> CellView:
+        return CellView(self._game, self._start + col)
+
+    def __len__(self) -> int:
+        return self._cols
+
+    def __iter__(self):
+        for col in range(self._cols):
+            yield CellView(self._game, self._start + col)
+
+
+class _GridView:
+    """The whole grid of an ArrayBoardGame, indexed as grid[row][col] like BoardGame.board
+    """
+
+    __slots__ = ('_rows',)
+
+    def __init__(self, game: 'ArrayBoardGame'):
+        # One view per row, made once, so grid[row] is a plain list lookup
+        self._rows = [_RowView(game, row) for row in range(game.rows)]
+
+    def __getitem__(self, row: int) -> _RowView:
+        return self._rows[row]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class _FlatView:
+    """The cells of an ArrayBoardGame indexed by row * cols + col, like BoardGame.cells
+    """
+
+    __slots__ = ('_game',)
+
+    def __init__(self, game: 'ArrayBoardGame'):
+        self._game = game
+
+    def __getitem__(self, index: int) -> CellView:
+        return CellView(self._game, index)
+
+    def __len__(self) -> int:
+        return self._game.mines.size
+
+
+def neighbor_mine_counts(mines: 'np.ndarray') -> 'np.ndarray':
+    """Counts the mines around every cell of a grid in one vectorized pass
+
+    Args:
+        mines (np.ndarray): 2D boolean array that is True where there is a mine
+
+    Returns:
+        np.ndarray: 2D uint8 array holding the number of mines among each cell's eight neighbors
+    """
+    rows, cols = mines.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = mines
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr == 1 and dc == 1:
+                continue
+            counts += padded[dr:dr + rows, dc:dc + cols]
+    return counts
+
+
+class ArrayBoardGame(BoardGame):
+    """A BoardGame that stores its cells as NumPy arrays rather than a grid of Cell objects.
+       board.board[row][col] still works, but returns a CellView onto the arrays.
+    """
+
+    def __init__(self, rows: int | None = None, cols: int | None = None, mines: int = 0, seed: int | None = None,
+                 topology: str = 'square'):
+        if np is None:
+            raise ImportError("ArrayBoardGame requires NumPy. Install it with: python -m pip install numpy")
+        super().__init__(rows, cols, mines, seed, topology)
+
+    def _create_grid(self):
+        """Allocate one array per cell attribute and return a grid view over them"""
+        shape = (self.rows, self.cols)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flags = np.zeros(shape, dtype=bool)
+        self.can_be_mine = np.ones(shape, dtype=bool)
+        self.adjacent = np.zeros(shape, dtype=np.uint8)
+        return _GridView(self)
+
+    def _flat_cells(self):
+        """Return a view of the cells indexed as cells[row * cols + col]"""
+        return _FlatView(self)
+
+    def init_board(self, positions=None):
+        """Place mines on the board and calculate every adjacent mine count at once
+
+        Args:
+            positions (Iterable[tuple[int, int]] | None, optional): The (row, col) of every mine, or None
+                to place total_mines at random. Defaults to None.
+        """
+        self.mine_positions = list(positions) if positions is not None else self._choose_mine_positions()
+        if self.mine_positions:
+            rows, cols = zip(*self.mine_positions)
+            self.mines[rows, cols] = True
+            self.can_be_mine[rows, cols] = False
+        self.adjacent[:] = self._neighbor_mine_counts()
+        self._count_safe_remaining()
+        self.journal.record(MinesLaid(tuple(self.mine_positions), positions is None))
+
+    def _neighbor_mine_counts(self) -> 'np.ndarray':
+        """Count every cell's adjacent mines at once, with shifted adds on a square board and the
+           topology's neighbor tables otherwise"""
+        if self.topology_kind == 'square':
+            return neighbor_mine_counts(self.mines)
+        topology = self.topology
+        indptr = np.frombuffer(topology.indptr, dtype=np.int32)
+        indices = np.frombuffer(topology.indices, dtype=np.int32)
+        owners = np.repeat(np.arange(topology.size), np.diff(indptr))
+        counts = np.bincount(owners, weights=self.mines.ravel()[indices], minlength=topology.size)
+        return counts.astype(np.uint8).reshape(self.rows, self.cols)
+
+    def _count_safe_remaining(self):
+        """Reset the running count of unrevealed safe cells after the mines have been laid"""
+        self.safe_remaining = int(np.count_nonzero(~self.mines & ~self.revealed))
+
+    def flood_reveal(self, row, col):
+        """Same flood as BoardGame.flood_reveal, but reads the arrays directly and marks every opened
+           cell revealed in one assignment at the end
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every cell that was uncovered
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return set()
+        revealed = self.revealed.item
+        flags = self.flags.item
+        adjacent = self.adjacent.item
+        neighbors = self.topology.neighbors
+        cols = self.cols
+        start = row * cols + col
+        if flags(start) or revealed(start):
+            return set()
+
+        opened = {start}
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            if adjacent(index) > 0:
+                continue
+            for n in neighbors(index):
+                if n in opened or flags(n) or revealed(n):
+                    continue
+                opened.add(n)
+                queue.append(n)
+
+        np.put(self.revealed, list(opened), True)
+        self.safe_remaining -= len(opened) # flooding never uncovers a mine
+        return {divmod(index, cols) for index in opened}
+
+    def covered_cells(self):
+        """The (row, col) of every cell that is neither revealed nor flagged, found in one array pass"""
+        cols = self.cols
+        return [divmod(index, cols) for index in np.flatnonzero(~(self.revealed | self.flags)).tolist()]
+
+    def numbered_cells(self):
+        """The (row, col) of every revealed cell that shows a number, found in one array pass"""
+        cols = self.cols
+        numbered = self.revealed & ~self.mines & (self.adjacent > 0)
+        return [divmod(index, cols) for index in np.flatnonzero(numbered).tolist()]
+
+    def neighbor_counts(self, row, col):
+        """Counts the hidden and flagged hidden neighbors of a cell straight from the arrays, without cell views"""
+        revealed = self.revealed.item
+        flags = self.flags.item
+        hidden = 0
+        flagged = 0
+        for n in self.topology.neighbors(row * self.cols + col):
+            if not revealed(n):
+                hidden += 1
+                if flags(n):
+                    flagged += 1
+        return hidden, flagged
+
+    def covered_neighbors(self, row, col):
+        """The (row, col) of the neighbors of a cell that are neither revealed nor flagged, read straight from the arrays"""
+        revealed = self.revealed.item
+        flags = self.flags.item
+        cols = self.cols
+        return [divmod(n, cols) for n in self.topology.neighbors(row * cols + col) if not revealed(n) and not flags(n)]
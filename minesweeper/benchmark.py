@@ -0,0 +1,299 @@
+# minesweeper/benchmark.py
+# Microbenchmarks for the engine, solver and renderer hot paths, with baselines to catch regressions
+# Inputs: Command line arguments (board sizes, cases to run, baseline file to save or compare against)
+# Outputs: Time per call for each case and board size, and the change from a saved baseline
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from minesweeper.board import BoardGame
+from minesweeper.ai_solver import AISolver
+
+DEFAULT_SIZES = [8, 16, 30, 100, 300, 1000]
+AI_DIFFICULTIES = ['easy', 'medium', 'hard', 'expert']
+
+# Fraction of cells that are mines on the boards the benchmarks play on
+DEFAULT_DENSITY = 0.15
+
+# How many AI moves each make_move sample plays. The first sample starts from the position after
+# the first click, and later ones carry on the same game until it ends.
+SOLVER_MOVES = 10
+
+
+class BenchmarkResult:
+    """Timings of one benchmark case on one board size
+    """
+
+    def __init__(self, case: str, size: int, samples: list[float]):
+        self.case = case
+        self.size = size
+        self.samples = samples # seconds per call, one entry per timed sample
+
+    @property
+    def best(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+
+def _new_board(size: int, density: float, board_class: type, seed: int) -> BoardGame:
+    # A square board with the given density of mines, leaving room for the safe first click
+    mines = min(round(size * size * density), board_class.max_mines(size, size))
+    board = board_class(size, size, mines, seed)
+    board.phase = 'ai'
+    return board
+
+
+def _opened_board(size: int, density: float, board_class: type, seed: int) -> BoardGame:
+    # A board that has had its first click in the middle
+    board = _new_board(size, density, board_class, seed)
+    board.reveal(size // 2, size // 2)
+    return board
+
+
+def bench_init_board(size, density, board_class, seed):
+    board = _new_board(size, density, board_class, seed)
+    return board.init_board, None
+
+
+def bench_handle_first_click(size, density, board_class, seed):
+    board = _new_board(size, density, board_class, seed)
+    return lambda: board.handle_first_click(size // 2, size // 2), None
+
+
+def bench_flood_reveal(size, density, board_class, seed):
+    # An open board with no mines, so one flood uncovers every cell
+    board = _new_board(size, 0, board_class, seed)
+    board.handle_first_click(0, 0)
+    return lambda: board.flood_reveal(0, 0), None
+
+
+def bench_check_win(size, density, board_class, seed):
+    board = _opened_board(size, density, board_class, seed)
+    return board.check_win, None
+
+
+def _bench_solver(difficulty):
+    def bench(size, density, board_class, seed):
+        board = _opened_board(size, density, board_class, seed)
+        solver = AISolver(board, difficulty, seed)
+        solver.resync()
+
+        played = 0
+
+        def play():
+            nonlocal played
+            played = 0
+            for _ in range(SOLVER_MOVES):
+                if board.phase != 'ai' or solver.make_move() is None:
+                    break
+                played += 1
+        # Time per move actually played; none played means the game is over and needs a new board
+        return play, lambda: played
+    return bench
+
+
+def _use_offscreen_display():
+    # Renders through SDL's dummy video driver, so no window is needed, and keeps pygame's import
+    # banner out of the results table. Must run before pygame is first imported.
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+
+_manager = None # the UI manager draw_board draws through, made along with the display
+
+
+def _display():
+    # The offscreen display every draw_board sample renders to, set up the first time it's needed
+    _use_offscreen_display()
+    import pygame
+    import pygame_gui
+    import config
+
+    global _manager
+    screen = pygame.display.get_surface()
+    if screen is None:
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
+    if _manager is None:
+        _manager = pygame_gui.UIManager((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
+    return screen, _manager
+
+
+def bench_draw_board(size, density, board_class, seed):
+    from minesweeper.ui.view import draw_board
+
+    screen, manager = _display()
+    board = _opened_board(size, density, board_class, seed)
+    return lambda: draw_board(manager, screen, board), None
+
+
+CASES = {
+    'init_board': bench_init_board,
+    'handle_first_click': bench_handle_first_click,
+    'flood_reveal': bench_flood_reveal,
+    'check_win': bench_check_win,
+}
+for _difficulty in AI_DIFFICULTIES:
+    CASES[f'make_move_{_difficulty}'] = _bench_solver(_difficulty)
+CASES['draw_board'] = bench_draw_board
+
+# Cases that change the board, so every sample needs a fresh setup
+ONE_SHOT_CASES = {'init_board', 'handle_first_click', 'flood_reveal'}
+# Cases fast enough that each sample loops them, so the timer's resolution doesn't dominate
+LOOPED_CASES = {'check_win'}
+
+
+def _missing_dependency(case: str) -> str | None:
+    # Name of an optional package the case needs but isn't installed, if any
+    if case == 'draw_board':
+        for module in ('pygame', 'pygame_gui'):
+            try:
+                __import__(module)
+            except ImportError:
+                return module
+    return None
+
+
+def run_case(case: str, size: int, density: float = DEFAULT_DENSITY, board_class: type = BoardGame, seed: int = 0, min_time: float = 0.2, max_samples: int = 50) -> BenchmarkResult:
+    """Times one case on one board size, taking samples until min_time has been spent timing
+
+    Args:
+        case (str): A key of CASES
+        size (int): Rows and columns of the square board
+        density (float, optional): Fraction of cells that are mines. Defaults to DEFAULT_DENSITY.
+        board_class (type, optional): The BoardGame implementation to time. Defaults to BoardGame.
+        seed (int, optional): Seed for the boards and solvers, so every run times the same positions. Defaults to 0.
+        min_time (float, optional): Seconds of timed work to collect before stopping. Defaults to 0.2.
+        max_samples (int, optional): Most samples to take. Defaults to 50.
+
+    Returns:
+        BenchmarkResult: The seconds per call of every sample
+    """
+    setup = CASES[case]
+    # One untimed call first, so lazy imports and the topology tables for this size aren't
+    # counted against the first sample
+    warm_up, _ = setup(size, density, board_class, seed)
+    warm_up()
+    samples = []
+    spent = 0.0
+    function = None
+    while len(samples) < max_samples and (not samples or spent < min_time):
+        # Every sample of a case that changes the board starts again from a fresh, identically seeded board
+        fresh = function is None or case in ONE_SHOT_CASES
+        if fresh:
+            function, count_calls = setup(size, density, board_class, seed)
+        calls = 1000 if case in LOOPED_CASES else 1
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if count_calls is not None:
+            calls = count_calls()
+            if calls == 0:
+                if fresh: # a game that is over as soon as it starts has no moves to time
+                    break
+                # The game this sample was playing had already ended, so start another
+                function = None
+                continue
+        spent += elapsed
+        samples.append(elapsed / calls)
+    return BenchmarkResult(case, size, samples or [0.0])
+
+
+def load_baseline(path: str) -> dict:
+    """Reads a baseline saved with --save
+
+    Args:
+        path (str): The baseline file
+
+    Returns:
+        dict: case -> board size (as a string) -> best seconds per call
+    """
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def save_baseline(path: str, results: list[BenchmarkResult], board_backend: str) -> None:
+    """Writes the best time of every result to a baseline file
+
+    Args:
+        path (str): The file to write
+        results (list[BenchmarkResult]): The results to save
+        board_backend (str): The board backend they were timed on
+    """
+    table = {}
+    for result in results:
+        table.setdefault(result.case, {})[str(result.size)] = result.best
+    with open(path, 'w') as file:
+        json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'backend': board_backend,
+                   'results': table}, file, indent=2)
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Time the engine, solver and renderer hot paths.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help="square board sizes to time")
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES), help="cases to run")
+    parser.add_argument('--density', type=float, default=DEFAULT_DENSITY, help="fraction of cells that are mines")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the benchmarked boards")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds to spend timing each case and size")
+    parser.add_argument('--backend', choices=['list', 'array'], default='list', help="board storage: Cell objects or NumPy arrays")
+    parser.add_argument('--save', default=None, help="save the results as a baseline to this file")
+    parser.add_argument('--compare', default=None, help="compare the results against a baseline saved with --save")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown against the baseline that counts as a regression")
+    args = parser.parse_args(argv)
+    _use_offscreen_display()
+
+    board_class = BoardGame
+    if args.backend == 'array':
+        from minesweeper.array_board import ArrayBoardGame
+        board_class = ArrayBoardGame
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    results = []
+    regressions = []
+    print(f"{'case':<20} {'size':>6} {'best':>10} {'median':>10} {'baseline':>10} {'change':>8}")
+    for case in args.cases:
+        missing = _missing_dependency(case)
+        if missing:
+            print(f"{case:<20} skipped: {missing} is not installed")
+            continue
+        for size in args.sizes:
+            result = run_case(case, size, args.density, board_class, args.seed, args.min_time)
+            results.append(result)
+            line = f"{case:<20} {size:>6} {_format_time(result.best):>10} {_format_time(result.median):>10}"
+            before = baseline.get(case, {}).get(str(size))
+            if before:
+                ratio = result.best / before
+                line += f" {_format_time(before):>10} {ratio - 1:>+8.1%}"
+                if ratio > args.threshold:
+                    regressions.append((case, size, ratio))
+                    line += "  REGRESSION"
+            print(line, flush=True)
+
+    if args.save:
+        save_baseline(args.save, results, args.backend)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold - 1:.0%} slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,12 @@
 # Creation Date: 9/4/2025
 
 import config
+import copy
 import random
+import time
+from collections import deque
+from minesweeper.journal import Journal, CellRevealed, FlagPlaced, FlagRemoved, PhaseChanged, MinesLaid, MovePlayed
+from minesweeper.topology import TOPOLOGIES, Topology, get_topology
 
 
 class Cell:
@@ -26,102 +31,335 @@ class BoardGame:
     """Represents the board in the minesweeper game
     """
 
-    def __init__(self):
-        self.board = [[Cell() for _ in range(config.GRID_COLS)] for _ in range(config.GRID_ROWS)]
-        self.total_mines = 0 # to be set later when the user gives us a value
+    def __init__(self, rows: int | None = None, cols: int | None = None, mines: int = 0, seed: int | None = None,
+                 topology: str = 'square'):
+        """Creates an empty board. Any geometry not given is taken from config at creation time, and
+           is fixed for the life of the board, so a later config.set_difficulty doesn't resize a game in progress.
+
+        Args:
+            rows (int | None, optional): Number of rows. Defaults to config.GRID_ROWS.
+            cols (int | None, optional): Number of columns. Defaults to config.GRID_COLS.
+            mines (int, optional): Number of mines to place on the first click. Defaults to 0.
+            seed (int | None, optional): Seed for this board's mine layout. Defaults to a freshly drawn random seed.
+            topology (str, optional): Which cells neighbor each other: 'square', 'torus' or 'hex'. Defaults to 'square'.
+
+        Raises:
+            ValueError: If the mines can't all be placed clear of the first click and its neighbors
+        """
+        self._rows = rows if rows is not None else config.GRID_ROWS
+        self._cols = cols if cols is not None else config.GRID_COLS
+        if not 0 <= mines <= self.max_mines(self._rows, self._cols, topology):
+            raise ValueError(f"Cannot place {mines} mines on a {self._rows}x{self._cols} {topology} board, "
+                             f"at most {self.max_mines(self._rows, self._cols, topology)} fit around the first click")
+        self.cell_size = config.CELL_SIZE # size in pixels the board is drawn at
+        # Every board gets its own seeded RNG so a layout can be reproduced from (seed, first click)
+        self.seed = seed if seed is not None else random.randrange(2**63)
+        self.rng = random.Random(self.seed)
+        # Every mutation is recorded here as an event for renderers, solvers and other consumers to drain
+        self.journal = Journal()
+        self.topology_kind = topology
+        self._topology = None # looked up on first use, see the topology property
+        self.board = self._create_grid()
+        self.cells = self._flat_cells() # the same cells as board, indexed by row * cols + col
+        self.total_mines = mines
         self.used_flags = 0
-        self.phase = 'ready'
+        self._phase = 'ready'
         self.flags_remaining = 0 # to be calculated as total_mines - used_flags
         self.is_first_click = True
+        self.mine_positions = [] # (row, col) of every mine, filled in by init_board
+        self.excluded_cells = set() # row * cols + col of the cells that must not be mines
+        # Optional hook that picks the mine layout on the first click instead of the board's seeded RNG,
+        # e.g. a no-guess generator: called as layout_provider(board, row, col), it returns the (row, col)
+        # of every mine, keeping the excluded cells clear, or None to fall back to a random layout
+        self.layout_provider = None
+        # Whether the mine layout is known to be solvable without guessing: None unless a no-guess
+        # layout provider was asked, which sets it to True, or False if it had to fall back to a random layout
+        self.no_guess = None
+        self.safe_remaining = self.rows * self.cols # unrevealed cells that aren't mines
+
+    @staticmethod
+    def max_mines(rows: int, cols: int, topology: str = 'square') -> int:
+        """The most mines a board can hold while keeping any first click and its neighbors clear
+
+        Args:
+            rows (int): Number of rows
+            cols (int): Number of columns
+            topology (str, optional): Which cells neighbor each other. Defaults to 'square'.
 
-    def init_board(self):
-        """Randomly place mines on the board and calculate adjacent mine counts"""
-
-        # Place mines randomly on the board. Use (row, col) ordering everywhere
-        mines_placed = 0
-        attempts = 0
-        max_attempts = self.total_mines * 10 + 100
-        while mines_placed < self.total_mines and attempts < max_attempts:
-            row = random.randint(0, config.GRID_ROWS - 1)
-            col = random.randint(0, config.GRID_COLS - 1)
-            if self.board[row][col].can_be_mine and not self.board[row][col].is_mine:
-                self.board[row][col].is_mine = True
-                self.board[row][col].can_be_mine = False
-                self.update_adjacent_mines(row, col)
-                mines_placed += 1
-            attempts += 1
+        Raises:
+            ValueError: If the topology isn't a known one
+
+        Returns:
+            int: The largest valid mine count, which is 0 on boards too small to hold any
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology {topology!r}, expected one of {', '.join(TOPOLOGIES)}")
+        return max(0, rows * cols - 1 - TOPOLOGIES[topology].max_neighbors)
+
+    @property
+    def rows(self) -> int:
+        """Number of rows on this board"""
+        return self._rows
+
+    @property
+    def cols(self) -> int:
+        """Number of columns on this board"""
+        return self._cols
+
+    @property
+    def phase(self) -> str:
+        """The state of the game: 'ready', 'playing', 'ai', 'won' or 'lost'"""
+        return self._phase
+
+    @phase.setter
+    def phase(self, value: str):
+        if value != self._phase:
+            self.journal.record(PhaseChanged(self._phase, value))
+            self._phase = value
+
+    @property
+    def topology(self) -> Topology:
+        """The neighbor tables for this board's geometry, shared with every board of the same size and kind"""
+        if self._topology is None:
+            self._topology = get_topology(self.topology_kind, self.rows, self.cols)
+        return self._topology
+
+    def _record_revealed(self, cells):
+        """Record a CellRevealed event for each of the given (row, col) cells"""
+        if self.journal.active:
+            self.journal.extend(CellRevealed(row, col) for row, col in cells)
+
+    def snapshot(self) -> 'BoardGame':
+        """Make an independent copy of the board, e.g. for a solver to search on another thread.
+           A layout provider still waiting for the first click is shared rather than copied."""
+        return copy.deepcopy(self, {id(self.layout_provider): self.layout_provider})
+
+    def _create_grid(self):
+        """Create the storage for the board's cells, indexed as grid[row][col]"""
+        return [[Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+
+    def _flat_cells(self):
+        """Create the flat view of the cells, indexed as cells[row * cols + col], sharing the grid's Cell objects"""
+        return [cell for row in self.board for cell in row]
+
+    def init_board(self, positions=None):
+        """Place mines on the board and calculate adjacent mine counts
+
+        Args:
+            positions (Iterable[tuple[int, int]] | None, optional): The (row, col) of every mine, or None
+                to place total_mines at random. Defaults to None.
+        """
+        self.mine_positions = list(positions) if positions is not None else self._choose_mine_positions()
+        for row, col in self.mine_positions:
+            self.board[row][col].is_mine = True
+            self.board[row][col].can_be_mine = False
+            self.update_adjacent_mines(row, col)
+        self._count_safe_remaining()
+        self.journal.record(MinesLaid(tuple(self.mine_positions), positions is None))
+
+    def _count_safe_remaining(self):
+        """Reset the running count of unrevealed safe cells after the mines have been laid"""
+        revealed = sum(cell.is_revealed and not cell.is_mine for row in self.board for cell in row)
+        self.safe_remaining = self.rows * self.cols - len(self.mine_positions) - revealed
+
+    def _choose_mine_positions(self):
+        """Pick exactly total_mines random (row, col) positions, skipping the excluded cells.
+
+           Draws total_mines + len(excluded_cells) distinct cells in one sample and drops any excluded
+           ones; what's left, in draw order, is a uniform sample of the eligible cells.
+
+        Raises:
+            ValueError: If there are fewer eligible cells than mines to place
+        """
+        cell_count = self.rows * self.cols
+        eligible = cell_count - len(self.excluded_cells)
+        if self.total_mines > eligible:
+            raise ValueError(f"Cannot place {self.total_mines} mines, only {eligible} cells can hold a mine")
+
+        draw = self.rng.sample(range(cell_count), min(cell_count, self.total_mines + len(self.excluded_cells)))
+        chosen = [index for index in draw if index not in self.excluded_cells][:self.total_mines]
+        return [divmod(index, self.cols) for index in chosen]
 
     def update_adjacent_mines(self, row, col):
         """Update the adjacent mine counts for all neighboring cells"""
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < config.GRID_ROWS and 0 <= nc < config.GRID_COLS:
-                    self.board[nr][nc].adjacent_mines += 1
+        cells = self.cells
+        for index in self.topology.neighbors(row * self.cols + col):
+            cells[index].adjacent_mines += 1
 
     def reveal(self, row, col): #reveals a cell (row, col)
+        """Reveal the cell at (row, col), flooding out from it if it has no adjacent mines
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every cell this call uncovered
+        """
+        if self.journal.active:
+            self.journal.record(MovePlayed('reveal', row, col, time.monotonic()))
         if self.is_first_click: # first click initialize board and handle first click if so
             self.handle_first_click(row, col)
 
         clicked_cell = self.board[row][col] # gets the cell
         if clicked_cell.is_mine: #if a mine then lose game and reveal all mines
-            self.reveal_all_mines()
+            revealed = self.reveal_all_mines()
+            self._record_revealed(revealed)
             self.phase = "lost" # Set phase after revealing mines
-            return
+            return revealed
         if clicked_cell.adjacent_mines > 0 and not clicked_cell.is_revealed: #is a number reveal it
             clicked_cell.is_revealed=True
+            self.safe_remaining -= 1
+            revealed = {(row, col)}
         else: #if passes all others, start flood reveal since its an empty spot
-            self.flood_reveal(row, col)
+            revealed = self.flood_reveal(row, col)
 
+        self._record_revealed(revealed)
         self.check_win()
+        return revealed
 
     def flood_reveal(self, row, col): # reveals the empty spots
-        if not (0 <= row < config.GRID_ROWS and 0 <= col < config.GRID_COLS): #make sure the cell is in the grid
-            return
-        cell = self.board[row][col] # grab cell
+        """Reveal (row, col) and, breadth first, every cell connected to it through cells with no adjacent mines.
+           Cells are marked revealed as they are queued, so each one is visited at most once.
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every cell that was uncovered
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols): #make sure the cell is in the grid
+            return set()
+        cells = self.cells
+        neighbors = self.topology.neighbors
+        start = row * self.cols + col
+        cell = cells[start] # grab cell
         if cell.is_flag or cell.is_revealed: #if flag or reveal you cant reveal
-            return
+            return set()
 
-        cell.is_revealed=True# passes so reveal
+        cell.is_revealed = True # passes so reveal
+        opened = [start]
+        queue = deque([(start, cell)])
 
-        if cell.adjacent_mines > 0: #stop if neighbor mine
-            return
+        while queue:
+            index, current = queue.popleft()
+            if current.adjacent_mines > 0: #stop if neighbor mine
+                continue
 
-        for dr in (-1, 0, 1): #otherwise continues revealing
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
+            for n in neighbors(index): #otherwise continues revealing
+                neighbor = cells[n]
+                if neighbor.is_flag or neighbor.is_revealed:
                     continue
-                self.flood_reveal(row + dr, col + dc)
+                neighbor.is_revealed = True
+                opened.append(n)
+                queue.append((n, neighbor))
+
+        self.safe_remaining -= len(opened) # flooding never uncovers a mine
+        cols = self.cols
+        return {divmod(index, cols) for index in opened}
+
+    def covered_cells(self):
+        """The cells that are neither revealed nor flagged, e.g. for a solver choosing where to guess
+
+        Returns:
+            list[tuple[int, int]]: The (row, col) of every such cell, in row-major order
+        """
+        cols = self.cols
+        return [divmod(index, cols) for index, cell in enumerate(self.cells) if not cell.is_revealed and not cell.is_flag]
+
+    def numbered_cells(self):
+        """The revealed cells that show a number, i.e. that are safe and touch at least one mine
+
+        Returns:
+            list[tuple[int, int]]: The (row, col) of every such cell, in row-major order
+        """
+        cols = self.cols
+        return [divmod(index, cols) for index, cell in enumerate(self.cells)
+                if cell.is_revealed and not cell.is_mine and cell.adjacent_mines > 0]
+
+    def neighbor_counts(self, row, col):
+        """Counts the neighbors of a cell that aren't revealed, and how many of those are flagged
+
+        Returns:
+            tuple[int, int]: The number of hidden neighbors and the number of flagged ones among them
+        """
+        cells = self.cells
+        hidden = 0
+        flagged = 0
+        for n in self.topology.neighbors(row * self.cols + col):
+            neighbor = cells[n]
+            if not neighbor.is_revealed:
+                hidden += 1
+                if neighbor.is_flag:
+                    flagged += 1
+        return hidden, flagged
+
+    def covered_neighbors(self, row, col):
+        """The neighbors of a cell that are neither revealed nor flagged
+
+        Returns:
+            list[tuple[int, int]]: The (row, col) of each such neighbor, in the topology's neighbor order
+        """
+        cells = self.cells
+        cols = self.cols
+        return [divmod(n, cols) for n in self.topology.neighbors(row * cols + col)
+                if not cells[n].is_revealed and not cells[n].is_flag]
 
     def toggle_flag(self, row, col):
-        """Toggle a flag on a covered cell given (row, col) coordinates"""
+        """Toggle a flag on a covered cell given (row, col) coordinates
+
+        Returns:
+            bool: Whether the cell's flag changed
+        """
 
         # Only handle flags while the game is active
         if self.phase not in ["playing", "ai"]:
-            return
+            return False
 
         # Ensure click maps inside the grid
-        if not (0 <= row < config.GRID_ROWS and 0 <= col < config.GRID_COLS):
-            return
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
 
         # Access target cell
         cell = self.board[row][col]
 
         # Ignore revealed cells
         if cell.is_revealed:
-            return
+            return False
 
         # Toggle flag status
+        if self.journal.active and (cell.is_flag or self.used_flags < self.total_mines):
+            self.journal.record(MovePlayed('flag', row, col, time.monotonic()))
         if cell.is_flag:
             # If flagged remove the flag and decrement counter
             cell.is_flag = False
             self.used_flags = max(0, self.used_flags - 1)
+            self.journal.record(FlagRemoved(row, col))
+            return True
         else:
             if self.used_flags < self.total_mines:
                 cell.is_flag = True
                 self.used_flags += 1
+                self.journal.record(FlagPlaced(row, col))
+                return True
+        return False
+
+    def apply_moves(self, moves):
+        """Apply a batch of moves, e.g. every certain move an AISolver found, stopping if the game ends
+
+        Args:
+            moves (Iterable[tuple[str, tuple[int, int]]]): ('reveal', (row, col)) or ('flag', (row, col)) moves.
+                A flag move places a flag, so it is skipped if the cell is already flagged.
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every cell that was revealed or had its flag changed
+        """
+        changed = set()
+        for action, (row, col) in moves:
+            if self.phase not in ["playing", "ai"]:
+                break
+            cell = self.board[row][col]
+            if cell.is_revealed or cell.is_flag:
+                continue
+            if action == 'flag':
+                if self.toggle_flag(row, col):
+                    changed.add((row, col))
+            else:
+                changed |= self.reveal(row, col)
+        return changed
 
     def check_win(self):
         """Check if the player has won (revealed all non-mine cells)"""
@@ -130,56 +368,47 @@ class BoardGame:
         if self.phase not in ["playing", "ai"]:
             return
 
-        # Iterate through each cell
-        for row in self.board:
-            for cell in row:
-                # If a cell is not a mine and has not been revealed the player has not won so return early
-                if not cell.is_mine and not cell.is_revealed:
-                    return
-        # If this line is reached all non-mine cells have been revealed so player wins
-        self.phase = "won"
+        # reveal and flood_reveal keep a running count of the safe cells left, so once it hits
+        # zero every non-mine cell has been revealed and the player wins
+        if self.safe_remaining == 0:
+            self.phase = "won"
  
     def reveal_all_mines(self):
-        """Used to reveal every mine (called when player loses)"""
-
-        # Iterate through every cell
-        for row in self.board:
-            for cell in row:
-                if cell.is_mine:
-                    # If cell is a mine reveal it
-                    cell.is_revealed = True
+        """Used to reveal every mine (called when player loses)
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every mine that was uncovered
+        """
+        revealed = set()
+
+        # Only the mine cells need visiting, and init_board recorded where they are
+        for row, col in self.mine_positions:
+            cell = self.board[row][col]
+            if not cell.is_revealed:
+                cell.is_revealed = True
+                revealed.add((row, col))
+        return revealed
     
     def handle_first_click(self, row: int, column: int):
         """Generates the minesweeper board such that the given cell is not a mine.
            This ensures that the first click is always safe.
 
         Args:
-            cell (Cell): The cell that was clicked on.
+            row (int): The row of the cell that was clicked on.
+            column (int): The column of the cell that was clicked on.
         """
 
         # Prevent this and adjacent cells from being selected as a mine
-        self.board[row][column].can_be_mine = False
-
-        if row+1 < config.GRID_ROWS:
-            self.board[row+1][column].can_be_mine = False
-        if row-1 >= 0:
-            self.board[row-1][column].can_be_mine = False
-        if column+1 < config.GRID_COLS:
-            self.board[row][column+1].can_be_mine = False
-        if column-1 >= 0:
-            self.board[row][column-1].can_be_mine = False
-        if row+1 < config.GRID_ROWS and column+1 < config.GRID_COLS:
-            self.board[row+1][column+1].can_be_mine = False
-        if row-1 >= 0 and column-1 >= 0:
-            self.board[row-1][column-1].can_be_mine = False
-        if row+1 < config.GRID_ROWS and column-1 >= 0:
-            self.board[row+1][column-1].can_be_mine = False
-        if row-1 >= 0 and column+1 < config.GRID_COLS:
-            self.board[row-1][column+1].can_be_mine = False
-
+        index = row * self.cols + column
+        for excluded in (index, *self.topology.neighbors(index)):
+            self.cells[excluded].can_be_mine = False
+            self.excluded_cells.add(excluded)
 
         # Mark that the first click has been handled
         self.is_first_click = False
 
-        # Generate the board
-        self.init_board()
+        # Generate the board, from the layout provider if there is one. The provider is only needed
+        # once, so let go of it (a pool's provider holds its thread, which can't be copied)
+        positions = self.layout_provider(self, row, column) if self.layout_provider is not None else None
+        self.layout_provider = None
+        self.init_board(positions)
@@ -0,0 +1,357 @@
+# minesweeper/chunked.py
+# Contains a lazily generated, chunked version of BoardGame for endless playfields:
+# 1. ChunkedBoardGame: Splits the board into fixed-size square chunks. Each chunk's mines come from the
+#    board's seed and the chunk's coordinates, and its Cell objects are only created the first time
+#    something touches it, so memory grows with the explored area rather than the board's size.
+# 2. _RowView/_GridView/_FlatView: Let code written against board.board[row][col] or board.cells[index] keep working.
+# Inputs: None
+# Outputs: None
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import random
+from collections import deque
+
+from minesweeper.board import BoardGame, Cell
+from minesweeper.journal import MinesLaid
+from minesweeper.topology import ComputedSquareTopology, Topology
+
+# Width and height of a chunk in cells
+CHUNK_SIZE = 32
+
+# How many chunks around the clicked one a flood reveal may open when no flood area has been set
+FLOOD_CHUNK_RADIUS = 1
+
+
+class _RowView:
+    """One row of a ChunkedBoardGame, indexed by column
+    """
+
+    __slots__ = ('_game', '_row')
+
+    def __init__(self, game: 'ChunkedBoardGame', row: int):
+        self._game = game
+        self._row = row
+
+    def __getitem__(self, col: int) -> Cell:
+        return self._game.cell(self._row, col)
+
+    def __len__(self) -> int:
+        return self._game.cols
+
+    def __iter__(self):
+        for col in range(len(self)):
+            yield self._game.cell(self._row, col)
+
+
+class _GridView:
+    """The whole grid of a ChunkedBoardGame, indexed as grid[row][col] like BoardGame.board
+    """
+
+    __slots__ = ('_game',)
+
+    def __init__(self, game: 'ChunkedBoardGame'):
+        self._game = game
+
+    def __getitem__(self, row: int) -> _RowView:
+        return _RowView(self._game, row)
+
+    def __len__(self) -> int:
+        return self._game.rows
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield _RowView(self._game, row)
+
+
+class _FlatView:
+    """The cells of a ChunkedBoardGame indexed by row * cols + col, like BoardGame.cells
+    """
+
+    __slots__ = ('_game',)
+
+    def __init__(self, game: 'ChunkedBoardGame'):
+        self._game = game
+
+    def __getitem__(self, index: int) -> Cell:
+        return self._game.cell(*divmod(index, self._game.cols))
+
+    def __len__(self) -> int:
+        return self._game.rows * self._game.cols
+
+
+class ChunkedBoardGame(BoardGame):
+    """A BoardGame whose cells are generated chunk by chunk as they are needed.
+
+       Every chunk holds a fixed share of the mines (the board's density times its area), placed by
+       an RNG seeded from the board's seed and the chunk's coordinates. A cell's adjacent mine count
+       only needs the mine layouts of its own and the eight surrounding chunks, which are cheap to
+       generate without creating their cells, so counts are consistent across chunk edges whichever
+       chunk is explored first.
+
+       Only the cells of chunks that were touched exist: reveal_all_mines shows the mines of the
+       explored area, and mine_positions lists the mines of the chunks created so far.
+
+       At low mine densities the cells with no adjacent mines percolate, so one flood could run
+       across the whole board. Flood reveals therefore only open cells inside the flood area (the
+       cells on screen, see set_flood_area), and carry on from where they stopped as the area moves.
+    """
+
+    def __init__(self, rows: int | None = None, cols: int | None = None, mines: int = 0, seed: int | None = None,
+                 chunk_size: int = CHUNK_SIZE):
+        """Creates an empty board. Nothing is allocated per cell until chunks are touched.
+
+        Args:
+            rows (int | None, optional): Number of rows. Defaults to config.GRID_ROWS.
+            cols (int | None, optional): Number of columns. Defaults to config.GRID_COLS.
+            mines (int, optional): Roughly how many mines the whole board should hold; each chunk gets
+                its share, rounded, so total_mines can differ slightly. Defaults to 0.
+            seed (int | None, optional): Seed for every chunk's mine layout. Defaults to a freshly drawn random seed.
+            chunk_size (int, optional): Width and height of a chunk in cells. Defaults to CHUNK_SIZE.
+        """
+        self.chunk_size = chunk_size
+        self._chunks = {} # (chunk row, chunk col) -> the chunk's Cells, indexed [row][col] within the chunk
+        self._chunk_mines = {} # (chunk row, chunk col) -> the chunk's mine layout, as (row, col) on the board
+        self._mines_laid = False
+        self.flood_area = None # (row_start, row_end, col_start, col_end) flood reveals may open, ends exclusive
+        self._flood_edge = {} # (chunk row, chunk col) -> indices of opened zero cells whose flood stopped at the area's edge
+        super().__init__(rows, cols, mines, seed)
+        self.density = mines / (self.rows * self.cols) if self.rows and self.cols else 0.0
+        self.total_mines = self._count_total_mines()
+
+    def _create_grid(self):
+        """Return a grid view that creates each chunk's cells the first time they are looked at"""
+        return _GridView(self)
+
+    def _flat_cells(self):
+        """Return a view of the cells indexed as cells[row * cols + col]"""
+        return _FlatView(self)
+
+    @property
+    def topology(self) -> Topology:
+        """The classic square neighbors, worked out per cell, since the board is far too big for neighbor tables"""
+        if self._topology is None:
+            self._topology = ComputedSquareTopology(self.rows, self.cols)
+        return self._topology
+
+    def _chunk_shape(self, chunk_row: int, chunk_col: int) -> tuple[int, int]:
+        # Chunks on the bottom and right edges are cut short by the board's size
+        size = self.chunk_size
+        return min(size, self.rows - chunk_row * size), min(size, self.cols - chunk_col * size)
+
+    def _mines_in_chunk(self, height: int, width: int) -> int:
+        # A chunk's share of the mines, leaving room for the first click's 3x3 safe area
+        area = height * width
+        return min(round(self.density * area), max(0, area - 9))
+
+    def _count_total_mines(self) -> int:
+        # Sums the per-chunk shares without visiting every chunk: there are at most four chunk shapes
+        size = self.chunk_size
+        heights = {size: self.rows // size}
+        widths = {size: self.cols // size}
+        if self.rows % size:
+            heights[self.rows % size] = 1
+        if self.cols % size:
+            widths[self.cols % size] = 1
+        return sum(h_count * w_count * self._mines_in_chunk(height, width)
+                   for height, h_count in heights.items() for width, w_count in widths.items())
+
+    def mines_of_chunk(self, chunk_row: int, chunk_col: int) -> frozenset:
+        """The mines of one chunk, generated from the seed the first time they are asked for.
+           Only valid once the first click has decided which cells must stay clear.
+
+        Args:
+            chunk_row (int): The chunk's row, i.e. row // chunk_size
+            chunk_col (int): The chunk's column, i.e. col // chunk_size
+
+        Returns:
+            frozenset[tuple[int, int]]: The (row, col) on the board of every mine in the chunk
+        """
+        key = (chunk_row, chunk_col)
+        mines = self._chunk_mines.get(key)
+        if mines is None:
+            height, width = self._chunk_shape(chunk_row, chunk_col)
+            top, left = chunk_row * self.chunk_size, chunk_col * self.chunk_size
+            # Same approach as _choose_mine_positions: draw extra cells and drop any the first click excluded
+            excluded = set()
+            for index in self.excluded_cells:
+                row, col = divmod(index, self.cols)
+                if top <= row < top + height and left <= col < left + width:
+                    excluded.add((row - top) * width + col - left)
+            count = self._mines_in_chunk(height, width)
+            rng = random.Random(f"{self.seed}:{chunk_row}:{chunk_col}")
+            draw = rng.sample(range(height * width), min(height * width, count + len(excluded)))
+            chosen = [index for index in draw if index not in excluded][:count]
+            mines = frozenset((top + index // width, left + index % width) for index in chosen)
+            self._chunk_mines[key] = mines
+        return mines
+
+    def cell(self, row: int, col: int) -> Cell:
+        """Gets a cell, creating its chunk if this is the first time the chunk was touched
+
+        Args:
+            row (int): The row of the cell
+            col (int): The column of the cell
+
+        Returns:
+            Cell: The cell
+        """
+        size = self.chunk_size
+        chunk = self._chunks.get((row // size, col // size))
+        if chunk is None:
+            chunk = self._create_chunk(row // size, col // size)
+        return chunk[row % size][col % size]
+
+    def _create_chunk(self, chunk_row: int, chunk_col: int) -> list:
+        # Creates a chunk's cells, with their mines and adjacent mine counts if the mines have been laid
+        height, width = self._chunk_shape(chunk_row, chunk_col)
+        chunk = [[Cell() for _ in range(width)] for _ in range(height)]
+        self._chunks[(chunk_row, chunk_col)] = chunk
+        if self._mines_laid:
+            self._fill_chunk(chunk_row, chunk_col, chunk)
+        return chunk
+
+    def _fill_chunk(self, chunk_row: int, chunk_col: int, chunk: list):
+        # Places a chunk's mines and counts its cells' adjacent mines, which takes the mine layouts of
+        # the surrounding chunks too (but not their cells)
+        size = self.chunk_size
+        top, left = chunk_row * size, chunk_col * size
+        height, width = len(chunk), len(chunk[0])
+        for row, col in self.mines_of_chunk(chunk_row, chunk_col):
+            cell = chunk[row - top][col - left]
+            cell.is_mine = True
+            cell.can_be_mine = False
+            self.mine_positions.append((row, col))
+
+        for near_row in range(max(chunk_row - 1, 0), min(chunk_row + 2, -(-self.rows // size))):
+            for near_col in range(max(chunk_col - 1, 0), min(chunk_col + 2, -(-self.cols // size))):
+                for mine_row, mine_col in self.mines_of_chunk(near_row, near_col):
+                    # Only mines on or next to this chunk count towards its cells
+                    for r in range(max(mine_row - 1, top), min(mine_row + 2, top + height)):
+                        for c in range(max(mine_col - 1, left), min(mine_col + 2, left + width)):
+                            if (r, c) != (mine_row, mine_col):
+                                chunk[r - top][c - left].adjacent_mines += 1
+
+    def flood_reveal(self, row, col):
+        """Reveal (row, col) and, breadth first, the cells connected to it through cells with no
+           adjacent mines, but only inside the flood area. Where the flood reaches the area's edge it
+           stops, and set_flood_area carries it on once the area covers the cells beyond.
+           Without a flood area (or if the area doesn't hold the cell), the flood stays within
+           FLOOD_CHUNK_RADIUS chunks of the cell.
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every cell that was uncovered
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return set()
+        start = row * self.cols + col
+        cell = self.cells[start]
+        if cell.is_flag or cell.is_revealed:
+            return set()
+
+        area = self.flood_area
+        if area is None or not (area[0] <= row < area[1] and area[2] <= col < area[3]):
+            radius = FLOOD_CHUNK_RADIUS * self.chunk_size
+            top, left = row // self.chunk_size * self.chunk_size, col // self.chunk_size * self.chunk_size
+            area = (top - radius, top + self.chunk_size + radius, left - radius, left + self.chunk_size + radius)
+
+        cell.is_revealed = True
+        opened = [start] + self._flood(deque([start]), area)
+        self.safe_remaining -= len(opened)
+        cols = self.cols
+        return {divmod(index, cols) for index in opened}
+
+    def set_flood_area(self, area: tuple[int, int, int, int]):
+        """Sets the cells flood reveals may open, e.g. the cells on screen, and carries on any flood
+           that stopped at the edge of the old area into the new one
+
+        Args:
+            area (tuple[int, int, int, int]): (row_start, row_end, col_start, col_end), ends exclusive,
+                like Camera.visible_cells
+
+        Returns:
+            set[tuple[int, int]]: The (row, col) of every cell the carried-on floods uncovered
+        """
+        if area == self.flood_area:
+            return set()
+        self.flood_area = area
+        if self.phase not in ["playing", "ai"] or not self._flood_edge:
+            return set()
+
+        # Cells just outside the area can have neighbors inside it, so look one cell further out
+        row_start, row_end, col_start, col_end = area
+        size = self.chunk_size
+        queue = deque()
+        for chunk_row in range(max(row_start - 1, 0) // size, min(row_end, self.rows - 1) // size + 1):
+            for chunk_col in range(max(col_start - 1, 0) // size, min(col_end, self.cols - 1) // size + 1):
+                queue.extend(self._flood_edge.pop((chunk_row, chunk_col), ()))
+        if not queue:
+            return set()
+
+        opened = self._flood(queue, area)
+        self.safe_remaining -= len(opened)
+        cols = self.cols
+        revealed = {divmod(index, cols) for index in opened}
+        self._record_revealed(revealed)
+        self.check_win()
+        return revealed
+
+    def _flood(self, queue: deque, area: tuple[int, int, int, int]) -> list:
+        # Floods out from the revealed cells in the queue without leaving the area, remembering the
+        # zero cells whose flood had to stop at its edge. Returns the indices of the cells it opened.
+        row_start, row_end, col_start, col_end = area
+        cols = self.cols
+        cells = self.cells
+        neighbors = self.topology.neighbors
+        opened = []
+        while queue:
+            index = queue.popleft()
+            if cells[index].adjacent_mines > 0:
+                continue
+            stopped = False
+            for n in neighbors(index):
+                r, c = divmod(n, cols)
+                # Looking at a cell outside the area would create its chunk, so check first
+                if not (row_start <= r < row_end and col_start <= c < col_end):
+                    stopped = True
+                    continue
+                neighbor = cells[n]
+                if neighbor.is_flag or neighbor.is_revealed:
+                    continue
+                neighbor.is_revealed = True
+                opened.append(n)
+                queue.append(n)
+            if stopped:
+                row, col = divmod(index, cols)
+                self._flood_edge.setdefault((row // self.chunk_size, col // self.chunk_size), set()).add(index)
+        return opened
+
+    def init_board(self, positions=None):
+        """Lays the mines: the chunks created so far get theirs now, and every other chunk gets its
+           own as it is created
+
+        Args:
+            positions (None, optional): Must be None; the layout always comes from the seed.
+
+        Raises:
+            ValueError: If positions are given, since a chunked board can't take a whole layout
+        """
+        if positions is not None:
+            raise ValueError("ChunkedBoardGame generates its mines chunk by chunk from its seed")
+        self._mines_laid = True
+        for (chunk_row, chunk_col), chunk in list(self._chunks.items()):
+            self._fill_chunk(chunk_row, chunk_col, chunk)
+        self._count_safe_remaining()
+        self.journal.record(MinesLaid(tuple(self.mine_positions)))
+
+    def _count_safe_remaining(self):
+        """Reset the running count of unrevealed safe cells after the mines have been laid.
+           Only created chunks can have revealed cells, so the rest of the board isn't visited."""
+        revealed = sum(cell.is_revealed and not cell.is_mine
+                       for chunk in self._chunks.values() for row in chunk for cell in row)
+        self.safe_remaining = self.rows * self.cols - self.total_mines - revealed
+
+    @property
+    def chunk_count(self) -> int:
+        """How many chunks have had their cells created"""
+        return len(self._chunks)
@@ -0,0 +1,219 @@
+# minesweeper/deduction.py
+# Constraint-propagation deduction engine used by the expert AI.
+# Every revealed number on the frontier becomes a constraint "exactly N of these hidden cells are mines",
+# and the engine works out every cell that is safe or a mine in all assignments that satisfy them.
+# Inputs: Constraints as (frozenset of cells, mine count) pairs
+# Outputs: The sets of cells that are certainly safe and certainly mines
+# Author: Jakob Huffman
+# Creation Date: 10/15/2025
+
+import time
+from math import gcd
+
+# Subset reduction can derive many constraints from a dense frontier, so cap how far it may grow
+# the system relative to the constraints it started with before moving on to elimination
+MAX_DERIVED_FACTOR = 4
+
+
+def split_components(constraints: list[tuple[frozenset, int]]) -> list[list[tuple[frozenset, int]]]:
+    """Groups constraints into independent components, where two constraints are in the same
+       component if they are linked through shared cells
+
+    Args:
+        constraints (list[tuple[frozenset, int]]): The constraints to split
+
+    Returns:
+        list[list[tuple[frozenset, int]]]: The constraints of each component
+    """
+    parent = {}
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for cells, _ in constraints:
+        first = None
+        for cell in cells:
+            parent.setdefault(cell, cell)
+            if first is None:
+                first = find(cell)
+            else:
+                root = find(cell)
+                if root != first:
+                    parent[root] = first
+
+    components = {}
+    for constraint in constraints:
+        root = find(next(iter(constraint[0])))
+        components.setdefault(root, []).append(constraint)
+    return list(components.values())
+
+
+def find_forced(constraints: list[tuple[frozenset, int]], deadline: float | None = None) -> tuple[set, set]:
+    """Finds every cell whose state is forced by the constraints
+
+    Runs trivial checks, then subset/superset reduction, then Gaussian elimination, substituting
+    what each stage learns back into the constraints until nothing new can be deduced.
+
+    Args:
+        constraints (list[tuple[frozenset, int]]): (cells, number of mines among those cells) pairs
+        deadline (float | None, optional): time.monotonic() after which to stop, returning only what was
+            deduced by then (every cell returned is still certain). Defaults to None, for no limit.
+
+    Returns:
+        tuple[set, set]: The cells that are certainly safe and the cells that are certainly mines
+    """
+    safe = set()
+    mines = set()
+    system = {cells: value for cells, value in constraints if cells}
+
+    while system and not _past(deadline):
+        newly_safe, newly_mines = _trivial(system)
+        if not newly_safe and not newly_mines:
+            if _reduce_subsets(system, len(constraints) * MAX_DERIVED_FACTOR, deadline):
+                continue
+            newly_safe, newly_mines = set(), set()
+            for component in split_components(list(system.items())):
+                if _past(deadline):
+                    break
+                component_safe, component_mines = _eliminate(component)
+                newly_safe |= component_safe
+                newly_mines |= component_mines
+            if not newly_safe and not newly_mines:
+                break
+
+        safe |= newly_safe
+        mines |= newly_mines
+        system = _substitute(system, newly_safe, newly_mines)
+
+    return safe, mines
+
+
+def _past(deadline: float | None) -> bool:
+    # Whether a find_forced deadline has passed
+    return deadline is not None and time.monotonic() > deadline
+
+
+def _trivial(system: dict) -> tuple[set, set]:
+    # A constraint with no mines left is all safe, and one with as many mines as cells is all mines
+    safe = set()
+    mines = set()
+    for cells, value in system.items():
+        if value == 0:
+            safe |= cells
+        elif value == len(cells):
+            mines |= cells
+    return safe, mines
+
+
+def _substitute(system: dict, safe: set, mines: set) -> dict:
+    # Removes known cells from every constraint, dropping constraints that are used up or contradictory
+    known = safe | mines
+    reduced = {}
+    for cells, value in system.items():
+        if cells.isdisjoint(known):
+            reduced[cells] = value
+            continue
+        remaining = cells - known
+        remaining_value = value - len(cells & mines)
+        if remaining and 0 <= remaining_value <= len(remaining):
+            reduced[remaining] = remaining_value
+    return reduced
+
+
+def _reduce_subsets(system: dict, limit: int, deadline: float | None = None) -> bool:
+    # If A is a subset of B then the cells in B but not A hold exactly value(B) - value(A) mines.
+    # Adds every such derived constraint and returns whether anything new was added, adding nothing
+    # if the deadline passes first.
+    by_cell = {}
+    for cells in system:
+        for cell in cells:
+            by_cell.setdefault(cell, []).append(cells)
+
+    derived = {}
+    for small, small_value in system.items():
+        if _past(deadline):
+            return False
+        # Any superset of small must contain its least shared cell, so only look at those constraints
+        anchor = min(small, key=lambda cell: len(by_cell[cell]))
+        for big in by_cell[anchor]:
+            if len(big) <= len(small) or not small < big:
+                continue
+            difference = big - small
+            value = system[big] - small_value
+            if difference not in system and difference not in derived and 0 <= value <= len(difference):
+                derived[difference] = value
+
+    if not derived or len(system) >= limit:
+        return False
+    for cells, value in list(derived.items())[:limit - len(system)]:
+        system[cells] = value
+    return True
+
+
+def _eliminate(component: list[tuple[frozenset, int]]) -> tuple[set, set]:
+    # Gauss-Jordan elimination with integer rows, then reads forced cells off each reduced row using
+    # the fact that every cell is either 0 (safe) or 1 (mine)
+    pending = [({cell: 1 for cell in cells}, value) for cells, value in component]
+    reduced = []
+    while pending:
+        row, rhs = pending.pop()
+        if not row:
+            continue
+        pivot = next(iter(row))
+        pending = [_cancel(other, other_rhs, row, rhs, pivot) for other, other_rhs in pending]
+        reduced = [_cancel(other, other_rhs, row, rhs, pivot) for other, other_rhs in reduced]
+        reduced.append((row, rhs))
+
+    safe = set()
+    mines = set()
+    for row, rhs in reduced:
+        row_safe, row_mines = _bounded_row(row, rhs)
+        safe |= row_safe
+        mines |= row_mines
+    return safe, mines
+
+
+def _cancel(row: dict, rhs: int, pivot_row: dict, pivot_rhs: int, pivot) -> tuple[dict, int]:
+    # Returns row with pivot eliminated using pivot_row, scaled down to the smallest integer coefficients
+    a = row.get(pivot, 0)
+    if a == 0:
+        return row, rhs
+    p = pivot_row[pivot]
+    combined = {cell: coef * p for cell, coef in row.items()}
+    for cell, coef in pivot_row.items():
+        value = combined.get(cell, 0) - coef * a
+        if value:
+            combined[cell] = value
+        else:
+            combined.pop(cell, None)
+    combined_rhs = rhs * p - pivot_rhs * a
+
+    divisor = abs(combined_rhs)
+    for coef in combined.values():
+        divisor = gcd(divisor, coef)
+    if divisor > 1:
+        combined = {cell: coef // divisor for cell, coef in combined.items()}
+        combined_rhs //= divisor
+    return combined, combined_rhs
+
+
+def _bounded_row(row: dict, rhs: int) -> tuple[set, set]:
+    # For each cell, checks whether the row can still be satisfied with that cell safe and with it a mine
+    highest = sum(coef for coef in row.values() if coef > 0)
+    lowest = sum(coef for coef in row.values() if coef < 0)
+    safe = set()
+    mines = set()
+    for cell, coef in row.items():
+        # Range the rest of the row can reach without this cell
+        rest_low = lowest - min(coef, 0)
+        rest_high = highest - max(coef, 0)
+        can_be_safe = rest_low <= rhs <= rest_high
+        can_be_mine = rest_low <= rhs - coef <= rest_high
+        if can_be_safe and not can_be_mine:
+            safe.add(cell)
+        elif can_be_mine and not can_be_safe:
+            mines.add(cell)
+    return safe, mines
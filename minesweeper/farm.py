@@ -0,0 +1,211 @@
+# minesweeper/farm.py
+# Multiprocess self-play benchmark farm: plays seeded AISolver games for every combination of board
+# preset, mine count and AI difficulty across a process pool, and aggregates the results
+# Inputs: Command line arguments (presets, mine densities, AI difficulties, games per configuration)
+# Outputs: Win rate, guesses per game and games/sec per configuration, printed and written as CSV/JSON
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import random
+import time
+
+import config
+from minesweeper.board import BoardGame
+from minesweeper.simulate import SimulationResult, run_simulation
+
+PRESETS = ['easy', 'normal', 'hard']
+AI_DIFFICULTIES = ['easy', 'medium', 'hard', 'expert']
+
+
+class FarmConfig:
+    """One combination of board geometry, mine count and AI difficulty to benchmark
+    """
+
+    def __init__(self, preset: str, rows: int, cols: int, mines: int, difficulty: str):
+        self.preset = preset
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.difficulty = difficulty
+
+    @property
+    def key(self) -> tuple:
+        return (self.preset, self.rows, self.cols, self.mines, self.difficulty)
+
+
+def preset_geometry(preset: str) -> tuple[int, int, int, int]:
+    """Reads a preset's board size and mine range through config.set_difficulty
+
+    Args:
+        preset (str): 'easy', 'normal' or 'hard'
+
+    Returns:
+        tuple[int, int, int, int]: rows, cols, minimum mines and maximum mines
+    """
+    previous = getattr(config, 'CURRENT_DIFFICULTY', 'normal')
+    config.set_difficulty(preset)
+    geometry = (config.GRID_ROWS, config.GRID_COLS, config.MIN_MINES, config.MAX_MINES)
+    config.set_difficulty(previous)
+    return geometry
+
+
+def build_configs(presets: list[str], difficulties: list[str], densities: list[float] | None) -> list[FarmConfig]:
+    """Lists every configuration to benchmark
+
+    Args:
+        presets (list[str]): Board presets from config.set_difficulty
+        difficulties (list[str]): AI difficulties
+        densities (list[float] | None): Mine densities (fraction of cells) to try on each preset, or None
+            to use each preset's minimum and maximum mine counts
+
+    Returns:
+        list[FarmConfig]: The configurations
+    """
+    configs = []
+    for preset in presets:
+        rows, cols, min_mines, max_mines = preset_geometry(preset)
+        if densities:
+            # Leave room for the block around the first click, which never holds a mine
+            mine_counts = sorted({min(max(1, round(density * rows * cols)), BoardGame.max_mines(rows, cols)) for density in densities})
+        else:
+            mine_counts = sorted({min_mines, max_mines})
+        for mines in mine_counts:
+            for difficulty in difficulties:
+                configs.append(FarmConfig(preset, rows, cols, mines, difficulty))
+    return configs
+
+
+def _play_chunk(task: tuple) -> tuple[tuple, dict]:
+    # Runs in a worker process: plays one seeded chunk of games with its own boards and solvers
+    key, games, seed, batch, board_backend = task
+    _, rows, cols, mines, difficulty = key
+    board_class = BoardGame
+    if board_backend == 'array':
+        from minesweeper.array_board import ArrayBoardGame
+        board_class = ArrayBoardGame
+    result = run_simulation(games, rows, cols, mines, difficulty, seed, board_class, batch)
+    return key, vars(result)
+
+
+def run_farm(configs: list[FarmConfig], games: int, chunk_size: int, workers: int | None, seed: int, batch: bool = False, board_backend: str = 'list', progress=None) -> dict[tuple, SimulationResult]:
+    """Plays games for every configuration across a process pool, merging results as chunks finish
+
+    Args:
+        configs (list[FarmConfig]): The configurations to benchmark
+        games (int): Games to play per configuration
+        chunk_size (int): Games per task sent to a worker
+        workers (int | None): Number of worker processes, or None for one per CPU
+        seed (int): Master seed; every chunk gets its own seed derived from it, so runs are repeatable
+        batch (bool, optional): Play certain moves in batches. Defaults to False.
+        board_backend (str, optional): 'list' or 'array'. Defaults to 'list'.
+        progress (Callable[[int, int], None] | None, optional): Called with (chunks done, total chunks). Defaults to None.
+
+    Returns:
+        dict[tuple, SimulationResult]: The merged results for each configuration key. elapsed is the
+        summed time spent in workers, so games_per_sec is per worker process.
+    """
+    tasks = []
+    for i, farm_config in enumerate(configs):
+        for j, start in enumerate(range(0, games, chunk_size)):
+            chunk_seed = random.Random(f"{seed}-{i}-{j}").randrange(2**63)
+            tasks.append((farm_config.key, min(chunk_size, games - start), chunk_seed, batch, board_backend))
+
+    results = {farm_config.key: SimulationResult() for farm_config in configs}
+    with multiprocessing.Pool(workers) as pool:
+        for done, (key, chunk) in enumerate(pool.imap_unordered(_play_chunk, tasks), start=1):
+            merged = results[key]
+            for field, value in chunk.items():
+                setattr(merged, field, getattr(merged, field) + value)
+            if progress is not None:
+                progress(done, len(tasks))
+    return results
+
+
+def summarize(configs: list[FarmConfig], results: dict[tuple, SimulationResult]) -> list[dict]:
+    """Turns the merged results into one row of statistics per configuration
+
+    Args:
+        configs (list[FarmConfig]): The configurations, in the order to report them
+        results (dict[tuple, SimulationResult]): The results from run_farm
+
+    Returns:
+        list[dict]: The rows, ready to write as CSV or JSON
+    """
+    rows = []
+    for farm_config in configs:
+        result = results[farm_config.key]
+        # 95% confidence interval half-width of the win rate (normal approximation)
+        margin = 1.96 * math.sqrt(result.win_rate * (1 - result.win_rate) / result.games) if result.games else 0.0
+        rows.append({
+            'preset': farm_config.preset,
+            'rows': farm_config.rows,
+            'cols': farm_config.cols,
+            'mines': farm_config.mines,
+            'ai_difficulty': farm_config.difficulty,
+            'games': result.games,
+            'wins': result.wins,
+            'losses': result.losses,
+            'stalls': result.stalls,
+            'win_rate': round(result.win_rate, 6),
+            'win_rate_ci95': round(margin, 6),
+            'moves_per_game': round(result.moves_per_game, 3),
+            'guesses_per_game': round(result.guesses_per_game, 3),
+            'games_per_sec': round(result.games_per_sec, 1),
+        })
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark AISolver win rates and engine throughput across a process pool.")
+    parser.add_argument('--games', type=int, default=10000, help="games per configuration")
+    parser.add_argument('--chunk-size', type=int, default=500, help="games per task sent to a worker")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--presets', nargs='+', choices=PRESETS, default=PRESETS, help="board presets to play")
+    parser.add_argument('--ai', nargs='+', choices=AI_DIFFICULTIES, default=AI_DIFFICULTIES, help="AI difficulties to play")
+    parser.add_argument('--densities', nargs='+', type=float, default=None, help="mine densities to play on each preset (default: the preset's min and max mine counts)")
+    parser.add_argument('--seed', type=int, default=0, help="master seed")
+    parser.add_argument('--batch', action='store_true', help="play every certain move the solver finds at once")
+    parser.add_argument('--backend', choices=['list', 'array'], default='list', help="board storage: Cell objects or NumPy arrays")
+    parser.add_argument('--csv', default=None, help="write the results to this CSV file")
+    parser.add_argument('--json', default=None, help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.games < 1 or args.chunk_size < 1:
+        parser.error("--games and --chunk-size must be positive")
+
+    configs = build_configs(args.presets, args.ai, args.densities)
+
+    def progress(done, total):
+        print(f"\r{done}/{total} chunks", end='', flush=True)
+
+    start = time.perf_counter()
+    results = run_farm(configs, args.games, args.chunk_size, args.workers, args.seed, args.batch, args.backend, progress)
+    wall = time.perf_counter() - start
+    print()
+
+    rows = summarize(configs, results)
+    total_games = sum(row['games'] for row in rows)
+    print(f"{'preset':<7} {'size':>6} {'mines':>5} {'ai':<7} {'games':>8} {'win rate':>16} {'guesses':>8} {'games/s':>9}")
+    for row in rows:
+        win_rate = f"{row['win_rate']:.2%} ±{row['win_rate_ci95']:.2%}"
+        print(f"{row['preset']:<7} {row['rows']:>3}x{row['cols']:<2} {row['mines']:>5} {row['ai_difficulty']:<7} {row['games']:>8} {win_rate:>16} {row['guesses_per_game']:>8.2f} {row['games_per_sec']:>9.1f}")
+    print(f"{total_games} games in {wall:.1f}s ({total_games / wall:.1f} games/sec overall)")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'seed': args.seed, 'games_per_config': args.games, 'batch': args.batch, 'backend': args.backend,
+                       'wall_seconds': round(wall, 3), 'results': rows}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
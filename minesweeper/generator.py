@@ -0,0 +1,336 @@
+# minesweeper/generator.py
+# No-guess board generation: hands out mine layouts that the deterministic deduction engine can
+# clear from the first click without ever guessing, and keeps a pool of them ready on a background
+# thread. If none is ready for the click and none can be found quickly, the first reveal gets a
+# random layout rather than waiting, and the board is marked as not no-guess.
+# Inputs: Board geometry (rows, cols, mines) and the first click
+# Outputs: Mine layouts, through BoardGame.layout_provider
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import random
+import threading
+import time
+
+from minesweeper.board import BoardGame
+from minesweeper.ai_solver import AISolver
+from minesweeper.deduction import find_forced
+from minesweeper.topology import get_topology
+
+# Each board is split into ZONES x ZONES first-click regions, and the pool keeps up to POOL_DEPTH
+# ready layouts for each one
+ZONES = 4
+POOL_DEPTH = 4
+
+# How many random layouts to try for one first click before giving up on a no-guess board
+MAX_ATTEMPTS = 200
+
+# How many ready layouts to re-check for a click outside all of their openings before generating one
+MAX_RECHECKS = 24
+
+# Seconds the first reveal may spend re-checking and generating layouts when the pool has none
+# ready for its click, before it gives up and deals a random layout instead
+SYNC_BUDGET = 0.05
+
+# Mirroring a layout top to bottom and/or left to right keeps it solvable from the mirrored click,
+# so each ready layout covers four openings. Bit 0 flips the rows, bit 1 the columns.
+FLIPS = (0, 1, 2, 3)
+
+
+class Layout:
+    """A mine layout that can be solved without guessing from any cell of its opening
+    """
+    __slots__ = ('mines', 'opening', 'used')
+
+    def __init__(self, mines: list, opening: frozenset):
+        self.mines = mines # row * cols + col of every mine
+        self.opening = opening # row * cols + col of the zero cells the first click flooded through
+        self.used = False # set once a board has been given this layout
+
+
+def solve_opening(rows: int, cols: int, mines: list, first_click: tuple, deadline: float | None = None) -> frozenset | None:
+    """Plays a layout out with deduction only, to check that it never needs a guess
+
+    Uses the expert solver's forced moves, and once those run out the global mine count (every
+    hidden cell is safe when all the mines are flagged, and the forced moves of the frontier
+    together with "exactly the remaining mines are among the hidden cells").
+
+    Args:
+        rows (int): Number of rows on the board
+        cols (int): Number of columns on the board
+        mines (list[int]): row * cols + col of every mine
+        first_click (tuple[int, int]): The (row, col) of the first reveal. It must have no adjacent mines.
+        deadline (float | None, optional): time.monotonic() after which to stop and return None, checked
+            between rounds of deduction. Defaults to None, for no limit.
+
+    Returns:
+        frozenset[int] | None: row * cols + col of the zero cells the first click revealed if the board
+        was cleared, or None if it needed a guess or the deadline passed
+    """
+    positions = [divmod(index, cols) for index in mines]
+    board = BoardGame(rows, cols, len(mines), seed=0)
+    board.layout_provider = lambda board, row, col: positions
+    board.phase = 'ai'
+    solver = AISolver(board, 'expert')
+
+    opened = board.reveal(*first_click)
+    opening = frozenset(r * cols + c for r, c in opened if board.board[r][c].adjacent_mines == 0)
+
+    while board.phase == 'ai':
+        if deadline is not None and time.monotonic() > deadline:
+            return None
+        moves = solver.find_forced_moves()
+        if moves and solver.play_moves(moves):
+            continue
+        moves = _count_moves(board, solver, deadline)
+        if not moves or not solver.play_moves(moves):
+            return None
+    return opening if board.phase == 'won' else None
+
+
+def _count_moves(board: BoardGame, solver: AISolver, deadline: float | None = None) -> list:
+    # The forced moves that also use how many mines are left, for when the frontier alone is stuck
+    hidden = frozenset((r, c) for r in range(board.rows) for c in range(board.cols)
+                       if not board.board[r][c].is_revealed and not board.board[r][c].is_flag)
+    mines_left = board.total_mines - board.used_flags
+    if mines_left == 0:
+        return [('reveal', cell) for cell in sorted(hidden)]
+    if mines_left == len(hidden):
+        return [('flag', cell) for cell in sorted(hidden)]
+    safe, mines = find_forced(solver._build_constraints() + [(hidden, mines_left)], deadline)
+    return [('reveal', cell) for cell in sorted(safe)] + [('flag', cell) for cell in sorted(mines)]
+
+
+def generate_layout(rows: int, cols: int, mines: int, first_click: tuple, rng: random.Random,
+                    max_attempts: int = MAX_ATTEMPTS, deadline: float | None = None) -> Layout | None:
+    """Generates a layout that can be solved without guessing from the given first click
+
+    The first click and its neighbors never hold a mine, just like handle_first_click's random
+    layouts, so the first reveal always floods open.
+
+    Args:
+        rows (int): Number of rows on the board
+        cols (int): Number of columns on the board
+        mines (int): Number of mines to place
+        first_click (tuple[int, int]): The (row, col) of the first reveal
+        rng (random.Random): Where the random layouts come from
+        max_attempts (int, optional): How many random layouts to try. Defaults to MAX_ATTEMPTS.
+        deadline (float | None, optional): time.monotonic() after which to give up. Defaults to None, for no limit.
+
+    Returns:
+        Layout | None: The layout, or None if none of the attempts could be solved without guessing
+        before the deadline
+    """
+    row, col = first_click
+    click = row * cols + col
+    excluded = {click, *get_topology('square', rows, cols).neighbors(click)}
+    eligible = [index for index in range(rows * cols) if index not in excluded]
+    if mines > len(eligible):
+        return None
+
+    for _ in range(max_attempts):
+        if deadline is not None and time.monotonic() > deadline:
+            return None
+        candidate = rng.sample(eligible, mines)
+        opening = solve_opening(rows, cols, candidate, first_click, deadline)
+        if opening is not None:
+            return Layout(candidate, opening)
+    return None
+
+
+class BoardPool:
+    """Keeps no-guess layouts ready on a background thread, for every first-click region of the
+       geometry being played. Pass take as a board's layout_provider.
+
+       A layout can be handed out for any click inside its opening (or a mirror image of it): a
+       zero cell of the opening floods open exactly the same cells as the click the layout was
+       checked from, so the rest of the game can be solved the same way. Each layout is filed under
+       every region its openings reach, which is what lets a small pool cover the whole board.
+    """
+
+    def __init__(self, seed: int | None = None):
+        """
+        Args:
+            seed (int | None, optional): Seed for the generated layouts. Defaults to None.
+        """
+        self._rng = random.Random(seed)
+        self._condition = threading.Condition()
+        self._pools = {} # (rows, cols, mines) -> one list of layouts per region
+        self._geometry = None # the geometry the worker is filling
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def prefetch(self, rows: int, cols: int, mines: int):
+        """Starts filling the pool for a geometry, e.g. as soon as a game is set up
+
+        Args:
+            rows (int): Number of rows on the board
+            cols (int): Number of columns on the board
+            mines (int): Number of mines on the board
+        """
+        with self._condition:
+            self._geometry = (rows, cols, mines)
+            self._pools.setdefault(self._geometry, [[] for _ in range(ZONES * ZONES)])
+            self._condition.notify()
+
+    def take(self, board: BoardGame, row: int, col: int) -> list | None:
+        """Picks the mine layout for a board's first click. Matches BoardGame.layout_provider.
+
+        Uses a ready layout whose opening contains the click if there is one, then a ready layout
+        that re-checks as solvable from the click, and otherwise generates one for the click straight
+        away with the board's RNG. The re-checking and generating stop after SYNC_BUDGET seconds, so
+        the first reveal never stalls for long. Sets board.no_guess to whether a no-guess layout was found.
+
+        Args:
+            board (BoardGame): The board being set up
+            row (int): The row of the first click
+            col (int): The column of the first click
+
+        Returns:
+            list[tuple[int, int]] | None: The (row, col) of every mine, or None to fall back to a
+            random layout if no no-guess layout could be found in time
+        """
+        deadline = time.monotonic() + SYNC_BUDGET
+        rows, cols = board.rows, board.cols
+        geometry = (rows, cols, board.total_mines)
+        with self._condition:
+            # Refill for this geometry whatever happens, since the next game is likely to be the same
+            if self._geometry != geometry:
+                self._geometry = geometry
+            zones = self._pools.setdefault(geometry, [[] for _ in range(ZONES * ZONES)])
+            candidates = list(zones[_zone(rows, cols, row, col)])
+            found = next(((layout, flip) for layout in candidates for flip in FLIPS
+                          if _flip(rows, cols, row * cols + col, flip) in layout.opening), None)
+            if found is not None:
+                self._claim(zones, found[0])
+            self._condition.notify()
+
+        if found is None:
+            found = self._recheck(zones, candidates, rows, cols, row, col, deadline)
+        if found is None:
+            layout = generate_layout(rows, cols, board.total_mines, (row, col), board.rng, deadline=deadline)
+            if layout is None:
+                board.no_guess = False
+                return None
+            found = (layout, 0)
+
+        board.no_guess = True
+        layout, flip = found
+        return [divmod(_flip(rows, cols, mine, flip), cols) for mine in layout.mines]
+
+    def ready(self, rows: int, cols: int, mines: int) -> int:
+        """How many distinct layouts are ready for a geometry"""
+        with self._condition:
+            zones = self._pools.get((rows, cols, mines), [])
+            return len({id(layout) for zone in zones for layout in zone})
+
+    def close(self):
+        """Stops the background worker"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _claim(self, zones: list, layout: Layout):
+        # Marks a layout as handed out and drops it from every region it was filed under.
+        # Must be called with the condition held.
+        layout.used = True
+        for i, zone in enumerate(zones):
+            zones[i] = [layout for layout in zone if not layout.used]
+
+    def _recheck(self, zones: list, candidates: list, rows: int, cols: int, row: int, col: int, deadline: float) -> tuple | None:
+        # Looks for a ready layout (or mirror image of one) that happens to be solvable from a click
+        # outside its openings. Checking one is far cheaper than generating one, which usually takes
+        # many attempts.
+        checked = 0
+        for layout in candidates:
+            for flip in FLIPS:
+                if checked >= MAX_RECHECKS or time.monotonic() > deadline:
+                    return None
+                mines = [_flip(rows, cols, mine, flip) for mine in layout.mines]
+                mine_set = set(mines)
+                # The click has to be a zero cell, like every first click
+                click = row * cols + col
+                if click in mine_set or any(n in mine_set for n in get_topology('square', rows, cols).neighbors(click)):
+                    continue
+                checked += 1
+                if solve_opening(rows, cols, mines, (row, col), deadline) is None:
+                    continue
+                with self._condition:
+                    if layout.used:
+                        continue
+                    self._claim(zones, layout)
+                    self._condition.notify()
+                return layout, flip
+        return None
+
+    def _next_job(self) -> tuple | None:
+        # The geometry and region to generate for next, or None if every region is full
+        if self._geometry is None:
+            return None
+        rows, cols, _ = self._geometry
+        zones = self._pools[self._geometry]
+        # Boards smaller than ZONES in a direction leave some regions without any cells
+        counts = {i: len(zone) for i, zone in enumerate(zones) if _zone_bounds(rows, cols, i) is not None}
+        emptiest = min(counts, key=counts.__getitem__)
+        if counts[emptiest] >= POOL_DEPTH:
+            return None
+        return self._geometry, emptiest
+
+    def _run(self):
+        # Runs on the worker thread
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None and not self._closed:
+                    self._condition.wait()
+                    job = self._next_job()
+                if self._closed:
+                    return
+                seed = self._rng.randrange(2**63)
+
+            (rows, cols, mines), zone = job
+            rng = random.Random(seed)
+            row_start, row_end, col_start, col_end = _zone_bounds(rows, cols, zone)
+            click = rng.randrange(row_start, row_end), rng.randrange(col_start, col_end)
+            layout = generate_layout(rows, cols, mines, click, rng)
+
+            with self._condition:
+                zones = self._pools[(rows, cols, mines)]
+                if layout is None:
+                    # This density may simply be too high for no-guess boards; stop filling it
+                    # until a board asks for it again
+                    if self._geometry == (rows, cols, mines):
+                        self._geometry = None
+                    continue
+                reached = {_zone(rows, cols, *divmod(_flip(rows, cols, index, flip), cols))
+                           for index in layout.opening for flip in FLIPS}
+                for zone in reached:
+                    zones[zone].append(layout)
+
+
+def _flip(rows: int, cols: int, index: int, flip: int) -> int:
+    # Mirrors a row * cols + col cell index; every flip is its own inverse
+    row, col = divmod(index, cols)
+    if flip & 1:
+        row = rows - 1 - row
+    if flip & 2:
+        col = cols - 1 - col
+    return row * cols + col
+
+
+def _zone(rows: int, cols: int, row: int, col: int) -> int:
+    # The first-click region a cell is in
+    return min(row * ZONES // rows, ZONES - 1) * ZONES + min(col * ZONES // cols, ZONES - 1)
+
+
+def _zone_bounds(rows: int, cols: int, zone: int) -> tuple[int, int, int, int] | None:
+    # The rows and columns a first-click region covers, as (row_start, row_end, col_start, col_end)
+    # ranges matching _zone, or None if the region has no cells
+    zone_row, zone_col = divmod(zone, ZONES)
+    row_start, row_end = -(-zone_row * rows // ZONES), -(-(zone_row + 1) * rows // ZONES)
+    col_start, col_end = -(-zone_col * cols // ZONES), -(-(zone_col + 1) * cols // ZONES)
+    if row_start >= row_end or col_start >= col_end:
+        return None
+    return row_start, row_end, col_start, col_end
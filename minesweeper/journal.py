@@ -0,0 +1,167 @@
+# minesweeper/journal.py
+# Change journal for BoardGame: every mutation of a board is recorded as a typed event, and each
+# consumer (renderer, solver, statistics, replay writer) drains the events it hasn't seen yet
+# instead of scanning the whole grid for what changed
+# Inputs: Events recorded by BoardGame
+# Outputs: The events each subscriber hasn't drained yet
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import weakref
+
+
+class BoardEvent:
+    """Base class of the events a board records
+    """
+    __slots__ = ()
+
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._fields()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(repr(value) for value in self._fields())})"
+
+
+class CellRevealed(BoardEvent):
+    """A covered cell was uncovered"""
+    __slots__ = ('row', 'col')
+
+    def __init__(self, row: int, col: int):
+        self.row = row
+        self.col = col
+
+
+class FlagPlaced(BoardEvent):
+    """A flag was put on a covered cell"""
+    __slots__ = ('row', 'col')
+
+    def __init__(self, row: int, col: int):
+        self.row = row
+        self.col = col
+
+
+class FlagRemoved(BoardEvent):
+    """A flag was taken off a covered cell"""
+    __slots__ = ('row', 'col')
+
+    def __init__(self, row: int, col: int):
+        self.row = row
+        self.col = col
+
+
+class PhaseChanged(BoardEvent):
+    """The board's phase changed, e.g. from 'playing' to 'won'"""
+    __slots__ = ('old', 'new')
+
+    def __init__(self, old: str, new: str):
+        self.old = old
+        self.new = new
+
+
+class MovePlayed(BoardEvent):
+    """A reveal or flag move was made on the board, recorded before its effects so a replay can play it again"""
+    __slots__ = ('action', 'row', 'col', 'time')
+
+    def __init__(self, action: str, row: int, col: int, time: float):
+        self.action = action # 'reveal' or 'flag' (a flag move toggles the flag)
+        self.row = row
+        self.col = col
+        self.time = time # time.monotonic() when the move was made
+
+
+class MinesLaid(BoardEvent):
+    """The mines were placed, which happens on the first reveal"""
+    __slots__ = ('positions', 'seeded')
+
+    def __init__(self, positions: tuple, seeded: bool = True):
+        self.positions = positions # (row, col) of every mine
+        self.seeded = seeded # whether the layout came from the board's seed, rather than a layout provider
+
+
+class Subscription:
+    """One consumer's position in a journal. The journal only holds subscriptions weakly, so a
+       subscription stops holding back the journal as soon as its owner is gone.
+    """
+
+    def __init__(self, journal: 'Journal'):
+        self._journal = journal
+        self.cursor = journal._base + len(journal._events) # absolute index of the next event to drain
+
+    def drain(self) -> list[BoardEvent]:
+        """Takes every event recorded since the last drain (or since subscribing)
+
+        Returns:
+            list[BoardEvent]: The events, oldest first
+        """
+        return self._journal._drain(self)
+
+    def close(self):
+        """Stops receiving events"""
+        self._journal._subscriptions.discard(self)
+
+
+class Journal:
+    """Append-only log of a board's events. Nothing is recorded while there are no subscribers, and
+       events are dropped once every subscriber has drained them.
+    """
+
+    def __init__(self):
+        self._events = []
+        self._base = 0 # absolute index of _events[0]
+        self._subscriptions = weakref.WeakSet()
+
+    def __deepcopy__(self, memo) -> 'Journal':
+        # A board snapshot starts with its own empty journal; the original's subscribers stay with the original
+        return Journal()
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone is subscribed, so callers can skip building events nobody will read"""
+        return bool(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        """Starts receiving the events recorded from now on
+
+        Returns:
+            Subscription: The new subscriber's position in the journal. Keep a reference to it for as
+            long as events are wanted.
+        """
+        subscription = Subscription(self)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def record(self, event: BoardEvent):
+        """Appends an event for every subscriber to drain
+
+        Args:
+            event (BoardEvent): The event
+        """
+        if self._subscriptions:
+            self._events.append(event)
+
+    def extend(self, events):
+        """Appends several events at once
+
+        Args:
+            events (Iterable[BoardEvent]): The events
+        """
+        if self._subscriptions:
+            self._events.extend(events)
+
+    def _drain(self, subscription: Subscription) -> list[BoardEvent]:
+        start = max(0, subscription.cursor - self._base)
+        events = self._events[start:]
+        subscription.cursor = self._base + len(self._events)
+
+        # Drop the events every subscriber has now seen
+        consumed = min(s.cursor for s in self._subscriptions) - self._base if self._subscriptions else len(self._events)
+        if consumed > 0:
+            del self._events[:consumed]
+            self._base += consumed
+        return events
@@ -0,0 +1,259 @@
+# minesweeper/probability.py
+# Exact mine-probability engine used by the expert AI when nothing is logically forced.
+# The frontier is split into independent components, each component's valid mine assignments are
+# enumerated with pruning, and the results are combined with the global mine count.
+# Inputs: Frontier constraints, the number of hidden cells off the frontier and the number of mines left
+# Outputs: The probability that each hidden cell is a mine
+# Author: Jakob Huffman
+# Creation Date: 10/15/2025
+
+from math import exp, lgamma
+
+from minesweeper.deduction import split_components
+
+# Components with more cells than this, or whose enumeration visits more search nodes than this,
+# are not solved exactly, and their cells are treated like the cells off the frontier instead
+MAX_COMPONENT_CELLS = 200
+MAX_SEARCH_NODES = 200_000
+
+# How many search nodes to visit between checks of the cancel event
+CANCEL_CHECK_INTERVAL = 1024
+
+
+class SearchCancelled(Exception):
+    """Raised when a probability search is abandoned through its cancel event
+    """
+
+
+class ComponentSolution:
+    """The valid mine assignments of one frontier component, grouped by how many mines they use
+    """
+
+    def __init__(self, cells: list, ways: dict, cell_ways: dict):
+        self.cells = cells # the component's cells, in the order cell_ways lists them
+        self.ways = ways # mine count -> number of valid assignments with that many mines
+        self.cell_ways = cell_ways # mine count -> for each cell, how many of those assignments make it a mine
+
+
+class ProbabilityEngine:
+    """Computes mine probabilities, caching each component's solution so only components a move
+       touched are enumerated again
+    """
+
+    def __init__(self):
+        self._cache = {}
+
+    def copy(self) -> 'ProbabilityEngine':
+        """A new engine starting from this one's cached solutions, for a search on another thread"""
+        engine = ProbabilityEngine()
+        engine._cache = dict(self._cache)
+        return engine
+
+    def probabilities(self, constraints: list[tuple[frozenset, int]], outside_cells: int, mines_left: int, cancel_event=None) -> tuple[dict, float] | None:
+        """Works out the probability of a mine in every hidden, unflagged cell
+
+        Args:
+            constraints (list[tuple[frozenset, int]]): (cells, number of mines among those cells) pairs from the frontier
+            outside_cells (int): Number of hidden, unflagged cells that aren't in any constraint
+            mines_left (int): Number of mines not yet flagged or known
+            cancel_event (threading.Event | None, optional): Stops the search early when set. Defaults to None.
+
+        Raises:
+            SearchCancelled: If cancel_event was set during the search
+
+        Returns:
+            tuple[dict, float] | None: The probability for each constrained cell and the probability for
+            any one outside cell, or None if the constraints can't all be satisfied
+        """
+        solutions = []
+        live_keys = set()
+        for component in split_components(constraints):
+            key = frozenset(component)
+            live_keys.add(key)
+            if key not in self._cache:
+                self._cache[key] = _solve_component(component, cancel_event)
+            solution = self._cache[key]
+            if solution is None:
+                # Too large to enumerate, so fall back to treating its cells like outside cells
+                outside_cells += len({cell for cells, _ in component for cell in cells})
+            else:
+                solutions.append(solution)
+
+        # Components that no longer exist can't come back unchanged, so drop them to keep the cache bounded
+        for key in list(self._cache):
+            if key not in live_keys:
+                del self._cache[key]
+
+        return _combine(solutions, outside_cells, mines_left)
+
+
+def _solve_component(component: list[tuple[frozenset, int]], cancel_event=None) -> ComponentSolution | None:
+    # Enumerates every 0/1 assignment of the component's cells that satisfies all its constraints
+    cells = _order_cells(component)
+    if len(cells) > MAX_COMPONENT_CELLS:
+        return None
+    index = {cell: i for i, cell in enumerate(cells)}
+    constraints_of = [[] for _ in cells]
+    remaining = []
+    unassigned = []
+    for c, (constraint_cells, value) in enumerate(component):
+        remaining.append(value)
+        unassigned.append(len(constraint_cells))
+        for cell in constraint_cells:
+            constraints_of[index[cell]].append(c)
+
+    ways = {}
+    cell_ways = {}
+    assignment = [0] * len(cells)
+    nodes = 0
+
+    def search(i, mines):
+        nonlocal nodes
+        nodes += 1
+        if nodes > MAX_SEARCH_NODES:
+            raise _SearchTooLarge()
+        if cancel_event is not None and nodes % CANCEL_CHECK_INTERVAL == 0 and cancel_event.is_set():
+            raise SearchCancelled()
+        if i == len(cells):
+            ways[mines] = ways.get(mines, 0) + 1
+            counts = cell_ways.setdefault(mines, [0] * len(cells))
+            for j, value in enumerate(assignment):
+                counts[j] += value
+            return
+        for value in (0, 1):
+            # Try this cell as safe then as a mine, pruning as soon as any of its constraints can't be met
+            feasible = True
+            for c in constraints_of[i]:
+                remaining[c] -= value
+                unassigned[c] -= 1
+                if remaining[c] < 0 or remaining[c] > unassigned[c]:
+                    feasible = False
+            if feasible:
+                assignment[i] = value
+                search(i + 1, mines + value)
+            for c in constraints_of[i]:
+                remaining[c] += value
+                unassigned[c] += 1
+        assignment[i] = 0
+
+    try:
+        search(0, 0)
+    except _SearchTooLarge:
+        return None
+    return ComponentSolution(cells, ways, cell_ways)
+
+
+class _SearchTooLarge(Exception):
+    pass
+
+
+def _order_cells(component: list[tuple[frozenset, int]]) -> list:
+    # Orders cells so each constraint's cells are assigned close together, which lets pruning kick in early
+    ordered = []
+    seen = set()
+    for cells, _ in sorted(component, key=lambda constraint: min(constraint[0])):
+        for cell in sorted(cells):
+            if cell not in seen:
+                seen.add(cell)
+                ordered.append(cell)
+    return ordered
+
+
+def _log_comb(n: int, k: int) -> float:
+    # Natural log of n choose k, or None when it is zero
+    if k < 0 or k > n:
+        return None
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def _multiply(a: list, b: list, limit: int) -> list:
+    # Multiplies two polynomials in the mine count, dropping terms above limit and rescaling so the
+    # coefficients stay within float range (only ratios between them are ever used)
+    product = [0.0] * min(len(a) + len(b) - 1, limit + 1)
+    for i, x in enumerate(a):
+        if x == 0:
+            continue
+        for j, y in enumerate(b[:len(product) - i]):
+            product[i + j] += x * y
+    largest = max(product, default=0.0)
+    if largest > 0:
+        product = [value / largest for value in product]
+    return product
+
+
+def _combine(solutions: list, outside_cells: int, mines_left: int) -> tuple[dict, float] | None:
+    # Weighs each combination of component mine counts by the number of ways to place the
+    # remaining mines among the outside cells
+    if mines_left < 0:
+        return None
+
+    polys = []
+    for solution in solutions:
+        if not solution.ways: # no assignment satisfies this component
+            return None
+        poly = [0.0] * (max(solution.ways) + 1)
+        for mines, count in solution.ways.items():
+            poly[mines] = float(count)
+        polys.append(poly)
+
+    # prefix[i] is the product of polys[:i] and suffix[i] the product of polys[i:], so the product of
+    # every component except i is prefix[i] * suffix[i + 1]
+    prefix = [[1.0]]
+    for poly in polys:
+        prefix.append(_multiply(prefix[-1], poly, mines_left))
+    suffix = [[1.0]]
+    for poly in reversed(polys):
+        suffix.append(_multiply(suffix[-1], poly, mines_left))
+    suffix.reverse()
+
+    def outside_weights(poly):
+        # For each term of poly, its weight times the ways to put the rest of the mines outside
+        weights = []
+        log_weights = [_log_comb(outside_cells, mines_left - s) for s in range(len(poly))]
+        valid = [w for w in log_weights if w is not None]
+        if not valid:
+            return [0.0] * len(poly)
+        top = max(valid)
+        for s, value in enumerate(poly):
+            weights.append(value * exp(log_weights[s] - top) if log_weights[s] is not None and value else 0.0)
+        return weights
+
+    # Outside cells: expected number of mines left over for them, divided among them
+    everything = prefix[-1]
+    weights = outside_weights(everything)
+    total = sum(weights)
+    if total == 0:
+        return None
+    outside_probability = 0.0
+    if outside_cells:
+        outside_probability = sum(w * (mines_left - s) for s, w in enumerate(weights)) / total / outside_cells
+
+    probabilities = {}
+    for i, solution in enumerate(solutions):
+        others = _multiply(prefix[i], suffix[i + 1], mines_left)
+        # Sum over this component's mine count m and the other components' mine count t of
+        # ways(m) * others[t] * C(outside_cells, mines_left - m - t)
+        terms = []
+        top = None
+        for m in solution.ways:
+            for t, value in enumerate(others):
+                if value == 0:
+                    continue
+                log_c = _log_comb(outside_cells, mines_left - m - t)
+                if log_c is None:
+                    continue
+                terms.append((m, value, log_c))
+                top = log_c if top is None else max(top, log_c)
+        total_i = 0.0
+        mine_weight = [0.0] * len(solution.cells)
+        for m, value, log_c in terms:
+            factor = value * exp(log_c - top)
+            total_i += solution.ways[m] * factor
+            for j, cell_count in enumerate(solution.cell_ways[m]):
+                mine_weight[j] += cell_count * factor
+        if total_i == 0:
+            return None
+        for j, cell in enumerate(solution.cells):
+            probabilities[cell] = mine_weight[j] / total_i
+
+    return probabilities, outside_probability
@@ -0,0 +1,265 @@
+# minesweeper/replay.py
+# Deterministic replay recording and playback. A replay is a small append-only text log: a header
+# with the board's geometry, mine count and seed, then one line per move with its time, and a last
+# line with the result. Because a board's layout comes from its seed and first click, playing the
+# moves back on a board with the same seed recreates every position of the game exactly. A layout
+# that didn't come from the seed (e.g. a no-guess board) is written out as a line of its own.
+# Inputs: The MovePlayed events in a board's journal, or a replay file
+# Outputs: A replay file, or the board recreated from one
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import argparse
+import json
+import queue
+import threading
+import time
+
+from minesweeper.board import BoardGame
+from minesweeper.journal import MinesLaid, MovePlayed, PhaseChanged
+
+MAGIC = 'MSWPREPLAY'
+VERSION = 1
+
+# Move codes used in the log
+_CODES = {'reveal': 'r', 'flag': 'f'}
+_ACTIONS = {code: action for action, code in _CODES.items()}
+
+
+class ReplayWriter:
+    """Appends lines to a file on a background thread, so writing a replay never blocks the frame loop
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lines = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, line: str):
+        """Queues a line to be appended to the file"""
+        self._lines.put(line)
+
+    def close(self):
+        """Writes out every queued line and closes the file"""
+        self._lines.put(None)
+        self._thread.join()
+
+    def _run(self):
+        with open(self.path, 'a', encoding='utf-8') as file:
+            while True:
+                line = self._lines.get()
+                if line is None:
+                    break
+                file.write(line + '\n')
+                # Flush whenever the queue runs dry, so a crash loses at most the moves still queued
+                if self._lines.empty():
+                    file.flush()
+
+
+class ReplayRecorder:
+    """Records a board's moves to a replay file by draining MovePlayed events from its journal
+    """
+
+    def __init__(self, board: BoardGame, path: str, ai_difficulty: str | None = None):
+        """Starts recording a board. It must not have had its first move yet.
+
+        Args:
+            board (BoardGame): The board to record
+            path (str): The file to write the replay to
+            ai_difficulty (str | None, optional): The AI playing the game, for reference. Defaults to None.
+        """
+        self.board = board
+        self._changes = board.journal.subscribe()
+        self._start = time.monotonic()
+        self._last_ms = 0 # time of the latest move recorded, in milliseconds since recording started
+        self._finished = False
+        self._writer = ReplayWriter(path)
+        header = {'rows': board.rows, 'cols': board.cols, 'mines': board.total_mines, 'seed': board.seed,
+                  'phase': board.phase, 'ai': ai_difficulty, 'topology': board.topology_kind}
+        self._writer.write(f"{MAGIC} {VERSION} {json.dumps(header)}")
+
+    def poll(self):
+        """Queues every move made since the last poll for writing. Call it once per frame or turn."""
+        for event in self._changes.drain():
+            if type(event) is MovePlayed:
+                ms = self._last_ms = round((event.time - self._start) * 1000)
+                self._writer.write(f"{ms} {_CODES[event.action]} {event.row} {event.col}")
+            elif type(event) is MinesLaid and not event.seeded:
+                # The seed can't recreate this layout, so record the mines themselves as flat indices,
+                # timed with the first reveal that laid them
+                cols = self.board.cols
+                self._writer.write(f"{self._last_ms} mines {','.join(str(r * cols + c) for r, c in event.positions)}")
+            elif type(event) is PhaseChanged and event.new in ('won', 'lost') and not self._finished:
+                self._finished = True
+                ms = round((time.monotonic() - self._start) * 1000)
+                self._writer.write(f"{ms} end {event.new}")
+
+    def close(self):
+        """Writes out the remaining moves and closes the file"""
+        self.poll()
+        self._changes.close()
+        self._writer.close()
+
+
+class Replay:
+    """A recorded game: the board it was played on and its moves
+    """
+
+    def __init__(self, header: dict, moves: list, result: str | None, mines: list | None = None):
+        self.header = header
+        self.moves = moves # (milliseconds since recording started, action, (row, col))
+        self.result = result # 'won' or 'lost', or None if the recording stopped before the game ended
+        self.mines = mines # (row, col) of every mine if the layout didn't come from the seed, otherwise None
+
+    def new_board(self, board_class: type = BoardGame) -> BoardGame:
+        """Creates the board the game was recorded on, before any moves
+
+        Args:
+            board_class (type, optional): The BoardGame implementation to use. Defaults to BoardGame.
+
+        Returns:
+            BoardGame: A fresh board with the recorded geometry, mine count, seed and starting phase
+        """
+        board = board_class(self.header['rows'], self.header['cols'], self.header['mines'], self.header['seed'],
+                            topology=self.header.get('topology', 'square'))
+        board.phase = self.header['phase']
+        if self.mines is not None:
+            mines = list(self.mines)
+            board.layout_provider = lambda board, row, col: mines
+        return board
+
+
+def apply_replay_move(board: BoardGame, move: tuple):
+    """Plays one recorded move on a board
+
+    Args:
+        board (BoardGame): The board being played back
+        move (tuple): A move from Replay.moves
+    """
+    _, action, (row, col) = move
+    if action == 'flag':
+        board.toggle_flag(row, col)
+    else:
+        board.reveal(row, col)
+
+
+def load_replay(path: str) -> Replay:
+    """Reads a replay file
+
+    Args:
+        path (str): The file written by ReplayRecorder
+
+    Raises:
+        ValueError: If the file isn't a replay or is from an unknown version
+
+    Returns:
+        Replay: The recorded game
+    """
+    with open(path, encoding='utf-8') as file:
+        first = file.readline()
+        magic, version, header = (first.split(' ', 2) + ['', ''])[:3]
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay")
+        if int(version) != VERSION:
+            raise ValueError(f"Unsupported replay version {version}, expected {VERSION}")
+        moves = []
+        result = None
+        mines = None
+        cols = json.loads(header)['cols']
+        for line in file:
+            parts = line.split()
+            if len(parts) == 3 and parts[1] == 'end':
+                result = parts[2]
+            elif len(parts) in (2, 3) and parts[1] == 'mines' and line.endswith('\n'):
+                mines = [divmod(int(index), cols) for index in parts[2].split(',')] if len(parts) == 3 else []
+            elif len(parts) == 4:
+                moves.append((int(parts[0]), _ACTIONS[parts[1]], (int(parts[2]), int(parts[3]))))
+            # Anything else is a line cut short by a crash, which can only be the last one
+    return Replay(json.loads(header), moves, result, mines)
+
+
+def play_back(replay: Replay, board_class: type = BoardGame, moves: int | None = None) -> BoardGame:
+    """Recreates a recorded position at full engine speed, without a display
+
+    Args:
+        replay (Replay): The recorded game
+        board_class (type, optional): The BoardGame implementation to use. Defaults to BoardGame.
+        moves (int | None, optional): How many moves to play, or None for all of them. Defaults to None.
+
+    Returns:
+        BoardGame: The board after those moves
+    """
+    board = replay.new_board(board_class)
+    for move in replay.moves[:moves]:
+        apply_replay_move(board, move)
+    return board
+
+
+class ReplayPlayer:
+    """Plays a replay back in real time, handing out each move once its recorded time has come
+    """
+
+    def __init__(self, replay: Replay, speed: float = 1.0):
+        self.replay = replay
+        self.speed = speed
+        self._next = 0
+        self._start = time.monotonic()
+
+    @property
+    def finished(self) -> bool:
+        return self._next >= len(self.replay.moves)
+
+    def due_moves(self) -> list:
+        """Takes the moves whose time has come
+
+        Returns:
+            list[tuple]: The moves to play now, in order
+        """
+        elapsed_ms = (time.monotonic() - self._start) * 1000 * self.speed
+        due = []
+        while not self.finished and self.replay.moves[self._next][0] <= elapsed_ms:
+            due.append(self.replay.moves[self._next])
+            self._next += 1
+        return due
+
+    def ms_until_next(self) -> int | None:
+        """Milliseconds of real time until the next move is due, or None if there are no moves left"""
+        if self.finished:
+            return None
+        elapsed_ms = (time.monotonic() - self._start) * 1000 * self.speed
+        return max(0, round((self.replay.moves[self._next][0] - elapsed_ms) / self.speed))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Play a replay back headlessly and report the position it reaches.")
+    parser.add_argument('replay', help="replay file to play back")
+    parser.add_argument('--moves', type=int, default=None, help="stop after this many moves")
+    parser.add_argument('--backend', choices=['list', 'array'], default='list', help="board storage: Cell objects or NumPy arrays")
+    parser.add_argument('--save-board', default=None, help="save the final position with minesweeper.serialize")
+    args = parser.parse_args(argv)
+
+    board_class = BoardGame
+    if args.backend == 'array':
+        from minesweeper.array_board import ArrayBoardGame
+        board_class = ArrayBoardGame
+
+    replay = load_replay(args.replay)
+    start = time.perf_counter()
+    board = play_back(replay, board_class, args.moves)
+    elapsed = time.perf_counter() - start
+
+    played = len(replay.moves[:args.moves])
+    print(f"Board:    {board.rows}x{board.cols}, {board.total_mines} mines, seed {board.seed}")
+    print(f"Moves:    {played} of {len(replay.moves)} in {elapsed * 1000:.1f} ms")
+    print(f"Phase:    {board.phase}")
+    if args.moves is None and replay.result is not None:
+        # Playing back the whole game has to end the same way, or the engine's behavior has changed
+        print(f"Recorded: {replay.result} ({'matches' if board.phase == replay.result else 'MISMATCH'})")
+    if args.save_board:
+        from minesweeper.serialize import save
+        save(board, args.save_board)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+# minesweeper/serialize.py
+# Compact, versioned binary save format for boards: a fixed header with the geometry, mine count,
+# flags used, phase and seed, followed by three bit-packed planes (mines, revealed, flags) with one
+# bit per cell, so a 1000x1000 board takes 375 KB
+# Inputs: A BoardGame or ArrayBoardGame to save, or the bytes of a saved board
+# Outputs: The saved bytes, or a board restored from them
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import struct
+
+from minesweeper.board import BoardGame
+from minesweeper.array_board import ArrayBoardGame, neighbor_mine_counts, np
+
+MAGIC = b'MSWP'
+VERSION = 1
+
+# magic, version, phase, first-click flag, cell size, rows, cols, total mines, used flags, seed
+HEADER = struct.Struct('<4sBBBxHxxIIIIQ')
+
+PHASES = ['ready', 'playing', 'ai', 'won', 'lost']
+
+# bytes.translate tables between one byte per cell (0 or 1) and the ASCII digits int() parses
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def dumps(board: BoardGame) -> bytes:
+    """Saves a board to bytes
+
+    Args:
+        board (BoardGame): The board to save. ArrayBoardGame boards are packed straight from their arrays.
+
+    Raises:
+        ValueError: If the board isn't square; the format has no room for other topologies
+
+    Returns:
+        bytes: The saved board
+    """
+    if board.topology_kind != 'square':
+        raise ValueError(f"Only square boards can be saved, not {board.topology_kind!r}")
+    header = HEADER.pack(MAGIC, VERSION, PHASES.index(board.phase), board.is_first_click, board.cell_size,
+                         board.rows, board.cols, board.total_mines, board.used_flags, board.seed)
+    if isinstance(board, ArrayBoardGame):
+        planes = [np.packbits(plane, axis=None).tobytes() for plane in (board.mines, board.revealed, board.flags)]
+    else:
+        planes = _pack_cells(board)
+    return b''.join([header] + planes)
+
+
+def loads(data: bytes, board_class: type = BoardGame) -> BoardGame:
+    """Restores a board saved with dumps
+
+    Args:
+        data (bytes): The saved board. Any buffer works (bytes, bytearray, memoryview, mmap), and the
+            planes are read from it in place rather than copied out first.
+        board_class (type, optional): BoardGame or ArrayBoardGame. Defaults to BoardGame.
+
+    Raises:
+        ValueError: If the data isn't a saved board, is from an unknown version, or is truncated
+
+    Returns:
+        BoardGame: The restored board, ready to keep playing
+    """
+    view = memoryview(data).cast('B')
+    if len(view) < HEADER.size:
+        raise ValueError("Not a saved board: too short for the header")
+    magic, version, phase, first_click, cell_size, rows, cols, mines, used_flags, seed = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Not a saved board: bad magic number")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save version {version}, expected {VERSION}")
+
+    cells = rows * cols
+    plane_size = (cells + 7) // 8
+    if len(view) < HEADER.size + 3 * plane_size:
+        raise ValueError("Saved board is truncated")
+    planes = [view[HEADER.size + i * plane_size:HEADER.size + (i + 1) * plane_size] for i in range(3)]
+
+    board = board_class(rows, cols, mines, seed)
+    board.cell_size = cell_size
+    board.used_flags = used_flags
+    board.is_first_click = bool(first_click)
+    if issubclass(board_class, ArrayBoardGame):
+        _unpack_arrays(board, planes)
+    else:
+        _unpack_cells(board, planes)
+    board.phase = PHASES[phase]
+    return board
+
+
+def save(board: BoardGame, path: str):
+    """Saves a board to a file
+
+    Args:
+        board (BoardGame): The board to save
+        path (str): The file to write
+    """
+    with open(path, 'wb') as file:
+        file.write(dumps(board))
+
+
+def load(path: str, board_class: type = BoardGame) -> BoardGame:
+    """Restores a board from a file written by save
+
+    Args:
+        path (str): The file to read
+        board_class (type, optional): BoardGame or ArrayBoardGame. Defaults to BoardGame.
+
+    Returns:
+        BoardGame: The restored board
+    """
+    with open(path, 'rb') as file:
+        return loads(file.read(), board_class)
+
+
+def _pack_bits(values: bytes) -> bytes:
+    # Packs one 0/1 byte per cell into eight cells per byte, most significant bit first (as np.packbits does).
+    # int() parses a base 2 string in linear time, so this stays fast without NumPy.
+    padding = -len(values) % 8
+    digits = values.translate(_TO_DIGITS) + b'0' * padding
+    return int(digits, 2).to_bytes(len(digits) // 8, 'big') if digits else b''
+
+
+def _unpack_bits(packed, cells: int) -> bytes:
+    # The inverse of _pack_bits: one 0/1 byte for each of the first cells bits
+    if not cells:
+        return b''
+    digits = format(int.from_bytes(packed, 'big'), f'0{len(packed) * 8}b')
+    return digits[:cells].encode('ascii').translate(_FROM_DIGITS)
+
+
+def _pack_cells(board: BoardGame) -> list[bytes]:
+    # The mines come from mine_positions; revealed and flag state needs one pass over the cells
+    mines = bytearray(board.rows * board.cols)
+    for row, col in board.mine_positions:
+        mines[row * board.cols + col] = 1
+    cells = [cell for row in board.board for cell in row]
+    revealed = bytes([cell.is_revealed for cell in cells])
+    flags = bytes([cell.is_flag for cell in cells])
+    return [_pack_bits(bytes(mines)), _pack_bits(revealed), _pack_bits(flags)]
+
+
+def _unpack_cells(board: BoardGame, planes: list):
+    cells = board.rows * board.cols
+    mines, revealed, flags = (_unpack_bits(plane, cells) for plane in planes)
+    cols = board.cols
+    # Only the set bits need visiting, and bytes.find skips runs of zeros in C
+    for plane, attribute in ((revealed, 'is_revealed'), (flags, 'is_flag')):
+        index = plane.find(1)
+        while index != -1:
+            setattr(board.board[index // cols][index % cols], attribute, True)
+            index = plane.find(1, index + 1)
+
+    index = mines.find(1)
+    while index != -1:
+        board.mine_positions.append(divmod(index, cols))
+        index = mines.find(1, index + 1)
+    for row, col in board.mine_positions:
+        board.board[row][col].is_mine = True
+        board.board[row][col].can_be_mine = False
+        board.update_adjacent_mines(row, col)
+    board._count_safe_remaining()
+
+
+def _unpack_arrays(board: ArrayBoardGame, planes: list):
+    # np.frombuffer reads each plane where it lies in the saved data; only the unpacked arrays are new
+    shape = (board.rows, board.cols)
+    cells = board.rows * board.cols
+    board.mines, board.revealed, board.flags = (
+        np.unpackbits(np.frombuffer(plane, dtype=np.uint8), count=cells).view(bool).reshape(shape) for plane in planes)
+    board.can_be_mine = ~board.mines
+    rows, cols = np.nonzero(board.mines)
+    board.mine_positions = list(zip(rows.tolist(), cols.tolist()))
+    board.adjacent = neighbor_mine_counts(board.mines)
+    board._count_safe_remaining()
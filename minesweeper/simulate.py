@@ -0,0 +1,189 @@
+# minesweeper/simulate.py
+# Headless simulation engine for running AISolver games without pygame
+# Inputs: Command line arguments (board size, mine count, AI difficulty, number of games)
+# Outputs: Games/sec, win rate and moves per game printed to the terminal
+# Author: Jakob Huffman
+# Creation Date: 10/14/2025
+
+import argparse
+import functools
+import os
+import random
+import time
+
+import config
+from minesweeper.board import BoardGame
+from minesweeper.ai_solver import AISolver
+from minesweeper.replay import ReplayRecorder
+from minesweeper.topology import TOPOLOGIES
+
+
+class SimulationResult:
+    """Aggregated results of a batch of simulated games
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.stalls = 0 # games that hit the move limit without finishing
+        self.moves = 0
+        self.guesses = 0
+        self.elapsed = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def moves_per_game(self) -> float:
+        return self.moves / self.games if self.games else 0.0
+
+    @property
+    def guesses_per_game(self) -> float:
+        return self.guesses / self.games if self.games else 0.0
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def play_game(rows: int, cols: int, mines: int, difficulty: str, board_class: type = BoardGame, seed: int | None = None, batch: bool = False, record_path: str | None = None) -> tuple[str, int, int]:
+    """Plays one full AI game on a fresh board, with no delay between moves
+
+    Args:
+        rows (int): Number of rows on the board
+        cols (int): Number of columns on the board
+        mines (int): Number of mines to place
+        difficulty (str): The AISolver difficulty to play with
+        board_class (type, optional): The BoardGame implementation to play on. Defaults to BoardGame.
+        seed (int | None, optional): Seed for the board's mine layout and the solver's guesses. Defaults to None.
+        batch (bool, optional): Play every certain move the solver finds at once, only falling back to
+            make_move when there are none. Defaults to False.
+        record_path (str | None, optional): Write a replay of the game to this file. Defaults to None.
+
+    Returns:
+        tuple[str, int, int]: The final phase ('won', 'lost' or 'stalled'), the number of moves made and how many of them were guesses
+    """
+    board = board_class(rows, cols, mines, seed)
+    board.phase = 'ai'
+    solver = AISolver(board, difficulty, seed)
+    recorder = ReplayRecorder(board, record_path, difficulty) if record_path else None
+    try:
+        return _play(board, solver, rows * cols * 2, batch)
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+
+def _play(board: BoardGame, solver: AISolver, max_moves: int, batch: bool) -> tuple[str, int, int]:
+    # The first move on an untouched board is always a reveal, which lets the board place its
+    # mines around it through handle_first_click. A solver can get stuck repeating a flag it isn't
+    # allowed to place, so cap the number of moves rather than looping forever.
+    moves = 0
+    while board.phase == 'ai':
+        if moves >= max_moves:
+            return 'stalled', moves, solver.guesses
+        if batch:
+            # Only count the moves that changed the board: a certain reveal can land on a cell an
+            # earlier move in the batch already flooded open, and then the board skips it
+            played = 0
+            for move in solver.find_moves():
+                if moves + played >= max_moves:
+                    break
+                if solver.play_moves([move]):
+                    played += 1
+            if played:
+                moves += played
+                continue
+        if solver.make_move() is None:
+            return 'stalled', moves, solver.guesses
+        moves += 1
+
+    return board.phase, moves, solver.guesses
+
+
+def run_simulation(games: int, rows: int, cols: int, mines: int, difficulty: str, seed: int | None = None, board_class: type = BoardGame, batch: bool = False, record_dir: str | None = None) -> SimulationResult:
+    """Plays a batch of AI games back to back and collects their results
+
+    Args:
+        games (int): Number of games to play
+        rows (int): Number of rows on the board
+        cols (int): Number of columns on the board
+        mines (int): Number of mines to place
+        difficulty (str): The AISolver difficulty to play with
+        seed (int | None, optional): Seed for the per-game seeds so runs can be repeated. Defaults to None.
+        board_class (type, optional): The BoardGame implementation to play on. Defaults to BoardGame.
+        batch (bool, optional): Play certain moves in batches, see play_game. Defaults to False.
+        record_dir (str | None, optional): Write a replay of every game to this directory. Defaults to None.
+
+    Returns:
+        SimulationResult: The aggregated results of every game
+    """
+    seeds = random.Random(seed)
+
+    result = SimulationResult()
+    start = time.perf_counter()
+    for game in range(games):
+        record_path = os.path.join(record_dir, f"game-{game:06d}.msr") if record_dir else None
+        outcome, moves, guesses = play_game(rows, cols, mines, difficulty, board_class, seeds.randrange(2**63), batch, record_path)
+        result.games += 1
+        result.moves += moves
+        result.guesses += guesses
+        if outcome == 'won':
+            result.wins += 1
+        elif outcome == 'lost':
+            result.losses += 1
+        else:
+            result.stalls += 1
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run headless AISolver games and report engine speed and solver quality.")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--rows', type=int, default=config.GRID_ROWS, help="number of rows on the board")
+    parser.add_argument('--cols', type=int, default=config.GRID_COLS, help="number of columns on the board")
+    parser.add_argument('--mines', type=int, default=config.MIN_MINES, help="number of mines to place")
+    parser.add_argument('--difficulty', choices=['easy', 'medium', 'hard', 'expert'], default='hard', help="AI difficulty")
+    parser.add_argument('--seed', type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument('--batch', action='store_true', help="play every certain move the solver finds at once")
+    parser.add_argument('--backend', choices=['list', 'array'], default='list', help="board storage: Cell objects or NumPy arrays")
+    parser.add_argument('--topology', choices=list(TOPOLOGIES), default='square', help="which cells neighbor each other")
+    parser.add_argument('--record', default=None, help="write a replay of every game to this directory")
+    args = parser.parse_args(argv)
+
+    if args.rows < 1 or args.cols < 1:
+        parser.error("the board needs at least one row and one column")
+    # The first click keeps itself and its neighbors free of mines
+    max_mines = BoardGame.max_mines(args.rows, args.cols, args.topology)
+    if not (0 <= args.mines <= max_mines):
+        parser.error(f"mine count must be between 0 and {max_mines} on a {args.rows}x{args.cols} {args.topology} board")
+
+    if args.backend == 'array':
+        from minesweeper.array_board import ArrayBoardGame
+        board_class = ArrayBoardGame
+    else:
+        board_class = BoardGame
+    if args.topology != 'square':
+        board_class = functools.partial(board_class, topology=args.topology)
+
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+
+    try:
+        result = run_simulation(args.games, args.rows, args.cols, args.mines, args.difficulty, args.seed, board_class, args.batch, args.record)
+    except ValueError as error: # a board the options describe can't be built
+        parser.error(str(error))
+
+    print(f"Board:          {args.rows}x{args.cols} {args.topology}, {args.mines} mines, AI difficulty '{args.difficulty}'")
+    print(f"Games:          {result.games} ({result.wins} won, {result.losses} lost, {result.stalls} stalled)")
+    print(f"Win rate:       {result.win_rate:.2%}")
+    print(f"Moves per game: {result.moves_per_game:.1f}")
+    print(f"Guesses/game:   {result.guesses_per_game:.2f}")
+    print(f"Games/sec:      {result.games_per_sec:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+# minesweeper/topology.py
+# Board topologies: which cells neighbor which. A topology precomputes the neighbors of every cell of
+# a board geometry once, as flat-index tables in CSR form (the neighbors of cell i are
+# indices[indptr[i]:indptr[i + 1]], where i = row * cols + col), and get_topology caches them by
+# geometry so every board of the same size and kind shares one set of tables.
+# 1. SquareTopology: The classic board, where a cell touches the eight cells around it.
+# 2. TorusTopology: The classic neighbors, wrapping around the edges of the board.
+# 3. HexTopology: Hexagonal cells in "odd-r" offset layout, where every odd row is shifted half a cell right.
+# 4. ComputedSquareTopology: The classic neighbors worked out on each call, for boards too big for tables.
+# Inputs: Board geometry (kind, rows, cols)
+# Outputs: The flat indices of each cell's neighbors
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING: # only for annotations, NumPy itself is imported lazily by _numpy
+    import numpy as np
+
+# Boards with at least this many cells build their tables with NumPy, if it is installed. NumPy is
+# only imported then, since importing it takes longer than building a preset board's tables and
+# would otherwise slow down the game's startup.
+NUMPY_MIN_CELLS = 10_000
+
+# The eight (row, col) steps to a cell's neighbors on a square grid
+SQUARE_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class Topology(ABC):
+    """Which cells of a rows x cols board neighbor each other, addressed by flat index row * cols + col
+    """
+
+    kind = None # the name get_topology knows the topology by
+    max_neighbors = 8 # the most neighbors any cell has
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+
+    def __copy__(self) -> 'Topology':
+        # Topologies never change once built, so board snapshots share them rather than copying the tables
+        return self
+
+    def __deepcopy__(self, memo) -> 'Topology':
+        return self
+
+    @abstractmethod
+    def neighbors(self, index: int):
+        """Gets the neighbors of a cell
+
+        Args:
+            index (int): The cell, as row * cols + col
+
+        Returns:
+            Sequence[int]: The flat indices of the cell's neighbors
+        """
+
+    def neighbor_cells(self, row: int, col: int) -> list[tuple[int, int]]:
+        """Gets the neighbors of a cell as (row, col) pairs, for code that works in coordinates
+
+        Args:
+            row (int): The row of the cell
+            col (int): The column of the cell
+
+        Returns:
+            list[tuple[int, int]]: The (row, col) of each of the cell's neighbors
+        """
+        cols = self.cols
+        return [divmod(index, cols) for index in self.neighbors(row * cols + col)]
+
+
+class GridTopology(Topology):
+    """A topology whose neighbor tables are built once from per-row offsets, as array('i') so a
+       1000x1000 board's tables take about 36 MB.
+       Subclasses set OFFSETS (one tuple of (row, col) steps per row parity, or a single tuple for all rows)
+       and WRAPS (whether steps off one edge come back on the opposite edge).
+    """
+
+    OFFSETS = (SQUARE_OFFSETS,)
+    WRAPS = False
+
+    def __init__(self, rows: int, cols: int):
+        super().__init__(rows, cols)
+        # Small wrapping boards reach the same neighbor (or the cell itself) by more than one step,
+        # which only the per-cell build filters out
+        np = _numpy() if self.size >= NUMPY_MIN_CELLS and (not self.WRAPS or min(rows, cols) >= 3) else None
+        if np is not None:
+            self.indptr, self.indices = self._build_numpy(np)
+        else:
+            self.indptr, self.indices = self._build_python()
+
+    def neighbors(self, index: int):
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+    def neighbor_cells(self, row: int, col: int) -> list[tuple[int, int]]:
+        # Same as Topology.neighbor_cells, reading the tables directly since solvers call it constantly
+        cols = self.cols
+        index = row * cols + col
+        indptr = self.indptr
+        return [divmod(n, cols) for n in self.indices[indptr[index]:indptr[index + 1]]]
+
+    def _build_python(self) -> tuple[array, array]:
+        rows, cols = self.rows, self.cols
+        indptr = array('i', [0])
+        indices = array('i')
+        for row in range(rows):
+            offsets = self.OFFSETS[row % len(self.OFFSETS)]
+            deltas = [dr * cols + dc for dr, dc in offsets]
+            for col in range(cols):
+                index = row * cols + col
+                if 0 < row < rows - 1 and 0 < col < cols - 1:
+                    # Away from the edges every step lands on the board, so skip the checks
+                    indices.extend([index + delta for delta in deltas])
+                    indptr.append(len(indices))
+                    continue
+                seen = []
+                for dr, dc in offsets:
+                    r, c = row + dr, col + dc
+                    if self.WRAPS:
+                        r, c = r % rows, c % cols
+                    elif not (0 <= r < rows and 0 <= c < cols):
+                        continue
+                    index = r * cols + c
+                    if (r, c) != (row, col) and index not in seen:
+                        seen.append(index)
+                indices.extend(seen)
+                indptr.append(len(indices))
+        return indptr, indices
+
+    def _build_numpy(self, np) -> tuple[array, array]:
+        # One column per step: the neighbor in that direction, or -1 where it falls off the board.
+        # Flattening row by row and dropping the -1s leaves every cell's neighbors in order.
+        rows, cols = self.rows, self.cols
+        row_of = np.repeat(np.arange(rows), cols)
+        col_of = np.tile(np.arange(cols), rows)
+        period = len(self.OFFSETS)
+        steps = np.array(self.OFFSETS) # (period, degree, 2)
+        table = np.empty((rows * cols, steps.shape[1]), dtype=np.int64)
+        for k in range(steps.shape[1]):
+            r = row_of + steps[row_of % period, k, 0]
+            c = col_of + steps[row_of % period, k, 1]
+            if self.WRAPS:
+                r, c = r % rows, c % cols
+                table[:, k] = r * cols + c
+            else:
+                table[:, k] = np.where((r >= 0) & (r < rows) & (c >= 0) & (c < cols), r * cols + c, -1)
+        valid = table >= 0
+        indptr = np.zeros(rows * cols + 1, dtype=np.int32)
+        np.cumsum(valid.sum(axis=1), out=indptr[1:])
+        return _to_array(indptr), _to_array(table[valid].astype(np.int32))
+
+
+def _numpy():
+    # NumPy, imported the first time a board is big enough to want it, or None if it isn't installed
+    try:
+        import numpy
+    except ImportError: # NumPy is optional, it only speeds up building the tables
+        return None
+    return numpy
+
+
+def _to_array(values: 'np.ndarray') -> array:
+    # Copies an int32 NumPy array into an array('i'), which indexes and slices faster from plain Python
+    result = array('i')
+    result.frombytes(values.tobytes())
+    return result
+
+
+class SquareTopology(GridTopology):
+    """The classic board: every cell touches the (up to) eight cells around it"""
+    kind = 'square'
+
+
+class TorusTopology(GridTopology):
+    """The classic neighbors, but the board wraps around, so every cell has eight neighbors"""
+    kind = 'torus'
+    WRAPS = True
+
+
+class HexTopology(GridTopology):
+    """Hexagonal cells in "odd-r" offset layout: each odd row sits half a cell to the right of the
+       rows around it, so a cell touches two cells above, two below and one on each side
+    """
+    kind = 'hex'
+    max_neighbors = 6
+    OFFSETS = (((-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0)), # even rows
+               ((-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1))) # odd rows
+
+
+class ComputedSquareTopology(Topology):
+    """The square topology without tables, working each cell's neighbors out when asked. For boards
+       far too big to build tables for, like a ChunkedBoardGame's.
+    """
+    kind = 'square'
+
+    def neighbors(self, index: int):
+        rows, cols = self.rows, self.cols
+        row, col = divmod(index, cols)
+        return [r * cols + c
+                for r in range(max(row - 1, 0), min(row + 2, rows))
+                for c in range(max(col - 1, 0), min(col + 2, cols))
+                if r != row or c != col]
+
+
+TOPOLOGIES = {topology.kind: topology for topology in (SquareTopology, TorusTopology, HexTopology)}
+
+# Built topologies by (kind, rows, cols). Boards hold on to their topology, so tables live as long
+# as some board uses them and are freed with the last one; a big board's tables run to tens of MB.
+_topologies = weakref.WeakValueDictionary()
+# The topology asked for most recently, kept alive so code that looks one up for a moment, over and
+# over, doesn't rebuild its tables every time
+_latest = None
+_topologies_lock = threading.Lock() # boards are also made on the generator's background thread
+
+
+def get_topology(kind: str, rows: int, cols: int) -> Topology:
+    """Gets the topology of a board geometry, building its tables only the first time it is asked for
+
+    Args:
+        kind (str): 'square', 'torus' or 'hex'
+        rows (int): Number of rows on the board
+        cols (int): Number of columns on the board
+
+    Raises:
+        ValueError: If the kind isn't a known topology
+
+    Returns:
+        Topology: The topology, shared by every board with the same geometry
+    """
+    global _latest
+    if kind not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {kind!r}, expected one of {', '.join(TOPOLOGIES)}")
+    key = (kind, rows, cols)
+    with _topologies_lock:
+        topology = _topologies.get(key)
+        if topology is None:
+            topology = _topologies[key] = TOPOLOGIES[kind](rows, cols)
+        _latest = topology
+    return topology
@@ -0,0 +1,167 @@
+# minesweeper/ui/camera.py
+# Camera over the game board: the part of the window the board is drawn in (the viewport), how far
+# the board is scrolled inside it and how big its cells are drawn. Drawing only visits the cells the
+# camera can see and mouse positions are mapped back to cells through it, so the cost of a frame
+# depends on the window size rather than the board size.
+# Inputs: The board being shown, and pan and zoom input from app.py
+# Outputs: Which cells are visible, where each one is on screen, and which cell is under the mouse
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import pygame
+
+import config
+
+# The cell sizes the camera zooms between. Keeping to a fixed set means the renderer only ever
+# builds a handful of tile atlases.
+ZOOM_CELL_SIZES = (4, 6, 8, 10, 12, 16, 20, 24, 30, 40, 50, 64)
+
+
+def default_viewport() -> pygame.Rect:
+    """The area of the window the board is drawn in: from the grid position to the right edge of the
+       window, leaving room below it for the status message"""
+    return pygame.Rect(config.GRID_POS_X, config.GRID_POS_Y,
+                       config.WINDOW_WIDTH - config.GRID_POS_X - config.VIEWPORT_MARGIN,
+                       config.WINDOW_HEIGHT - config.GRID_POS_Y - config.STATUS_AREA_HEIGHT)
+
+
+class Camera:
+    """A scrollable, zoomable view of a board inside a fixed viewport. Boards that fit in the
+       viewport are drawn at its top left corner, just like before; bigger ones can be panned.
+    """
+
+    def __init__(self, viewport: pygame.Rect | None = None):
+        """
+        Args:
+            viewport (pygame.Rect | None, optional): The area of the screen to draw the board in.
+                Defaults to default_viewport().
+        """
+        self.viewport = viewport if viewport is not None else default_viewport()
+        self.rows = 0
+        self.cols = 0
+        self.cell_size = config.CELL_SIZE
+        self.x = 0 # board pixel at the viewport's left edge
+        self.y = 0 # board pixel at the viewport's top edge
+
+    def attach(self, board):
+        """Points the camera at a board, at the board's cell size and scrolled to its top left corner
+
+        Args:
+            board (BoardGame): The board to show
+        """
+        self.rows = board.rows
+        self.cols = board.cols
+        self.cell_size = max(1, board.cell_size)
+        self.x = self.y = 0
+
+    @property
+    def state(self) -> tuple:
+        """Everything that decides where cells are drawn, so a renderer can tell when the view moved"""
+        return (self.rows, self.cols, self.cell_size, self.x, self.y, tuple(self.viewport))
+
+    def _clamp(self):
+        # Keep the board covering as much of the viewport as it can
+        self.x = max(0, min(self.x, self.cols * self.cell_size - self.viewport.width))
+        self.y = max(0, min(self.y, self.rows * self.cell_size - self.viewport.height))
+
+    def pan(self, dx: int, dy: int) -> bool:
+        """Scrolls the view by a number of pixels, stopping at the edges of the board
+
+        Args:
+            dx (int): Pixels to scroll right (negative scrolls left)
+            dy (int): Pixels to scroll down (negative scrolls up)
+
+        Returns:
+            bool: Whether the view moved
+        """
+        before = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self._clamp()
+        return (self.x, self.y) != before
+
+    def zoom(self, steps: int, anchor: tuple[int, int] | None = None) -> bool:
+        """Zooms in or out through ZOOM_CELL_SIZES, keeping the board point under the anchor in place
+
+        Args:
+            steps (int): Levels to zoom in (negative zooms out), e.g. a mouse wheel event's y
+            anchor (tuple[int, int] | None, optional): The screen position to zoom around, e.g. the
+                mouse. Defaults to the center of the viewport.
+
+        Returns:
+            bool: Whether the cell size changed
+        """
+        if steps > 0:
+            larger = [size for size in ZOOM_CELL_SIZES if size > self.cell_size]
+            new_size = larger[min(steps, len(larger)) - 1] if larger else self.cell_size
+        elif steps < 0:
+            smaller = [size for size in ZOOM_CELL_SIZES if size < self.cell_size]
+            new_size = smaller[max(steps, -len(smaller))] if smaller else self.cell_size
+        else:
+            new_size = self.cell_size
+        if new_size == self.cell_size:
+            return False
+
+        if anchor is None or not self.viewport.collidepoint(anchor):
+            anchor = self.viewport.center
+        # The board point under the anchor, as a fraction of a cell so it scales exactly
+        board_x = (anchor[0] - self.viewport.x + self.x) / self.cell_size
+        board_y = (anchor[1] - self.viewport.y + self.y) / self.cell_size
+        self.cell_size = new_size
+        self.x = round(board_x * new_size) - (anchor[0] - self.viewport.x)
+        self.y = round(board_y * new_size) - (anchor[1] - self.viewport.y)
+        self._clamp()
+        return True
+
+    def visible_cells(self) -> tuple[int, int, int, int]:
+        """The cells at least partly inside the viewport
+
+        Returns:
+            tuple[int, int, int, int]: (first row, end row, first col, end col), with the ends exclusive
+        """
+        size = self.cell_size
+        row_start = self.y // size
+        col_start = self.x // size
+        row_end = min(self.rows, -(-(self.y + self.viewport.height) // size))
+        col_end = min(self.cols, -(-(self.x + self.viewport.width) // size))
+        return row_start, row_end, col_start, col_end
+
+    def is_visible(self, row: int, col: int) -> bool:
+        """Whether any of a cell is inside the viewport"""
+        row_start, row_end, col_start, col_end = self.visible_cells()
+        return row_start <= row < row_end and col_start <= col < col_end
+
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        """Gets the rectangle on screen where a cell is drawn. Cells on the edge of the view stick out
+           of the viewport, so draw with the screen clipped to board_rect().
+
+        Args:
+            row (int): The row of the cell
+            col (int): The column of the cell
+
+        Returns:
+            pygame.Rect: The cell's rectangle
+        """
+        return pygame.Rect(self.viewport.x + col * self.cell_size - self.x,
+                           self.viewport.y + row * self.cell_size - self.y,
+                           self.cell_size, self.cell_size)
+
+    def board_rect(self) -> pygame.Rect:
+        """The part of the viewport the board covers, which is all of it unless the board is smaller"""
+        return pygame.Rect(self.viewport.x, self.viewport.y,
+                           min(self.viewport.width, self.cols * self.cell_size),
+                           min(self.viewport.height, self.rows * self.cell_size))
+
+    def cell_at(self, pos: tuple[int, int]) -> tuple[int, int] | None:
+        """Finds the cell under a screen position, e.g. a mouse click
+
+        Args:
+            pos (tuple[int, int]): The screen position
+
+        Returns:
+            tuple[int, int] | None: The (row, col) of the cell, or None if the position isn't over the board
+        """
+        if not self.board_rect().collidepoint(pos):
+            return None
+        return ((pos[1] - self.viewport.y + self.y) // self.cell_size,
+                (pos[0] - self.viewport.x + self.x) // self.cell_size)
@@ -0,0 +1,75 @@
+# minesweeper/ui/fonts.py
+# Finds the game's font file once and remembers it on disk. pygame.font.SysFont looks a font up by
+# listing every font on the system (on Linux by running fc-list), which can take a long time on a
+# slow machine and used to happen on every launch; with the file's path cached, later launches open
+# the font file directly.
+# Inputs: A font name, and the cache file at config.FONT_CACHE_FILE
+# Outputs: Fonts, and the cache file
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import json
+import os
+
+import pygame
+
+import config
+
+# Font name -> the path of its file, or None if the system doesn't have it and pygame's default font
+# is used instead. Loaded from the cache file the first time a font is looked up.
+_paths = None
+
+
+def _load_cache() -> dict:
+    # The cached paths from earlier launches, or nothing if there is no usable cache file
+    try:
+        with open(config.FONT_CACHE_FILE, encoding='utf-8') as file:
+            paths = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return paths if isinstance(paths, dict) else {}
+
+
+def _save_cache(paths: dict):
+    # Writes the cache file. Failing to write it only means the next launch looks the fonts up again.
+    try:
+        os.makedirs(os.path.dirname(config.FONT_CACHE_FILE), exist_ok=True)
+        with open(config.FONT_CACHE_FILE, 'w', encoding='utf-8') as file:
+            json.dump(paths, file, indent=2)
+    except OSError:
+        pass
+
+
+def font_path(name: str) -> str | None:
+    """Finds the file of a system font, from the cache if an earlier lookup found one that still exists
+
+    Args:
+        name (str): The font's name, as pygame.font.SysFont takes it
+
+    Returns:
+        str | None: The path of the font file, or None if the system doesn't have the font
+    """
+    global _paths
+    if _paths is None:
+        _paths = _load_cache()
+    # A font file that has since been removed is looked up again, in case it moved
+    if name in _paths and (_paths[name] is None or os.path.isfile(_paths[name])):
+        return _paths[name]
+
+    _paths[name] = pygame.font.match_font(name)
+    _save_cache(_paths)
+    return _paths[name]
+
+
+def load_font(name: str, size: int) -> pygame.font.Font:
+    """Opens a system font at the given size, the same font pygame.font.SysFont would give without
+       listing the system's fonts when the font's file is already cached
+
+    Args:
+        name (str): The font's name
+        size (int): The font size
+
+    Returns:
+        pygame.font.Font: The font, or pygame's default font at that size if the system doesn't have it
+    """
+    return pygame.font.Font(font_path(name), size)
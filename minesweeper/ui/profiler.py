@@ -0,0 +1,185 @@
+# minesweeper/ui/profiler.py
+# Opt-in frame profiler: records how long each phase of a frame of the main loop takes, draws an
+# on-screen overlay of frame time, FPS and the phase breakdown, and dumps a rolling trace to a file
+# Inputs: Phase timings recorded by app.py
+# Outputs: The performance overlay and a trace file that chrome://tracing or Perfetto can open
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import json
+import time
+from collections import deque
+
+import pygame
+
+from config import FONT_SIZE
+from minesweeper.ui.view import get_font
+
+
+class _NoPhase:
+    # Shared do-nothing context manager returned while the profiler is off, so timing costs nothing
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase:
+    # Times one phase; time spent in phases nested inside it is counted against those phases instead
+    __slots__ = ('profiler', 'name', 'start', 'children')
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.children = 0.0
+        self.profiler._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        elapsed = end - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        timings = self.profiler._current
+        timings[self.name] = timings.get(self.name, 0.0) + elapsed - self.children
+        self.profiler._spans.append((self.name, self.start, elapsed))
+        return False
+
+
+class FrameProfiler:
+    """Records per-phase timings for each frame of the main loop, keeping the last history frames
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 600):
+        """Creates a profiler
+
+        Args:
+            enabled (bool, optional): Whether to start recording straight away. Defaults to False.
+            history (int, optional): How many of the most recent frames to keep. Defaults to 600.
+        """
+        self.enabled = enabled
+        self.frames = deque(maxlen=history) # (start time, frame time, {phase: seconds}, [(phase, start, seconds)])
+        self._stack = []
+        self._current = {}
+        self._spans = []
+        self._frame_start = None
+        self.overlay_rect = None # the area the overlay last covered
+
+    def toggle(self):
+        """Turns recording on or off, dropping the frames recorded so far"""
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self._frame_start = None
+
+    def begin_frame(self):
+        """Marks the start of a frame's work"""
+        if not self.enabled:
+            return
+        self._current = {}
+        self._spans = []
+        self._stack.clear()
+        self._frame_start = time.perf_counter()
+
+    def phase(self, name: str):
+        """Times a phase of the current frame
+
+        Args:
+            name (str): The phase, e.g. 'events' or 'draw_board'
+
+        Returns:
+            A context manager that times the code inside it
+        """
+        if not self.enabled or self._frame_start is None:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def end_frame(self):
+        """Marks the end of a frame's work and stores its timings"""
+        if not self.enabled or self._frame_start is None:
+            return
+        frame_time = time.perf_counter() - self._frame_start
+        self.frames.append((self._frame_start, frame_time, self._current, self._spans))
+        self._frame_start = None
+
+    @property
+    def last_frame_time(self) -> float:
+        """Seconds of work in the most recent frame"""
+        return self.frames[-1][1] if self.frames else 0.0
+
+    @property
+    def fps(self) -> float:
+        """Frames per second over the recorded history"""
+        if len(self.frames) < 2:
+            return 0.0
+        span = self.frames[-1][0] - self.frames[0][0]
+        return (len(self.frames) - 1) / span if span > 0 else 0.0
+
+    def averages(self, frames: int = 60) -> dict[str, float]:
+        """Average seconds per frame spent in each phase over the most recent frames
+
+        Args:
+            frames (int, optional): How many recent frames to average over. Defaults to 60.
+
+        Returns:
+            dict[str, float]: Phase name -> average seconds, in the order the phases first ran
+        """
+        recent = list(self.frames)[-frames:]
+        totals = {}
+        for _, _, timings, _ in recent:
+            for name, seconds in timings.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        return {name: seconds / len(recent) for name, seconds in totals.items()}
+
+    def dump_trace(self, path: str):
+        """Writes the recorded frames to a file in the Chrome trace event format
+
+        Args:
+            path (str): The file to write
+        """
+        events = []
+        for start, frame_time, _, spans in self.frames:
+            events.append({'name': 'frame', 'ph': 'X', 'ts': start * 1e6, 'dur': frame_time * 1e6, 'pid': 0, 'tid': 0})
+            for name, span_start, seconds in spans:
+                events.append({'name': name, 'ph': 'X', 'ts': span_start * 1e6, 'dur': seconds * 1e6, 'pid': 0, 'tid': 0})
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+def draw_overlay(screen: pygame.Surface, profiler: FrameProfiler) -> pygame.Rect:
+    """Draws the frame time, FPS and phase breakdown in the top left corner of the screen, left of the board
+
+    Args:
+        screen (pygame.Surface): The screen to draw on
+        profiler (FrameProfiler): The profiler to show
+
+    Returns:
+        pygame.Rect: The area that was drawn, to pass to pygame.display.update
+    """
+    lines = [f"frame {profiler.last_frame_time * 1000:.2f} ms  {profiler.fps:.0f} fps"]
+    for name, seconds in profiler.averages().items():
+        lines.append(f"{name:<12} {seconds * 1000:.2f} ms")
+
+    line_height = FONT_SIZE + 4
+    # Timing text changes every frame, so it is rendered directly rather than flooding render_text's cache
+    font = get_font(FONT_SIZE)
+    surfaces = [font.render(line, True, (0, 255, 0)) for line in lines]
+    width = max(surface.get_width() for surface in surfaces) + 10
+    rect = pygame.Rect(0, 0, width, line_height * len(lines) + 6)
+    # Also clear whatever the last overlay covered, in case it was bigger
+    if profiler.overlay_rect is not None:
+        rect = rect.union(profiler.overlay_rect)
+    screen.fill((0, 0, 0), rect)
+    for i, surface in enumerate(surfaces):
+        screen.blit(surface, (5, 3 + i * line_height))
+    profiler.overlay_rect = pygame.Rect(0, 0, width, line_height * len(lines) + 6)
+    return rect
+
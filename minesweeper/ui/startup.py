@@ -0,0 +1,49 @@
+# minesweeper/ui/startup.py
+# Startup timings for app.py's --profile-startup mode: how long each import and set-up step takes,
+# up to the first frame being on screen. Only uses the standard library, so it can be imported before
+# pygame and time pygame's own import.
+# Inputs: Steps marked by app.py as it starts up
+# Outputs: A report of the steps' timings
+# Author: Jakob Huffman
+# Creation Date: 10/16/2025
+
+import time
+
+
+class StartupTimer:
+    """Records the time each step of startup took, measured from when the timer was created
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.steps = [] # (name, seconds) for every step so far, in order
+        self._last = self.start
+
+    def mark(self, name: str):
+        """Ends a step: everything since the previous mark (or the timer's creation) is counted as this step
+
+        Args:
+            name (str): What the step did, e.g. 'import pygame'
+        """
+        now = time.perf_counter()
+        self.steps.append((name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        """Seconds from the timer's creation to the last mark"""
+        return self._last - self.start
+
+    def report(self) -> str:
+        """Formats the steps as a table of milliseconds, with each step's share of the total
+
+        Returns:
+            str: The report, one line per step and a final line for the total
+        """
+        width = max([len(name) for name, _ in self.steps] + [len('total')])
+        total = self.total or 1e-9
+        lines = ["Startup timings:"]
+        for name, seconds in self.steps:
+            lines.append(f"  {name:<{width}}  {seconds * 1000:8.1f} ms  {seconds / total:6.1%}")
+        lines.append(f"  {'total':<{width}}  {self.total * 1000:8.1f} ms")
+        return '\n'.join(lines)
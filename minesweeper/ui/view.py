@@ -5,12 +5,17 @@
 #Author: Delaney Gray
 # Creation Date: 9/8/2025
 
+from functools import lru_cache
+
 import pygame
 import pygame_gui
 import config
-from config import WINDOW_WIDTH, FONT_NAME, FONT_SIZE, HELP_TEXT, WON_TEXT, LOST_TEXT
-from config import AI_TEXT, AI_BUTTON_EASY, AI_BUTTON_MEDIUM, AI_BUTTON_HARD, AI_TEXT_X, AI_BUTTON_NONE, AI_TEXT_Y, AI_BUTTON_Y, AI_EASY_X, AI_MEDIUM_X, AI_HARD_X, AI_NONE_X
+from config import WINDOW_WIDTH, FONT_NAME, FONT_SIZE, HELP_TEXT, WON_TEXT, LOST_TEXT, NO_GUESS_FALLBACK_TEXT
+from config import AI_TEXT, AI_BUTTON_EASY, AI_BUTTON_MEDIUM, AI_BUTTON_HARD, AI_BUTTON_EXPERT, AI_BUTTON_NONE, AI_TEXT_Y, AI_BUTTON_Y, AI_EASY_X, AI_MEDIUM_X, AI_HARD_X, AI_EXPERT_X, AI_NONE_X
 from minesweeper.board import BoardGame
+from minesweeper.journal import CellRevealed, FlagPlaced, FlagRemoved
+from minesweeper.ui.camera import Camera, ZOOM_CELL_SIZES
+from minesweeper.ui.fonts import load_font
 
 
 def draw_welcome(manager: pygame_gui.UIManager, screen: pygame.Surface, wasBadInput: bool = False, text_only: bool = False) -> tuple[pygame_gui.elements.UITextEntryBox, pygame_gui.elements.UIButton] | None:
@@ -32,24 +37,22 @@ def draw_welcome(manager: pygame_gui.UIManager, screen: pygame.Surface, wasBadIn
         screen.fill((0, 0, 0))
 
         # Draw the title
-        title_font = pygame.font.SysFont(FONT_NAME, FONT_SIZE + 12)
-        title_surface = title_font.render("Welcome to Minesweeper", True, (255, 255, 0))
+        title_surface = render_text("Welcome to Minesweeper", FONT_SIZE + 12, (255, 255, 0))
         screen.blit(title_surface, ((WINDOW_WIDTH - title_surface.get_width()) // 2, 60))
 
         # Draw the help text
-        help_font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
         lines = HELP_TEXT.split('\n')
         for i, line in enumerate(lines):
-            text_surface = help_font.render(line, True, (200, 200, 200))
+            text_surface = render_text(line, FONT_SIZE, (200, 200, 200))
             screen.blit(text_surface, (50, 140 + i * 30))
 
         # Print a message to enter the configured mine range, or an error message if they tried an invalid input
         mines_label = config.NUM_MINES_TEXT
         mines_error_label = config.MINES_ERROR_BAD_INPUT_TEXT
-        minesText = help_font.render(mines_label, True, (200, 200, 200)) if not wasBadInput else help_font.render(mines_error_label, True, (200, 50, 50))
+        minesText = render_text(mines_label, FONT_SIZE, (200, 200, 200)) if not wasBadInput else render_text(mines_error_label, FONT_SIZE, (200, 50, 50))
         screen.blit(minesText, (WINDOW_WIDTH // 2 - minesText.get_width() // 2, 250))
 
-        manager.draw_ui(screen)
+        # The caller draws the manager's widgets on top once per frame, so they aren't drawn twice
         return None
     else:
         # Generate the bomb input box 
@@ -89,98 +92,415 @@ def draw_ai_selection(manager: pygame_gui.UIManager) -> tuple:
     hard_button = pygame_gui.elements.UIButton(
         relative_rect=pygame.Rect((AI_HARD_X, AI_BUTTON_Y), (100, 40)),
         text=AI_BUTTON_HARD, manager=manager)
+    expert_button = pygame_gui.elements.UIButton(
+        relative_rect=pygame.Rect((AI_EXPERT_X, AI_BUTTON_Y), (100, 40)),
+        text=AI_BUTTON_EXPERT, manager=manager)
     
     # The old start button is now the "No AI" button
     start_button = no_ai_button
 
-    return ai_text_box, start_button, easy_button, medium_button, hard_button
+    return ai_text_box, start_button, easy_button, medium_button, hard_button, expert_button
+
+
+class WelcomeUI:
+    """The welcome screen's widgets: the mine count box, the AI buttons and the game difficulty buttons.
+       app.py only builds them the first time the welcome screen is shown, so launching straight into
+       a replay never creates them.
+    """
+
+    def __init__(self, manager: pygame_gui.UIManager):
+        """Creates the widgets, with the current game difficulty's button already selected
+
+        Args:
+            manager (pygame_gui.UIManager): The pygame_gui UIManager instance to create them in
+        """
+        self.text_box, _ = draw_welcome(manager, None, False, False)
+        ai_text, start_button, easy_button, medium_button, hard_button, expert_button = draw_ai_selection(manager)
+        # Button -> the AI difficulty it starts a game with, or None for a game without an AI
+        self.ai_buttons = {easy_button: 'easy', medium_button: 'medium', hard_button: 'hard',
+                           expert_button: 'expert', start_button: None}
+
+        # --- Game Difficulty (board size/mines) ---
+        # Create clearly-labeled Game Difficulty (separate from AI Difficulty)
+        # Position the game difficulty controls below the AI buttons to avoid overlap
+        label_y = AI_BUTTON_Y + 40
+        difficulty_label = pygame_gui.elements.UITextBox(
+            html_text="<b>Game Difficulty</b> (board size & mines)",
+            relative_rect=pygame.Rect((0, label_y), (WINDOW_WIDTH, 30)),
+            manager=manager,
+            object_id='#game_diff_text'
+        )
+        button_width = 100
+        button_spacing = 20
+        total_width = button_width * 3 + button_spacing * 2
+        start_x = WINDOW_WIDTH // 2 - total_width // 2
+        # place the difficulty buttons beneath the label
+        game_diff_y = label_y + 40
+        # Button -> the game difficulty it selects
+        self.difficulty_buttons = {}
+        for i, (difficulty, text) in enumerate((('easy', 'Easy'), ('normal', 'Normal'), ('hard', 'Hard'))):
+            button = pygame_gui.elements.UIButton(
+                relative_rect=pygame.Rect((start_x + i * (button_width + button_spacing), game_diff_y), (button_width, 30)),
+                text=text,
+                manager=manager
+            )
+            self.difficulty_buttons[button] = difficulty
+        self.select_difficulty(getattr(config, 'CURRENT_DIFFICULTY', 'normal'))
+
+        self.elements = [self.text_box, ai_text, *self.ai_buttons, difficulty_label, *self.difficulty_buttons]
+
+    def select_difficulty(self, difficulty: str):
+        """Disables the button of the selected game difficulty and enables the others
+
+        Args:
+            difficulty (str): 'easy', 'normal' or 'hard'
+        """
+        for button, name in self.difficulty_buttons.items():
+            if name == difficulty:
+                button.disable()
+            else:
+                button.enable()
+
+    def show(self):
+        """Shows every welcome screen widget"""
+        for element in self.elements:
+            element.show()
+
+    def hide(self):
+        """Hides every welcome screen widget"""
+        for element in self.elements:
+            element.hide()
 
 
 from config import COLOR_1_NEAR_MINE, COLOR_2_NEAR_MINE, COLOR_3_NEAR_MINE, COLOR_4_NEAR_MINE, COLOR_5_NEAR_MINE, COLOR_6_NEAR_MINE, COLOR_7_NEAR_MINE, COLOR_8_NEAR_MINE, COLOR_CELL_COVERED, COLOR_CELL_FLAGGED, COLOR_CELL_UNCOVERED, COLOR_CELL_MINE, COLOR_GRID_LINES
 
-def draw_board(manager: pygame_gui.UIManager, screen: pygame.Surface, board: BoardGame):
-    """Draws the minesweeper game board, reflecting the game state of the given BoardGame object
+def draw_board(manager: pygame_gui.UIManager, screen: pygame.Surface, board: BoardGame, camera: Camera | None = None):
+    """Draws the minesweeper game board, reflecting the game state of the given BoardGame object.
+       Only the cells the camera can see are drawn.
+       The manager's widgets are not drawn; the caller draws them on top once per frame.
 
     Args:
         manager (pygame_gui.UIManager): The pygame_gui UIManager instance handling this
         screen (pygame.Surface): The screen to draw on
         board (BoardGame): The board to draw
+        camera (Camera | None, optional): The view of the board. Defaults to the board's top left corner
+            at its own cell size.
     """
-    font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
-
-    # For each row in the board,
-    for y, row in enumerate(board.board):
-        # For each cell in the row,
-        for x, cell in enumerate(row):
-            # Get the rectangle where the cell will be drawn
-            rect = pygame.Rect(
-                config.GRID_POS_X + x * config.CELL_SIZE,
-                config.GRID_POS_Y + y * config.CELL_SIZE,
-                config.CELL_SIZE,
-                config.CELL_SIZE
-            )
+    camera = _camera_for(board, camera)
+    draw_visible_cells(screen, board, camera)
+    draw_status(screen, board, camera)
 
-            if not cell.is_revealed:
-                # If the cell isn't revealed, draw it as a flag if it is a flag, or as the solid COLOR_CELL_COVERED color
-                if cell.is_flag:
-                    pygame.draw.rect(screen, COLOR_CELL_FLAGGED, rect)
-                    flag_text = font.render("F", True, (0, 0, 0))
-                    screen.blit(flag_text, (rect.x + 5, rect.y + 2))
-                else:
-                    pygame.draw.rect(screen, COLOR_CELL_COVERED, rect)
-            else:
-                # If the cell is revealed, draw it as a COLOR_CELL_MINE box with a 'M' if it is a mine,
-                if cell.is_mine:
-                    pygame.draw.rect(screen, COLOR_CELL_MINE, rect)
-                    mine_text = font.render("M", True, (0, 0, 0))
-                    screen.blit(mine_text, (rect.x + 5, rect.y + 2))
-                # A COLOR_CELL_UNCOVERED box with the number of adjacent mines in the corresponding text color if it has adjacent mines, or
-                elif cell.adjacent_mines > 0:
-                    pygame.draw.rect(screen, COLOR_CELL_UNCOVERED, rect)
-                    num_color = get_number_color(cell.adjacent_mines)
-                    num_text = font.render(str(cell.adjacent_mines), True, num_color)
-                    screen.blit(num_text, (rect.x + 5, rect.y + 2))
-                # Just the COLOR_CELL_UNCOVERED color if it has no adjacent mines
-                else:
-                    pygame.draw.rect(screen, COLOR_CELL_UNCOVERED, rect)
-
-            # Draw the cell outline
-            pygame.draw.rect(screen, COLOR_GRID_LINES, rect, 1)
 
+def _camera_for(board: BoardGame, camera: Camera | None) -> Camera:
+    # The camera to draw through: the one given, or a fresh one on the board's top left corner
+    if camera is None:
+        camera = Camera()
+        camera.attach(board)
+    return camera
+
+
+def draw_visible_cells(screen: pygame.Surface, board: BoardGame, camera: Camera) -> pygame.Rect:
+    """Draws every cell the camera can see, clipped to the viewport
+
+    Args:
+        screen (pygame.Surface): The screen to draw on
+        board (BoardGame): The board to draw
+        camera (Camera): The view of the board
+
+    Returns:
+        pygame.Rect: The area that was drawn
+    """
+    area = camera.board_rect()
+    atlas = get_tile_atlas(camera.cell_size)
+    size = camera.cell_size
+    row_start, row_end, col_start, col_end = camera.visible_cells()
+    origin = camera.cell_rect(row_start, col_start)
+    # Blit each visible row's tiles in one call; the clip trims the cells cut by the viewport's edge
+    previous_clip = screen.get_clip()
+    screen.set_clip(area)
+    for row in range(row_start, row_end):
+        cells = board.board[row]
+        y = origin.y + (row - row_start) * size
+        screen.blits([(atlas.tile_for(cells[col]), (origin.x + (col - col_start) * size, y))
+                      for col in range(col_start, col_end)], False)
+    screen.set_clip(previous_clip)
+    return area
+
+
+def cell_rect(board: BoardGame, row: int, col: int, camera: Camera | None = None) -> pygame.Rect:
+    """Gets the rectangle on screen where the given cell is drawn
+
+    Args:
+        board (BoardGame): The board the cell belongs to
+        row (int): The row of the cell
+        col (int): The column of the cell
+        camera (Camera | None, optional): The view of the board. Defaults to the board's top left corner
+            at its own cell size.
+
+    Returns:
+        pygame.Rect: The cell's rectangle
+    """
+    return _camera_for(board, camera).cell_rect(row, col)
+
+
+def draw_cell(screen: pygame.Surface, board: BoardGame, row: int, col: int, camera: Camera | None = None) -> pygame.Rect:
+    """Draws a single cell of the board as one blit of its pre-rendered tile, clipped to the viewport
+
+    Args:
+        screen (pygame.Surface): The screen to draw on
+        board (BoardGame): The board the cell belongs to
+        row (int): The row of the cell
+        col (int): The column of the cell
+        camera (Camera | None, optional): The view of the board. Defaults to the board's top left corner
+            at its own cell size.
+
+    Returns:
+        pygame.Rect: The rectangle that was drawn, which is empty if the cell is out of view
+    """
+    camera = _camera_for(board, camera)
+    cell = board.board[row][col]
+    full = camera.cell_rect(row, col)
+    rect = full.clip(camera.board_rect())
+    if rect.width and rect.height:
+        # Only the part of the tile inside the viewport
+        screen.blit(get_tile_atlas(camera.cell_size).tile_for(cell), rect, rect.move(-full.x, -full.y))
+    return rect
+
+
+def status_rects(board: BoardGame, camera: Camera | None = None) -> list[pygame.Rect]:
+    """Gets the areas of the screen holding the flag counter and the status message
+
+    Args:
+        board (BoardGame): The board being drawn
+        camera (Camera | None, optional): The view of the board, which decides where the status
+            message goes. Defaults to the board's top left corner at its own cell size.
+
+    Returns:
+        list[pygame.Rect]: The flag counter's area and the status message's area
+    """
+    message_y = _camera_for(board, camera).board_rect().bottom + 20
+    return [
+        pygame.Rect(config.FLAGS_REMAINING_X, config.FLAGS_REMAINING_Y, WINDOW_WIDTH - config.FLAGS_REMAINING_X, config.GRID_POS_Y - config.FLAGS_REMAINING_Y),
+        pygame.Rect(0, message_y, WINDOW_WIDTH, max(0, config.WINDOW_HEIGHT - message_y)),
+    ]
+
+
+def draw_status(screen: pygame.Surface, board: BoardGame, camera: Camera | None = None):
+    """Draws the number of flags left and the help, won or lost message, noting when a no-guess
+       board was asked for but a random one had to be dealt
+
+    Args:
+        screen (pygame.Surface): The screen to draw on
+        board (BoardGame): The board being drawn
+        camera (Camera | None, optional): The view of the board, which decides where the message
+            goes. Defaults to the board's top left corner at its own cell size.
+    """
     # Draw the number of flags remaining in the upper right corner
     flags_left = board.total_mines - board.used_flags
-    flags_text = font.render(f"Flags Left: {flags_left}", True, (255, 255, 255))
+    flags_text = render_text(f"Flags Left: {flags_left}", FONT_SIZE, (255, 255, 255))
     screen.blit(flags_text, (config.FLAGS_REMAINING_X, config.FLAGS_REMAINING_Y)) 
 
-    manager.draw_ui(screen)
-
-    # Get the font and position of the status message
-    message_font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
-    message_y = config.GRID_POS_Y + len(board.board) * config.CELL_SIZE + 20 
+    # Get the position of the status message, just below the part of the board on screen
+    message_y = _camera_for(board, camera).board_rect().bottom + 20
 
     # If the game is in progress, display the help text
     if board.phase == "playing":
         lines = HELP_TEXT.split('\n')
         for i, line in enumerate(lines):
-            help_text_surface = message_font.render(line, True, (200, 200, 200))
+            help_text_surface = render_text(line, FONT_SIZE, (200, 200, 200))
             screen.blit(help_text_surface, (50, message_y + i * 30))
     elif board.phase == "ai":
         lines = "Player's turn. ".split('\n') + HELP_TEXT.split('\n')
         for i, line in enumerate(lines):
-            help_text_surface = message_font.render(line, True, (200, 200, 200))
+            help_text_surface = render_text(line, FONT_SIZE, (200, 200, 200))
             screen.blit(help_text_surface, (50, message_y + i * 30))
 
+    # The no-guess pool had nothing for the first click in time, so warn under the help text that
+    # guessing may be needed
+    if board.no_guess is False and board.phase in ("playing", "ai"):
+        fallback_text_surface = render_text(NO_GUESS_FALLBACK_TEXT, FONT_SIZE, (255, 200, 0))
+        screen.blit(fallback_text_surface, (50, message_y + len(lines) * 30))
+
     # If the game is lost, display the lost text
     elif board.phase == "lost":
-        lost_text_surface = message_font.render(LOST_TEXT, True, (255, 0, 0))
+        lost_text_surface = render_text(LOST_TEXT, FONT_SIZE, (255, 0, 0))
         screen.blit(lost_text_surface, ((WINDOW_WIDTH - lost_text_surface.get_width()) // 2, message_y))
 
     # If the game is lost, display the won text
     elif board.phase == "won":
-        won_text_surface = message_font.render(WON_TEXT, True, (0, 255, 0))
+        won_text_surface = render_text(WON_TEXT, FONT_SIZE, (0, 255, 0))
         screen.blit(won_text_surface, ((WINDOW_WIDTH - won_text_surface.get_width()) // 2, message_y))
 
 
+class BoardRenderer:
+    """Draws a board incrementally: the whole screen the first time a board is shown or the camera
+       moves, and after that only the visible cells whose reveals and flags it drains from the board's
+       journal, plus the status text when it changes.
+    """
+
+    def __init__(self, camera: Camera | None = None):
+        """
+        Args:
+            camera (Camera | None, optional): The view to draw boards through. It is pointed at each
+                new board as it is first drawn. Defaults to a new Camera.
+        """
+        self.camera = camera if camera is not None else Camera()
+        self._board = None # the board last drawn
+        self._changes = None # subscription to that board's journal
+        self._stale = True # whether the screen needs a full redraw
+        self._status = None # (phase, flags left, no_guess) the status text was last drawn for
+        self._view = None # the camera state the screen was last fully drawn for
+
+    def invalidate(self):
+        """Forces the next draw to redraw the whole screen, e.g. after something else drew over it"""
+        self._stale = True
+
+    def draw(self, screen: pygame.Surface, board: BoardGame) -> list[pygame.Rect]:
+        """Draws whatever changed on the board since the last call
+
+        Args:
+            screen (pygame.Surface): The screen to draw on
+            board (BoardGame): The board to draw
+
+        Returns:
+            list[pygame.Rect]: The areas of the screen that were drawn, to pass to pygame.display.update
+        """
+        camera = self.camera
+        status = (board.phase, board.total_mines - board.used_flags, board.no_guess)
+        if board is not self._board:
+            camera.attach(board)
+
+        if board is not self._board or self._stale or camera.state != self._view:
+            # A new board, the screen was drawn over, or the view moved, so start from a clean screen
+            if board is not self._board:
+                self._changes = board.journal.subscribe()
+            else:
+                self._changes.drain() # everything recorded so far is about to be drawn
+            screen.fill((0, 0, 0))
+            draw_visible_cells(screen, board, camera)
+            draw_status(screen, board, camera)
+            self._board = board
+            self._stale = False
+            self._status = status
+            self._view = camera.state
+            return [screen.get_rect()]
+
+        rects = []
+        changed = {(event.row, event.col) for event in self._changes.drain()
+                   if type(event) in (CellRevealed, FlagPlaced, FlagRemoved)}
+        if changed:
+            row_start, row_end, col_start, col_end = camera.visible_cells()
+            if len(changed) >= (row_end - row_start) * (col_end - col_start):
+                # A big flood reveal: redrawing the view is cheaper than visiting every cell it opened
+                rects.append(draw_visible_cells(screen, board, camera))
+            else:
+                for row, col in changed:
+                    if row_start <= row < row_end and col_start <= col < col_end:
+                        rects.append(draw_cell(screen, board, row, col, camera))
+
+        if status != self._status:
+            areas = status_rects(board, camera)
+            for area in areas:
+                screen.fill((0, 0, 0), area)
+            draw_status(screen, board, camera)
+            rects.extend(areas)
+            self._status = status
+
+        return rects
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> pygame.font.Font:
+    """Gets the game's font at the given size, opening it only the first time each size is asked for.
+       The font's file is found through the on-disk font cache rather than a system font scan.
+
+    Args:
+        size (int): The font size
+
+    Returns:
+        pygame.font.Font: The font
+    """
+    return load_font(FONT_NAME, size)
+
+
+@lru_cache(maxsize=256)
+def render_text(text: str, size: int, color: tuple[int, int, int]) -> pygame.Surface:
+    """Renders a piece of text in the game's font, reusing the surface if it was rendered before
+
+    Args:
+        text (str): The text to render
+        size (int): The font size
+        color (tuple[int, int, int]): The RGB color of the text
+
+    Returns:
+        pygame.Surface: The rendered text. It is shared, so it must not be drawn on.
+    """
+    return get_font(size).render(text, True, color)
+
+
+# Cells smaller than this are drawn without their text, which wouldn't fit
+MIN_TEXT_CELL_SIZE = 16
+
+
+class TileAtlas:
+    """Pre-rendered surfaces for every way a cell can look at one cell size, so drawing a cell is a single blit
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self.covered = self._make_tile(COLOR_CELL_COVERED)
+        self.flag = self._make_tile(COLOR_CELL_FLAGGED, "F", (0, 0, 0))
+        self.mine = self._make_tile(COLOR_CELL_MINE, "M", (0, 0, 0))
+        # numbers[0] is an uncovered cell with no adjacent mines, numbers[n] one with n adjacent mines
+        self.numbers = [self._make_tile(COLOR_CELL_UNCOVERED)]
+        for number in range(1, 9):
+            self.numbers.append(self._make_tile(COLOR_CELL_UNCOVERED, str(number), get_number_color(number)))
+
+    def _make_tile(self, fill: tuple[int, int, int], text: str | None = None, text_color: tuple[int, int, int] | None = None) -> pygame.Surface:
+        # Draws one tile the same way a cell used to be drawn directly onto the screen
+        tile = pygame.Surface((self.cell_size, self.cell_size))
+        rect = tile.get_rect()
+        tile.fill(fill)
+        if text is not None and self.cell_size >= MIN_TEXT_CELL_SIZE:
+            tile.blit(render_text(text, FONT_SIZE, text_color), (5, 2))
+        elif text is not None and fill == COLOR_CELL_UNCOVERED:
+            # Zoomed out too far for the digit to fit, so numbered cells show their number's color instead
+            tile.fill(text_color)
+        pygame.draw.rect(tile, COLOR_GRID_LINES, rect, 1)
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        return tile
+
+    def tile_for(self, cell) -> pygame.Surface:
+        """Gets the tile showing the given cell's current state
+
+        Args:
+            cell (Cell): The cell to draw
+
+        Returns:
+            pygame.Surface: The cell's tile
+        """
+        if not cell.is_revealed:
+            return self.flag if cell.is_flag else self.covered
+        if cell.is_mine:
+            return self.mine
+        return self.numbers[cell.adjacent_mines]
+
+
+@lru_cache(maxsize=len(ZOOM_CELL_SIZES) + 4)
+def get_tile_atlas(cell_size: int) -> TileAtlas:
+    """Gets the tile atlas for a cell size, building it only the first time that size is drawn
+    (i.e. when config.set_difficulty changes the cell size)
+
+    Args:
+        cell_size (int): The size of a cell in pixels. Zooming only uses ZOOM_CELL_SIZES, so only a few
+            atlases are ever built.
+
+    Returns:
+        TileAtlas: The atlas for that size
+    """
+    return TileAtlas(cell_size)
+
 
 def get_number_color(number: int) -> tuple[int, int, int]:
     """Gets the text color for the given number of adjacent mines